@@ -0,0 +1,4 @@
+"""
+Performance benchmarks for the scheme assistant
+Run individual benchmarks as modules, e.g. python -m benchmarks.tool_output
+"""
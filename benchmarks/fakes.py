@@ -0,0 +1,153 @@
+"""
+Deterministic fake backends with configurable latency distributions
+
+Latency specs are short strings so they can be passed on the command line:
+    const:200                          always 200 ms
+    uniform:100,400                    uniform between 100 and 400 ms
+    lognormal:800,0.5                  median 800 ms, sigma 0.5
+    bimodal:300,6000,0.05              300 ms, but 5% of calls take 6000 ms
+RecordedLatency replays the latencies captured for the turn being replayed
+(see benchmarks.replay) instead.
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
+import itertools
+import math
+import random
+import threading
+import time
+
+
+class LatencyDistribution:
+    def __init__(self, spec: str, seed: int = 0):
+        self.spec = spec
+        kind, _, args = spec.partition(":")
+        self.kind = kind
+        self.args = [float(a) for a in args.split(",") if a]
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample_ms(self) -> float:
+        with self._lock:
+            if self.kind == "const":
+                return self.args[0]
+            if self.kind == "uniform":
+                return self._rng.uniform(self.args[0], self.args[1])
+            if self.kind == "lognormal":
+                median, sigma = self.args
+                return median * math.exp(self._rng.gauss(0, sigma))
+            if self.kind == "bimodal":
+                fast, slow, p_slow = self.args
+                return slow if self._rng.random() < p_slow else fast
+        raise ValueError(f"Unknown latency distribution: {self.spec}")
+
+
+# Backend latencies of the captured turn being replayed: {"llm": [ms, ...], "search": [ms, ...]}
+replay_turn: ContextVar = ContextVar("replay_turn", default=None)
+
+
+class RecordedLatency:
+    """
+    Latency source for the fakes that replays the current turn's recorded
+    latencies of one kind in call order. Calls beyond the recording (hedged
+    duplicates) reuse its last latency; turns without a recording fall back
+    to a distribution.
+    """
+
+    def __init__(self, kind: str, fallback: LatencyDistribution):
+        self.kind = kind
+        self.fallback = fallback
+
+    def sample_ms(self) -> float:
+        turn = replay_turn.get()
+        recorded = turn.get(self.kind) if turn else None
+        if not recorded:
+            return self.fallback.sample_ms()
+        return recorded.pop(0) if len(recorded) > 1 else recorded[0]
+
+
+class FakeLLM:
+    """
+    Stand-in for AgentRunner: same submit/submit_ephemeral interface, but each
+    call just sleeps for a sampled latency and returns a canned reply
+    """
+
+    def __init__(self, latency: LatencyDistribution, error_rate: float = 0.0,
+                 seed: int = 0, max_workers: int = 64):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._ids = itertools.count(1)
+        self._sessions = set()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fake-llm")
+
+    def register(self, agent):
+        pass
+
+    def is_registered(self, agent_name: str) -> bool:
+        return True
+
+    def has_session(self, agent_name: str, session_id: str) -> bool:
+        return (agent_name, session_id) in self._sessions
+
+    def delete_session(self, session_id: str):
+        self._sessions = {key for key in self._sessions if key[1] != session_id}
+
+    def _call(self, message: str, delay_ms: float, fail: bool, call_id: int) -> str:
+        time.sleep(delay_ms / 1000)
+        if fail:
+            raise RuntimeError("fake LLM error")
+        return f"Here are some schemes that could help (reply {call_id})."
+
+    def _submit(self, message: str) -> Future:
+        self.calls += 1
+        fail = self._rng.random() < self.error_rate
+        return self._pool.submit(self._call, message, self.latency.sample_ms(), fail, next(self._ids))
+
+    def submit(self, agent_name: str, session_id: str, message: str) -> Future:
+        self._sessions.add((agent_name, session_id))
+        return self._submit(message)
+
+    def submit_ephemeral(self, agent_name: str, message: str) -> Future:
+        return self._submit(message)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class FakeSearch:
+    """
+    Stand-in for VertexSearchService: sleeps for a sampled latency, then
+    returns freshly built (and signed) records from the mock catalog, the way
+    real search results arrive new on every call
+    """
+
+    def __init__(self, category_id: str, latency: LatencyDistribution, error_rate: float = 0.0,
+                 seed: int = 0):
+        from src.services.metrics import SEARCH_SECONDS
+        from src.services.mock_vertex_search import MockVertexSearchService
+
+        self.latency = latency
+        self.error_rate = error_rate
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        # Observed like the real services, so captures of fake runs replay too
+        self._observed = SEARCH_SECONDS.labels(f"fake-{category_id.lower()}")
+        mock = MockVertexSearchService(category_id.lower())
+        self._raw = [record.to_dict() for record in mock.search("", top_k=100)]
+
+    def search(self, query: str, top_k: int = 10):
+        from src.models.scheme_record import SchemeRecord
+        from src.services.dedup import attach_signature
+
+        with self._lock:
+            self.calls += 1
+            fail = self._rng.random() < self.error_rate
+        delay_s = self.latency.sample_ms() / 1000
+        time.sleep(delay_s)
+        self._observed.observe(delay_s)
+        if fail:
+            raise RuntimeError("fake search error")
+        return [attach_signature(SchemeRecord.from_dict(raw)) for raw in self._raw[:top_k]]
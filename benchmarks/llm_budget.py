@@ -0,0 +1,81 @@
+"""
+p50/p99 turn latency of LLM calls with and without the latency budget
+
+Each simulated turn submits a call to the fake model and waits for it through
+await_with_hedge, once with an effectively unlimited budget and no hedge, and
+once with the configured budget and hedge threshold.
+
+Usage:
+    python -m benchmarks.llm_budget [--turns 400] [--latency bimodal:300,6000,0.05]
+                                    [--budget-ms 2000] [--hedge-ms 800]
+"""
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import time
+
+from benchmarks.fakes import FakeLLM, LatencyDistribution
+from src.services.latency_budget import await_with_hedge
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run(llm: FakeLLM, turns: int, concurrency: int, budget_s: float, hedge_s: float) -> dict:
+    def turn(i):
+        started = time.perf_counter()
+        primary = llm.submit("FakeAgent", f"s{i}", "query")
+        result = await_with_hedge(
+            primary,
+            lambda: llm.submit_ephemeral("FakeAgent", "query"),
+            started, budget_s, hedge_s
+        )
+        return result
+
+    calls_before = llm.calls
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(turn, range(turns)))
+
+    latencies = [r.elapsed_ms for r in results]
+    return {
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "templated": sum(1 for r in results if r.value is None),
+        "hedged": sum(1 for r in results if r.hedged),
+        "llm_calls": llm.calls - calls_before,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency", default="bimodal:300,6000,0.05")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--budget-ms", type=float, default=2000)
+    parser.add_argument("--hedge-ms", type=float, default=800)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    scenarios = [
+        ("no budget", 3600.0, 0.0),
+        ("budget only", args.budget_ms / 1000, 0.0),
+        ("budget + hedge", args.budget_ms / 1000, args.hedge_ms / 1000),
+    ]
+
+    print(f"Fake LLM latency: {args.latency}, {args.turns} turns at concurrency {args.concurrency}\n")
+    print(f"{'scenario':<16}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'templated':>11}{'hedged':>8}{'calls':>7}")
+    for name, budget_s, hedge_s in scenarios:
+        llm = FakeLLM(LatencyDistribution(args.latency, seed=args.seed),
+                      error_rate=args.error_rate, seed=args.seed)
+        r = run(llm, args.turns, args.concurrency, budget_s, hedge_s)
+        llm.shutdown()
+        print(f"{name:<16}{r['p50_ms']:>9.0f}{r['p95_ms']:>9.0f}{r['p99_ms']:>9.0f}"
+              f"{r['templated']:>11}{r['hedged']:>8}{r['llm_calls']:>7}")
+
+
+if __name__ == "__main__":
+    main()
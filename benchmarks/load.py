@@ -0,0 +1,260 @@
+"""
+End-to-end load benchmark of the /query API with fake LLM and search backends
+
+Runs the FastAPI app in-process (httpx ASGITransport) with every category
+agent wired to a FakeLLM and a FakeSearch, then drives scripted multi-turn
+conversations at the given concurrency:
+    search -> show more -> tell me more -> eligibility Q&A
+Reports throughput, p50/p95/p99 latency per turn type and memory growth, and
+saves the results as JSON; --compare prints the change against an earlier
+result file, so runs can be compared across commits.
+
+Usage:
+    python -m benchmarks.load [--conversations 200] [--concurrency 16]
+                              [--llm-latency lognormal:800,0.5]
+                              [--search-latency lognormal:120,0.4]
+                              [--llm-error-rate 0] [--search-error-rate 0]
+                              [--output load.json] [--compare baseline.json]
+"""
+import argparse
+import asyncio
+import contextlib
+import gc
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("USE_MOCK_SEARCH", "true")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx
+
+from benchmarks.fakes import FakeLLM, FakeSearch, LatencyDistribution
+from benchmarks.llm_budget import percentile
+
+TURN_TYPES = ("search", "show_more", "details", "eligibility")
+
+OPENERS = {
+    "FARMER": [
+        "I am a farmer looking for financial support",
+        "I grow wheat and need crop insurance",
+        "mujhe kisan yojana ke baare mein batao",
+    ],
+    "MSME": [
+        "I run a small manufacturing business and need a loan",
+        "Schemes for my MSME enterprise",
+    ],
+}
+# Placeholder agent: CategoryAgent only checks that one exists
+_FAKE_AGENT = object()
+
+
+def conversation_script(rng: random.Random):
+    """(turn type, query, show_more) tuples for one conversation"""
+    category = rng.choice(sorted(OPENERS))
+    script = [
+        ("search", rng.choice(OPENERS[category]), False),
+        ("show_more", "show more", True),
+        ("details", f"tell me more about scheme {rng.randint(1, 3)}", False),
+        ("eligibility", "am I eligible for the first one", False),
+        ("eligibility", "yes", False),
+    ]
+    # Answers until the assessment comes back; load() stops the script there
+    script += [("eligibility", rng.choice(("yes", "yes", "no")), False)] * 6
+    return script
+
+
+def install_fakes(args):
+    """Wire every category agent to the fake backends; returns them for stats"""
+    from src.agents import registry
+    from src.agents.master_agent import get_master_agent
+
+    llm = FakeLLM(LatencyDistribution(args.llm_latency, seed=args.seed),
+                  error_rate=args.llm_error_rate, seed=args.seed,
+                  max_workers=max(64, args.concurrency * 2))
+    registry.agent_runner = llm
+
+    searches = {}
+    get_master_agent()
+    for offset, category_id in enumerate(registry.category_registry.configured()):
+        category = registry.category_registry.get(category_id)
+        search = FakeSearch(category_id, LatencyDistribution(args.search_latency, seed=args.seed + offset),
+                            error_rate=args.search_error_rate, seed=args.seed + offset)
+        category._search_service = search
+        category._agent = _FAKE_AGENT
+        category._agent_built = True
+        category.is_adk_agent = True
+        searches[category_id] = search
+    return llm, searches
+
+
+def rss_kib() -> int:
+    """Current resident set size; peak RSS where /proc is unavailable"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak
+
+
+async def load(app, args) -> dict:
+    latencies = {turn_type: [] for turn_type in TURN_TYPES}
+    errors = {turn_type: 0 for turn_type in TURN_TYPES}
+    semaphore = asyncio.Semaphore(args.concurrency)
+    rng = random.Random(args.seed)
+    scripts = [conversation_script(rng) for _ in range(args.conversations)]
+
+    async def converse(client, script):
+        session_id = None
+        async with semaphore:
+            for turn_type, query, show_more in script:
+                body = {"query": query, "show_more": show_more}
+                if session_id:
+                    body["session_id"] = session_id
+                started = time.perf_counter()
+                response = await client.post("/query", json=body)
+                latencies[turn_type].append((time.perf_counter() - started) * 1000)
+                if response.status_code != 200:
+                    errors[turn_type] += 1
+                    return
+                data = response.json()
+                session_id = data["session_id"]
+                if turn_type == "eligibility" and "Eligibility Assessment" in data["response"]:
+                    return
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(converse(client, script) for script in scripts))
+        elapsed = time.perf_counter() - started
+
+    turns = sum(len(values) for values in latencies.values())
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "turns": turns,
+        "throughput_turns_per_s": round(turns / elapsed, 2),
+        "throughput_conversations_per_s": round(args.conversations / elapsed, 2),
+        "turn_types": {
+            turn_type: {
+                "count": len(values),
+                "errors": errors[turn_type],
+                "p50_ms": round(percentile(values, 50), 2),
+                "p95_ms": round(percentile(values, 95), 2),
+                "p99_ms": round(percentile(values, 99), 2),
+            }
+            for turn_type, values in latencies.items() if values
+        },
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ).stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def print_results(results: dict, baseline: dict = None):
+    r = results["results"]
+    print(f"{r['turns']} turns in {r['elapsed_s']:.1f}s: "
+          f"{r['throughput_turns_per_s']:.1f} turns/s, "
+          f"{r['throughput_conversations_per_s']:.2f} conversations/s")
+    m = results["memory"]
+    print(f"RSS {m['rss_start_kib'] / 1024:.1f} -> {m['rss_end_kib'] / 1024:.1f} MiB "
+          f"({m['growth_kib_per_conversation']:.1f} KiB/conversation, {m['sessions']} sessions held)")
+    print(f"LLM calls {results['backends']['llm_calls']}, search calls {results['backends']['search_calls']}\n")
+
+    print(f"{'turn':<12}{'count':>7}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for turn_type, stats in r["turn_types"].items():
+        print(f"{turn_type:<12}{stats['count']:>7}{stats['errors']:>8}"
+              f"{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}")
+
+    if not baseline:
+        return
+    b = baseline["results"]
+    print(f"\nvs {baseline.get('commit', '?')}: throughput "
+          f"{b['throughput_turns_per_s']:.1f} -> {r['throughput_turns_per_s']:.1f} turns/s "
+          f"({(r['throughput_turns_per_s'] / b['throughput_turns_per_s'] - 1) * 100:+.0f}%)")
+    for turn_type, stats in r["turn_types"].items():
+        before = b["turn_types"].get(turn_type)
+        if before and before["p95_ms"]:
+            print(f"  {turn_type:<12} p95 {before['p95_ms']:.1f} -> {stats['p95_ms']:.1f} ms "
+                  f"({(stats['p95_ms'] / before['p95_ms'] - 1) * 100:+.0f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--conversations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--llm-latency", default="lognormal:800,0.5")
+    parser.add_argument("--search-latency", default="lognormal:120,0.4")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--search-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    # The app logs every turn; keep the report readable
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        from src.app import app
+        from src.services.state_service import state_service
+
+        llm, searches = install_fakes(args)
+        gc.collect()
+        rss_start = rss_kib()
+        results = asyncio.run(load(app, args))
+        gc.collect()
+        rss_end = rss_kib()
+        llm.shutdown()
+
+    report = {
+        "benchmark": "load",
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "config": {
+            "conversations": args.conversations,
+            "concurrency": args.concurrency,
+            "llm_latency": args.llm_latency,
+            "search_latency": args.search_latency,
+            "llm_error_rate": args.llm_error_rate,
+            "search_error_rate": args.search_error_rate,
+            "seed": args.seed,
+        },
+        "results": results,
+        "memory": {
+            "rss_start_kib": rss_start,
+            "rss_end_kib": rss_end,
+            "growth_kib_per_conversation": round((rss_end - rss_start) / args.conversations, 2),
+            "sessions": len(state_service.sessions),
+        },
+        "backends": {
+            "llm_calls": llm.calls,
+            "search_calls": sum(search.calls for search in searches.values()),
+        },
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(report, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Per-query cost of Devanagari/Hinglish normalization and its effect on intent
+classification
+
+Classifies a mixed set of English, Hinglish and Devanagari first messages
+with and without normalize_query() in front of the keyword classifier and
+reports the UNCLEAR rate, accuracy, and the normalization cost per query.
+
+Usage:
+    python -m benchmarks.query_normalizer [--runs 2000]
+"""
+import argparse
+import contextlib
+import io
+import os
+import time
+
+os.environ.setdefault("USE_MOCK_SEARCH", "true")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from src.agents.master_agent import MasterAgent
+from src.services.query_normalizer import normalize_query
+
+# (first message, expected category)
+QUERIES = [
+    ("I am a farmer looking for crop insurance", "FARMER"),
+    ("loan for my manufacturing unit", "MSME"),
+    ("mujhe kisaan yojna ke baare me jaankari chahiye", "FARMER"),
+    ("kheti ke liye karja chahiye", "FARMER"),
+    ("fasal beema kaise milega", "FARMER"),
+    ("khad aur beej par subsidy", "FARMER"),
+    ("pashu palan ke liye madad", "FARMER"),
+    ("dukaan kholne ke liye karza", "MSME"),
+    ("mera vyapaar badhana hai", "MSME"),
+    ("chhota karkhana shuru karna hai", "MSME"),
+    ("किसान के लिए योजना", "FARMER"),
+    ("खेती के लिए कर्ज़ चाहिए", "FARMER"),
+    ("फसल बीमा का लाभ", "FARMER"),
+    ("ज़मीन और सिंचाई के लिए सहायता", "FARMER"),
+    ("व्यापार के लिए ऋण", "MSME"),
+    ("दुकान के लिए कर्ज", "MSME"),
+    ("मेरा उद्योग है, मदद चाहिए", "MSME"),
+]
+
+
+def classify_all(agent, transform):
+    correct = unclear = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for query, expected in QUERIES:
+            category = agent._classify_intent(transform(query), "")
+            correct += category == expected
+            unclear += category == "UNCLEAR"
+    return correct / len(QUERIES), unclear / len(QUERIES)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=2000)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        agent = MasterAgent()
+
+    raw_accuracy, raw_unclear = classify_all(agent, lambda q: q)
+    norm_accuracy, norm_unclear = classify_all(agent, normalize_query)
+
+    latencies = []
+    for _ in range(args.runs):
+        for query, _expected in QUERIES:
+            started = time.perf_counter()
+            normalize_query(query)
+            latencies.append((time.perf_counter() - started) * 1_000_000)
+    latencies.sort()
+
+    print(f"{len(QUERIES)} first messages")
+    print(f"   raw:        accuracy {raw_accuracy:.0%}, UNCLEAR {raw_unclear:.0%}")
+    print(f"   normalized: accuracy {norm_accuracy:.0%}, UNCLEAR {norm_unclear:.0%}")
+    print(f"   normalize_query: p50 {latencies[len(latencies) // 2]:.1f}us, "
+          f"p99 {latencies[int(len(latencies) * 0.99)]:.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+Replay captured /query traffic against a local instance
+
+Reads JSONL files written with CAPTURE_TRAFFIC=true (rotated files included)
+and re-issues the requests in their recorded order:
+  - each session's turns are sent one after another, never overlapping, at
+    their recorded offsets divided by --speed (1 = real time, "max" = as
+    fast as the sessions allow)
+  - in-process (default), the app runs with FakeLLM/FakeSearch backends that
+    sleep for the latencies recorded for that very turn
+  - with --url, requests go to a running server and use its real backends
+Reports throughput and p50/p95/p99 latency per recorded route next to the
+recorded latencies, and how far sends lagged their schedule. --output saves
+the results; --compare prints the change against a run of another build.
+
+Usage:
+    python -m benchmarks.replay captures/query.jsonl* [--speed 1|N|max]
+                                [--limit 5000] [--concurrency 256] [--url URL]
+                                [--output replay.json] [--compare baseline.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import time
+import uuid
+
+os.environ.setdefault("USE_MOCK_SEARCH", "true")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ["CAPTURE_TRAFFIC"] = "false"  # Never capture the replay itself
+
+import httpx
+
+from benchmarks.fakes import RecordedLatency, replay_turn
+from benchmarks.llm_budget import percentile
+from benchmarks.load import git_commit, install_fakes
+
+
+def load_capture(paths, limit: int = 0) -> list:
+    """Captured entries from all files, oldest first"""
+    entries = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entries.append(json.loads(line))
+    entries.sort(key=lambda entry: entry["ts"])
+    return entries[:limit] if limit else entries
+
+
+def group_sessions(entries) -> dict:
+    """session key -> its turns in order; requests without a session stand alone"""
+    sessions = {}
+    for entry in entries:
+        key = entry.get("session_id") or entry.get("request_id") or uuid.uuid4().hex
+        sessions.setdefault(key, []).append(entry)
+    return sessions
+
+
+def summarize(values) -> dict:
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 50), 2),
+        "p95_ms": round(percentile(values, 95), 2),
+        "p99_ms": round(percentile(values, 99), 2),
+    }
+
+
+async def replay(app, entries, args) -> dict:
+    speed = None if args.speed == "max" else float(args.speed)
+    sessions = group_sessions(entries)
+    first_ts = entries[0]["ts"]
+    prefix = f"replay-{uuid.uuid4().hex[:8]}-"
+    latencies, recorded, lags = {}, {}, []
+    errors = {}
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def run_session(client, key, turns, started):
+        async with semaphore:
+            for entry in turns:
+                if speed is not None:
+                    due = started + (entry["ts"] - first_ts) / speed
+                    delay = due - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    lags.append(max(0.0, -delay) * 1000)
+                route = entry.get("route") or "unknown"
+                # The fakes read this turn's recorded backend latencies
+                replay_turn.set({
+                    "llm": [call["ms"] for call in entry.get("llm", [])],
+                    "search": [call["ms"] for call in entry.get("search", [])],
+                })
+                body = {
+                    "query": entry["query"],
+                    "show_more": entry.get("show_more", False),
+                    "session_id": prefix + key,
+                }
+                url = "/query" + (f"?{entry['params']}" if entry.get("params") else "")
+                sent = time.perf_counter()
+                try:
+                    response = await client.post(url, json=body)
+                    ok = response.status_code == entry.get("status", 200)
+                except httpx.HTTPError:
+                    ok = False
+                latencies.setdefault(route, []).append((time.perf_counter() - sent) * 1000)
+                recorded.setdefault(route, []).append(entry["duration_ms"])
+                if not ok:
+                    errors[route] = errors.get(route, 0) + 1
+
+    if args.url:
+        transport, base_url = None, args.url
+    else:
+        transport, base_url = httpx.ASGITransport(app=app), "http://replay"
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=None) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            run_session(client, key, turns, started) for key, turns in sessions.items()
+        ))
+        elapsed = time.perf_counter() - started
+
+    turns = sum(len(values) for values in latencies.values())
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "turns": turns,
+        "sessions": len(sessions),
+        "recorded_span_s": round(entries[-1]["ts"] - first_ts, 3),
+        "throughput_turns_per_s": round(turns / elapsed, 2),
+        "schedule_lag": summarize(lags) if lags else None,
+        "routes": {
+            route: {
+                **summarize(values),
+                "errors": errors.get(route, 0),
+                "recorded_p50_ms": round(percentile(recorded[route], 50), 2),
+                "recorded_p95_ms": round(percentile(recorded[route], 95), 2),
+            }
+            for route, values in sorted(latencies.items())
+        },
+    }
+
+
+def print_results(report: dict, baseline: dict = None):
+    r = report["results"]
+    print(f"{r['turns']} turns from {r['sessions']} sessions in {r['elapsed_s']:.1f}s "
+          f"(recorded over {r['recorded_span_s']:.1f}s, speed {report['config']['speed']}): "
+          f"{r['throughput_turns_per_s']:.1f} turns/s")
+    if r["schedule_lag"]:
+        print(f"schedule lag p50 {r['schedule_lag']['p50_ms']:.1f} ms, "
+              f"p99 {r['schedule_lag']['p99_ms']:.1f} ms")
+    print()
+    print(f"{'route':<16}{'count':>7}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'rec p50':>9}{'rec p95':>9}")
+    for route, stats in r["routes"].items():
+        print(f"{route:<16}{stats['count']:>7}{stats['errors']:>8}{stats['p50_ms']:>9.1f}"
+              f"{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}"
+              f"{stats['recorded_p50_ms']:>9.1f}{stats['recorded_p95_ms']:>9.1f}")
+
+    if not baseline:
+        return
+    b = baseline["results"]
+    print(f"\nvs {baseline.get('commit', '?')}: throughput "
+          f"{b['throughput_turns_per_s']:.1f} -> {r['throughput_turns_per_s']:.1f} turns/s "
+          f"({(r['throughput_turns_per_s'] / b['throughput_turns_per_s'] - 1) * 100:+.0f}%)")
+    for route, stats in r["routes"].items():
+        before = b["routes"].get(route)
+        if before and before["p95_ms"]:
+            print(f"  {route:<16} p50 {before['p50_ms']:.1f} -> {stats['p50_ms']:.1f} ms, "
+                  f"p95 {before['p95_ms']:.1f} -> {stats['p95_ms']:.1f} ms "
+                  f"({(stats['p95_ms'] / before['p95_ms'] - 1) * 100:+.0f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("captures", nargs="+", help="Capture JSONL files")
+    parser.add_argument("--speed", default="1", help="Replay speed factor, or 'max'")
+    parser.add_argument("--limit", type=int, default=0, help="Replay only the first N requests")
+    parser.add_argument("--concurrency", type=int, default=256, help="Sessions in flight at most")
+    parser.add_argument("--url", help="Replay against a running server instead of in-process")
+    parser.add_argument("--llm-latency", default="lognormal:800,0.5",
+                        help="Fake LLM latency for turns without a recorded one")
+    parser.add_argument("--search-latency", default="lognormal:120,0.4",
+                        help="Fake search latency for turns without a recorded one")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+    if args.speed != "max" and float(args.speed) <= 0:
+        parser.error("--speed must be positive or 'max'")
+
+    entries = load_capture(args.captures, args.limit)
+    if not entries:
+        parser.error("no captured requests found")
+
+    app, llm = None, None
+    if not args.url:
+        from src.app import app
+
+        fake_args = argparse.Namespace(
+            llm_latency=args.llm_latency, search_latency=args.search_latency,
+            llm_error_rate=0.0, search_error_rate=0.0, seed=args.seed,
+            concurrency=args.concurrency,
+        )
+        llm, searches = install_fakes(fake_args)
+        llm.latency = RecordedLatency("llm", llm.latency)
+        for search in searches.values():
+            search.latency = RecordedLatency("search", search.latency)
+
+    try:
+        results = asyncio.run(replay(app, entries, args))
+    finally:
+        if llm is not None:
+            llm.shutdown()
+
+    report = {
+        "benchmark": "replay",
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "config": {
+            "captures": args.captures,
+            "speed": args.speed,
+            "limit": args.limit,
+            "target": args.url or "in-process",
+        },
+        "results": results,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(report, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
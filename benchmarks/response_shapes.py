@@ -0,0 +1,69 @@
+"""
+Payload size and serialization time of /query responses per response shape
+
+Builds a real QueryResponse from the mock catalog, then for each shape
+(full, sparse fieldsets, omitted parts) reports the JSON size, gzip/brotli
+sizes and the time to shape and encode the response.
+
+Usage:
+    python -m benchmarks.response_shapes [--runs 500] [--per-page 3]
+"""
+import argparse
+import contextlib
+import io
+import os
+import time
+
+os.environ.setdefault("USE_MOCK_SEARCH", "true")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from fastapi.responses import JSONResponse
+from config.settings import settings
+from src.agents.master_agent import get_master_agent
+from src.middleware.compression import brotli, compress
+from src.services.response_shaping import encode_query_response, shape_response
+
+# (label, fields, omit)
+SHAPES = [
+    ("full", None, None),
+    ("omit=response", None, ["response"]),
+    ("omit=schemes", None, ["schemes"]),
+    ("fields=id,name", ["id", "name"], None),
+    ("fields=id,name + omit=response", ["id", "name"], ["response"]),
+    ("fields=id,name,url,benefits", ["id", "name", "url", "benefits"], None),
+]
+
+
+def encode(result, fields, omit) -> bytes:
+    # Same split as the /query route
+    if fields:
+        return JSONResponse(shape_response(result, fields, omit)).body
+    return encode_query_response(result, omit)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=500)
+    parser.add_argument("--per-page", type=int, default=settings.schemes_per_page)
+    args = parser.parse_args()
+
+    settings.schemes_per_page = args.per_page
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = get_master_agent().process("I am a farmer looking for support", "bench-shapes")
+
+    print(f"{len(result.schemes)} schemes per response\n")
+    print(f"{'shape':34} {'json':>7} {'gzip':>7} {'br':>7} {'encode us':>10}")
+    for label, fields, omit in SHAPES:
+        body = encode(result, fields, omit)
+        started = time.perf_counter()
+        for _ in range(args.runs):
+            encode(result, fields, omit)
+        encode_us = (time.perf_counter() - started) / args.runs * 1_000_000
+
+        gzip_size = len(compress(body, "gzip", settings.gzip_level, settings.brotli_quality))
+        br_size = len(compress(body, "br", settings.gzip_level, settings.brotli_quality)) if brotli else None
+        print(f"{label:34} {len(body):>7} {gzip_size:>7} {br_size if br_size else '-':>7} {encode_us:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
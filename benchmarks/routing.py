@@ -0,0 +1,338 @@
+"""
+Micro-benchmarks of the MasterAgent routing hot functions
+
+Times each function in isolation on generated corpora (queries, eligibility
+texts) and generated sessions of varying size: conversation history length,
+number of stored schemes and number of configured categories. For every case
+it reports the per-call CPU time (best of --repeats), the peak memory a single
+call allocates and the blocks it leaves behind, and fails when a case
+regresses past the stored baseline.
+
+Baselines are machine-dependent. Each case is compared relative to a fixed
+pure-Python calibration loop timed just before it (and stored with the
+baseline), so a slower or busier runner does not by itself count as a
+regression. Refresh with --save-baseline after intended changes.
+
+Usage:
+    python -m benchmarks.routing [--filter classify] [--repeats 7]
+                                 [--baseline benchmarks/baselines/routing.json]
+                                 [--tolerance 0.5] [--retries 2]
+                                 [--save-baseline PATH]
+"""
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("USE_MOCK_SEARCH", "true")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from config.categories import CATEGORIES, CategoryConfig
+from config.settings import settings
+from src.agents.master_agent import MasterAgent
+from src.models.scheme_record import SchemeRecord
+from src.services.query_normalizer import normalize_query
+from src.services.state_service import state_service
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "routing.json")
+
+SCHEME_COUNTS = (10, 100, 1000)
+HISTORY_LENGTHS = (0, 20, 200)
+CATEGORY_COUNTS = (2, 20, 200)
+PAGE_SIZES = (3, 10, 50)
+
+_PREFIXES = ["Pradhan Mantri", "PM", "National", "Rashtriya", "State", "Mukhyamantri", "Kisan"]
+_TOPICS = ["Fasal Bima", "Krishi Sinchai", "Credit Guarantee", "Udyam", "Dairy Vikas",
+           "Matsya Sampada", "Technology Upgradation", "Export Promotion", "Soil Health",
+           "Rural Livelihood", "Employment Generation", "Solar Pump", "Cluster Development"]
+_SUFFIXES = ["Yojana", "Scheme", "Mission", "Programme", "Abhiyan"]
+_SYLLABLES = ["ka", "ri", "shi", "ud", "yo", "ga", "van", "jal", "pra", "mit", "sam", "nid", "hi", "tra"]
+
+
+def pseudo_word(rng: random.Random) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def make_schemes(count: int, rng: random.Random):
+    schemes = []
+    for i in range(count):
+        topic = rng.choice(_TOPICS)
+        name = f"{rng.choice(_PREFIXES)} {topic} {rng.choice(_SUFFIXES)}"
+        if rng.random() < 0.3:
+            name += f" ({''.join(word[0] for word in name.split()).upper()})"
+        eligibility = " ".join(
+            rng.choice(["All landholding farmer families", "Registered business units",
+                        "Indian citizens aged 18 or above", "Residents of rural areas",
+                        "Enterprises with turnover under 50 crore", "Small and marginal farmers"])
+            for _ in range(rng.randint(1, 4))
+        )
+        schemes.append(SchemeRecord(
+            id=f"gen-{i}",
+            name=name,
+            description=f"Support under the {topic} programme. " * rng.randint(1, 8),
+            eligibility=eligibility,
+            benefits=f"Financial assistance of Rs {rng.randint(1, 50) * 1000} per year",
+            application_process="Apply online or at the nearest Common Service Center",
+            url=f"https://example.gov.in/{i}",
+            related_variants=[{"id": f"gen-{i}-v", "name": f"{name} (State)"}] if rng.random() < 0.1 else ()
+        ))
+    return schemes
+
+
+def make_queries(schemes, rng: random.Random, count: int = 64):
+    """Mix of first-turn, follow-up, Hinglish and unclear queries, normalized as in process()"""
+    templates = [
+        lambda: f"I need a loan for my {rng.choice(['farm', 'business', 'dairy', 'factory'])}",
+        lambda: f"tell me more about scheme {rng.randint(1, 3)}",
+        lambda: f"what are the benefits of the {rng.choice(['first', 'second', 'third'])} one",
+        lambda: f"am I eligible for {rng.choice(schemes).name.lower()}",
+        lambda: f"how to apply for the {rng.choice(_TOPICS).lower()} one",
+        lambda: "mujhe kisan yojana ke baare mein batao",
+        lambda: "किसान के लिए ऋण योजना",
+        lambda: "hello, can you help me",
+        lambda: " ".join(pseudo_word(rng) for _ in range(rng.randint(3, 12))),
+    ]
+    return [normalize_query(rng.choice(templates)()) for _ in range(count)]
+
+
+def make_session(session_id: str, schemes, history: int):
+    state_service.delete_session(session_id)
+    context = state_service.get_or_create(session_id)
+    context.category = "FARMER"
+    for i in range(history):
+        role = "user" if i % 2 == 0 else "assistant"
+        context.add_message(role, f"message {i} about farming schemes and eligibility " * 3)
+    if schemes:
+        state_service.set_schemes(session_id, schemes)
+    return context
+
+
+@contextlib.contextmanager
+def extra_categories(count: int, rng: random.Random):
+    """Temporarily add synthetic categories so CATEGORIES has `count` entries"""
+    added = []
+    for i in range(max(0, count - len(CATEGORIES))):
+        category_id = f"GEN{i}"
+        CATEGORIES[category_id] = CategoryConfig(
+            id=category_id,
+            name=f"Generated {i}",
+            description="Synthetic category for benchmarks",
+            keywords=[pseudo_word(rng) for _ in range(20)],
+            datastore_id_key="",
+            search_tool=None,
+            agent_instruction="",
+        )
+        added.append(category_id)
+    try:
+        yield
+    finally:
+        for category_id in added:
+            del CATEGORIES[category_id]
+
+
+class _Discard:
+    """stdout sink that buffers nothing, so the functions' logging does not show up as retained memory"""
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def measure(fn, inputs, repeats: int) -> dict:
+    """
+    Best per-call time, peak bytes and retained blocks per call, over whole
+    passes through the inputs so every run sees the same mix
+    """
+    def run_pass():
+        for item in inputs:
+            fn(*item)
+
+    passes = 1
+    while True:
+        started = time.process_time()
+        for _ in range(passes):
+            run_pass()
+        elapsed = time.process_time() - started
+        if elapsed >= 0.05:
+            break
+        passes *= 2
+    best = elapsed / passes
+    for _ in range(repeats - 1):
+        started = time.process_time()
+        for _ in range(passes):
+            run_pass()
+        best = min(best, (time.process_time() - started) / passes)
+
+    tracemalloc.start()
+    peak = 0
+    for item in inputs:
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        fn(*item)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+    before = tracemalloc.take_snapshot()
+    run_pass()
+    run_pass()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+
+    return {
+        "us": round(best / len(inputs) * 1_000_000, 3),
+        "peak_bytes": peak,
+        "retained_blocks": round(max(0, retained) / (2 * len(inputs)), 2),
+    }
+
+
+def calibration_us() -> float:
+    """Per-call time of a fixed pure-Python workload, for comparing machines"""
+    def work(n):
+        total = 0
+        for i in range(n):
+            total += len(str(i)) * (i & 7)
+        return total
+    return measure(work, [(2000,)] * 8, 7)["us"]
+
+
+def cases(agent: MasterAgent, seed: int):
+    """
+    (name, setup, categories) triples; setup builds the state and returns the
+    timed function with its inputs, categories is the CATEGORIES size to run it with
+    """
+    rng = random.Random(seed)
+    catalog = make_schemes(max(SCHEME_COUNTS), rng)
+    queries = make_queries(catalog[:10], rng)
+
+    for count in SCHEME_COUNTS:
+        def setup(count=count):
+            schemes = catalog[:count]
+            context = make_session("bench-inquiry", schemes, history=10)
+            inputs = [(query, context) for query in make_queries(schemes, random.Random(seed))]
+            return agent._is_scheme_inquiry, inputs
+        yield f"is_scheme_inquiry[schemes={count}]", setup, len(CATEGORIES)
+
+    for categories in CATEGORY_COUNTS:
+        for history in HISTORY_LENGTHS:
+            def setup(categories=categories, history=history):
+                context = make_session("bench-classify", [], history)
+                # process() renders the history for every classification
+                classify = lambda query: agent._classify_intent(query, context.get_history_text())
+                return classify, [(query,) for query in queries]
+            yield f"classify_intent[categories={categories},history={history}]", setup, categories
+
+    for count in SCHEME_COUNTS:
+        def setup(count=count):
+            schemes = catalog[:count]
+            context = make_session("bench-handle", schemes, history=10)
+            base = len(context.conversation_history)
+
+            def handle(query):
+                agent._handle_scheme_inquiry(query, "bench-handle", context)
+                # Keep the session the same size between calls
+                context.eligibility_check_in_progress = False
+                del context.conversation_history[base:]
+            follow_ups = [(query,) for query in make_queries(schemes, random.Random(seed))
+                          if agent._is_scheme_inquiry(query, context)]
+            return handle, follow_ups
+        yield f"handle_scheme_inquiry[schemes={count}]", setup, len(CATEGORIES)
+
+    def setup():
+        texts = [(scheme.eligibility * rng.randint(1, 20), scheme.name) for scheme in catalog[:200]]
+        return agent._parse_eligibility_criteria, texts
+    yield "parse_eligibility_criteria", setup, len(CATEGORIES)
+
+    for size in PAGE_SIZES:
+        def setup(size=size):
+            pages = [(catalog[start:start + size],) for start in range(0, 20 * size, size)]
+            return agent._format_schemes_brief, pages
+        yield f"format_schemes_brief[page={size}]", setup, len(CATEGORIES)
+
+    for count in SCHEME_COUNTS:
+        def setup(count=count):
+            make_session("bench-page", catalog[:count], history=10)
+            return agent._create_paginated_response, [("bench-page", "Here are some schemes:")]
+        yield f"create_paginated_response[schemes={count}]", setup, len(CATEGORIES)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="JSON file from --save-baseline to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed slowdown / allocation growth versus the baseline (0.5 = 50%%)")
+    parser.add_argument("--retries", type=int, default=2,
+                        help="re-measure a case this many times before reporting it as slower")
+    parser.add_argument("--save-baseline", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(_Discard()):
+        agent = MasterAgent()
+
+    baseline = None
+    if args.baseline and os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print(f"schemes per page {settings.schemes_per_page}\n")
+    print(f"{'case':<52}{'us':>10}{'peak B':>10}{'kept':>7}{'vs base':>9}")
+
+    results, failures = {}, []
+    for name, setup, categories in cases(agent, args.seed):
+        if args.filter not in name:
+            continue
+        expected = baseline["cases"].get(name) if baseline else None
+        with contextlib.redirect_stdout(_Discard()), extra_categories(categories, random.Random(args.seed)):
+            timed = setup()
+            for attempt in range(1 + (args.retries if expected else 0)):
+                calibration = calibration_us()
+                result = measure(*timed, args.repeats)
+                result["calibration_us"] = calibration
+                # A slowdown has to show up on a re-run too before it counts
+                if not expected or result["us"] / calibration <= (
+                        expected["us"] / expected["calibration_us"] * (1 + args.tolerance)):
+                    break
+        results[name] = result
+
+        change = ""
+        if expected:
+            scale = calibration / expected["calibration_us"]
+            ratio = result["us"] / (expected["us"] * scale)
+            change = f"{(ratio - 1) * 100:+.0f}%"
+            if ratio > 1 + args.tolerance:
+                failures.append(f"{name}: {result['us']:.1f}us vs {expected['us'] * scale:.1f}us expected")
+            # Absolute slack: peaks move by a few KiB with dict resizes and caches
+            if result["peak_bytes"] > expected["peak_bytes"] * (1 + args.tolerance) + 4096:
+                failures.append(f"{name}: peak {result['peak_bytes']}B vs {expected['peak_bytes']}B")
+            if result["retained_blocks"] > expected["retained_blocks"] + 1:
+                failures.append(f"{name}: keeps {result['retained_blocks']} blocks per call "
+                                f"vs {expected['retained_blocks']}")
+        print(f"{name:<52}{result['us']:>10.2f}{result['peak_bytes']:>10}"
+              f"{result['retained_blocks']:>7.1f}{change:>9}")
+
+    for session_id in ("bench-inquiry", "bench-classify", "bench-handle", "bench-page"):
+        state_service.delete_session(session_id)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, "w") as f:
+            json.dump({"cases": results}, f, indent=2)
+        print(f"\nBaseline saved to {args.save_baseline}")
+
+    if failures:
+        print("\n❌ Routing regression:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    if baseline:
+        print("\n✅ Routing within baseline")
+
+
+if __name__ == "__main__":
+    main()
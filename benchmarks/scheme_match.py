@@ -0,0 +1,211 @@
+"""
+Accuracy and latency of resolving scheme references in follow-up questions
+
+Compares the verbatim name check the master agent used to do with the trigram
+index (src/services/fuzzy_match.py) on a set of realistic follow-up phrasings
+against the mock farmer and MSME results. Cases with expected=None must not
+match any scheme. The farmer results also carry a state edition of a scheme.
+Near-duplicate collapsing must fold exactly the pairs in DUPLICATES (the state
+edition, and PM Kisan Samman Nidhi into PM-KISAN) and keep every other scheme
+separate; naming a folded variant must resolve to its own record.
+
+Usage:
+    python -m benchmarks.scheme_match [--runs 200] [--verbose]
+"""
+import argparse
+import os
+import statistics
+import time
+
+os.environ.setdefault("USE_MOCK_SEARCH", "true")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from config.categories import get_all_keywords
+from config.settings import settings
+from src.models.scheme_record import SchemeRecord
+from src.services.dedup import collapse_near_duplicates, jaccard, scheme_features
+from src.services.fuzzy_match import TrigramIndex
+from src.services.mock_vertex_search import MockVertexSearchService
+from src.services.query_normalizer import normalize_query
+
+# State edition of farmer-6 appended to the farmer results
+VARIANTS = [
+    SchemeRecord(
+        id="farmer-6-od",
+        name="Krishi Sinchai Yojana Odisha",
+        description="Irrigation scheme to expand cultivable area with assured irrigation in Odisha",
+        eligibility="Farmers of Odisha engaged in agriculture",
+        benefits="Financial assistance for drip/sprinkler irrigation, farm ponds, and other water conservation methods",
+        application_process="Apply through Odisha agriculture department",
+        url="https://pmksy.gov.in",
+    ),
+]
+
+# Variant id -> the scheme it must be folded into
+DUPLICATES = {"farmer-4": "farmer-1", "farmer-6-od": "farmer-6"}
+
+# Category keywords, which the app never takes as a scheme reference on their own
+GENERIC_WORDS = frozenset(keyword for keywords in get_all_keywords().values() for keyword in keywords)
+
+# (category, follow-up, expected scheme id or None)
+CASES = [
+    ("farmer", "tell me about the fasal bima one", "farmer-3"),
+    ("farmer", "what are the benefits of fasal bima yojana", "farmer-3"),
+    ("farmer", "how do I apply for PMFBY", "farmer-3"),
+    ("farmer", "am i eligible for crop insurance fasal beema", "farmer-3"),
+    ("farmer", "tell me more about pm kisan", "farmer-1"),
+    ("farmer", "pm-kisan eligibility", "farmer-1"),
+    ("farmer", "kisan samman nidhi details", "farmer-4"),
+    ("farmer", "krishi sinchai yojana odisha details", "farmer-6-od"),
+    ("farmer", "how to get kisan credit card", "farmer-2"),
+    ("farmer", "KCC documents needed", "farmer-2"),
+    ("farmer", "kisaan credit card interest rate", "farmer-2"),
+    ("farmer", "soil health card kaise milega", "farmer-5"),
+    ("farmer", "tell me about the soil card scheme", "farmer-5"),
+    ("farmer", "krishi sinchai yojana benefits", "farmer-6"),
+    ("farmer", "more about e-nam", "farmer-7"),
+    ("farmer", "national agriculture market details", "farmer-7"),
+    ("farmer", "kisan call center number", "farmer-8"),
+    ("farmer", "paramparagat krishi vikas yojna", "farmer-9"),
+    ("farmer", "rashtriya krishi vikas details", "farmer-10"),
+    ("farmer", "what about the third one", None),
+    ("farmer", "which schemes give loans for tractors", None),
+    ("farmer", "thanks that helps", None),
+    ("farmer", "what about soil testing", None),
+    ("farmer", "crop insurance", None),
+    ("farmer", "mujhe kisaan ke liye karja chahiye", None),
+    ("farmer", "kisan loan for buying seeds", None),
+    ("farmer", "kisan yojana batao", None),
+    ("msme", "mudra lone kaise le", "msme-2"),
+    ("msme", "tell me more about mudra loan", "msme-2"),
+    ("msme", "how to apply for mudra", "msme-2"),
+    ("msme", "cgtmse eligibility", "msme-1"),
+    ("msme", "credit guarantee fund details", "msme-1"),
+    ("msme", "pmegp subsidy amount", "msme-3"),
+    ("msme", "employment generation programme benefits", "msme-3"),
+    ("msme", "clcss for machinery", "msme-4"),
+    ("msme", "capital subsidy scheme details", "msme-4"),
+    ("msme", "standup india loan for women", "msme-5"),
+    ("msme", "stand up india eligibility", "msme-5"),
+    ("msme", "udyam registraion process", "msme-6"),
+    ("msme", "udyog aadhar", "msme-6"),
+    ("msme", "market development assistance details", "msme-7"),
+    ("msme", "cluster development programme", "msme-8"),
+    ("msme", "zed certification benefits", "msme-9"),
+    ("msme", "zero defect zero effect", "msme-9"),
+    ("msme", "tequp details", "msme-10"),
+    ("msme", "technology upgradation support", "msme-10"),
+    ("msme", "is there anything for my bakery", None),
+    ("msme", "show more", None),
+    ("msme", "i need a loan for my shop", None),
+    ("msme", "any credit for small business", None),
+    ("msme", "support for technology", None),
+]
+
+
+def verbatim_match(schemes, query):
+    query_lower = query.lower()
+    for scheme in schemes:
+        if scheme.name.lower() in query_lower:
+            return scheme
+    return None
+
+
+def trigram_match(index, schemes, query, catalog=None):
+    # The master agent matches the normalized query ("kisaan" -> "kisan")
+    match = index.best_match(normalize_query(query))
+    if match is None:
+        return None
+    if match.variant_id is not None and catalog:
+        # The app resolves variants through the scheme catalog
+        return catalog[match.variant_id]
+    return schemes[match.position]
+
+
+def build(category):
+    """Collapsed mock results for a category, their index, and an id -> record catalog"""
+    raw = MockVertexSearchService(category).search("", top_k=10)
+    if category == "farmer":
+        raw = raw + VARIANTS
+    schemes = collapse_near_duplicates(raw)
+    return raw, schemes, TrigramIndex(schemes, GENERIC_WORDS), {scheme.id: scheme for scheme in raw}
+
+
+def evaluate(name, matcher, results, verbose):
+    correct = 0
+    for category, query, expected in CASES:
+        schemes, index, _catalog = results[category]
+        found = matcher(index, schemes, query, _catalog)
+        found_id = found.id if found else None
+        ok = found_id == expected
+        correct += ok
+        if verbose and not ok:
+            print(f"   ✗ {name}: {query!r} -> {found_id} (expected {expected})")
+    return correct / len(CASES)
+
+
+def check_dedup(raw, collapsed) -> dict:
+    """DUPLICATES folded into their scheme, nothing else merged, closest distinct pair"""
+    folded = {v["id"]: scheme.id for scheme in collapsed for v in scheme.related_variants}
+    raw_ids = {scheme.id for scheme in raw}
+    expected = {v: rep for v, rep in DUPLICATES.items() if v in raw_ids}
+    features = [(scheme.id, scheme_features(scheme)) for scheme in raw if scheme.id not in DUPLICATES]
+    closest = max(
+        (jaccard(a, b), id_a, id_b)
+        for i, (id_a, a) in enumerate(features) for id_b, b in features[i + 1:]
+    )
+    return {
+        "distinct_merged": sorted(v for v, rep in folded.items() if expected.get(v) != rep),
+        "variants_missed": sorted(v for v, rep in expected.items() if folded.get(v) != rep),
+        "closest_distinct": closest,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    results = {}
+    build_ms = []
+    dedup = []
+    for category in ("farmer", "msme"):
+        raw, schemes, index, catalog = build(category)
+        dedup.append(check_dedup(raw, schemes))
+        started = time.perf_counter()
+        TrigramIndex(schemes, GENERIC_WORDS)
+        build_ms.append((time.perf_counter() - started) * 1000)
+        results[category] = (schemes, index, catalog)
+
+    verbatim = evaluate("verbatim", lambda index, schemes, q, catalog: verbatim_match(schemes, q),
+                        results, args.verbose)
+    trigram = evaluate("trigram", trigram_match, results, args.verbose)
+
+    normalized = [(category, normalize_query(query)) for category, query, _expected in CASES]
+    latencies = []
+    for _ in range(args.runs):
+        for category, query in normalized:
+            schemes, index, _catalog = results[category]
+            started = time.perf_counter()
+            index.best_match(query)
+            latencies.append((time.perf_counter() - started) * 1_000_000)
+    latencies.sort()
+
+    print(f"\n{len(CASES)} follow-up phrasings")
+    print(f"   verbatim name accuracy: {verbatim:.0%}")
+    print(f"   trigram index accuracy: {trigram:.0%}")
+    print(f"   index build: {statistics.mean(build_ms):.2f}ms per 10 schemes")
+    merged = [scheme_id for check in dedup for scheme_id in check["distinct_merged"]]
+    missed = [scheme_id for check in dedup for scheme_id in check["variants_missed"]]
+    closest = max(check["closest_distinct"] for check in dedup)
+    print(f"   near-duplicates (threshold {settings.dedup_threshold}): "
+          f"{len(merged)} distinct schemes merged{' ' + str(merged) if merged else ''}, "
+          f"{len(missed)} expected duplicates missed{' ' + str(missed) if missed else ''}")
+    print(f"   closest distinct pair: {closest[1]} / {closest[2]} at Jaccard {closest[0]:.2f}")
+    print(f"   lookup: p50 {latencies[len(latencies) // 2]:.0f}us, "
+          f"p99 {latencies[int(len(latencies) * 0.99)]:.0f}us, max {latencies[-1]:.0f}us")
+
+
+if __name__ == "__main__":
+    main()
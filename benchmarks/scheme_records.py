@@ -0,0 +1,119 @@
+"""
+Cost of the internal scheme representation: pydantic Scheme vs SchemeRecord
+
+Reports, per object, construction time and allocations for
+  validated   - Scheme(**raw), as search and MasterAgent.process used to do
+  construct   - Scheme.model_construct(**raw), trusted pydantic
+  record      - SchemeRecord(**raw), the internal representation
+then runs full turns through MasterAgent.process with a search stub that
+builds fresh records per call, and reports CPU and retained allocations per
+turn.
+
+Usage:
+    python -m benchmarks.scheme_records [--runs 20000] [--turns 300]
+"""
+import argparse
+import contextlib
+import io
+import os
+import time
+import tracemalloc
+
+os.environ.setdefault("USE_MOCK_SEARCH", "true")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from src.agents.master_agent import get_master_agent
+from src.agents.registry import category_registry
+from src.models.scheme_record import SchemeRecord
+from src.models.schemas import Scheme
+from src.services.dedup import attach_signature
+from src.services.mock_vertex_search import MockVertexSearchService
+from src.services.response_shaping import encode_query_response
+
+RAW = [
+    {k: v for k, v in record.to_dict().items() if k != "related_variants"}
+    for record in MockVertexSearchService("farmer").search("", top_k=10)
+]
+
+
+class FreshSearch:
+    """Search stub returning newly built schemes on every call, like Vertex does"""
+
+    def __init__(self, build):
+        self.build = build
+
+    def search(self, query: str, top_k: int = 10):
+        return [attach_signature(self.build(**raw)) for raw in RAW[:top_k]]
+
+
+def per_object(build, runs: int):
+    started = time.perf_counter()
+    for i in range(runs):
+        build(**RAW[i % len(RAW)])
+    elapsed_us = (time.perf_counter() - started) / runs * 1_000_000
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [build(**RAW[i % len(RAW)]) for i in range(1000)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+    blocks = sum(stat.count_diff for stat in diff) / len(kept)
+    size = sum(stat.size_diff for stat in diff) / len(kept)
+    return elapsed_us, blocks, size
+
+
+def per_turn(turns: int):
+    agent = get_master_agent()
+    session = iter(range(10**9))
+
+    def turn():
+        result = agent.process("I am a farmer looking for support", f"bench-{next(session)}")
+        return encode_query_response(result)
+
+    for _ in range(50):
+        turn()
+    started = time.process_time()
+    for _ in range(turns):
+        turn()
+    cpu_us = (time.process_time() - started) / turns * 1_000_000
+
+    # Sessions keep their schemes, so allocations surviving a turn are the
+    # per-session memory cost of the representation
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(100):
+        turn()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+    return cpu_us, sum(s.count_diff for s in diff) / 100, sum(s.size_diff for s in diff) / 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=20000)
+    parser.add_argument("--turns", type=int, default=300)
+    args = parser.parse_args()
+
+    print(f"{'per object':12} {'us':>7} {'blocks':>7} {'bytes':>7}")
+    for label, build in (
+        ("validated", Scheme),
+        ("construct", Scheme.model_construct),
+        ("record", SchemeRecord),
+    ):
+        us, blocks, size = per_object(build, args.runs)
+        print(f"{label:12} {us:>7.2f} {blocks:>7.1f} {size:>7.0f}")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        get_master_agent()
+        farmer = category_registry.get("FARMER")
+        farmer._search_service = FreshSearch(SchemeRecord)
+        farmer.agent
+        cpu_us, blocks, size = per_turn(args.turns)
+    print(f"\nper turn: cpu {cpu_us:.0f} us, "
+          f"retained {blocks:.0f} blocks / {size / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+/query serialization: FastAPI response_model path vs pre-encoded fragments
+
+For responses carrying 10, 50 and 200 schemes, times
+  fastapi   - response_model validation + encoding of pydantic Schemes,
+              as the /query route did
+  splice    - encode_query_response() on SchemeRecords, fragments cached
+  cold      - encode_query_response() on fresh records (fragments built once)
+and checks that both paths produce identical bytes.
+
+Usage:
+    python -m benchmarks.serialization [--runs 200] [--sizes 10,50,200]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("USE_MOCK_SEARCH", "true")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from src.app import app
+from src.models.schemas import QueryResponse, Scheme
+from src.models.scheme_record import SchemeRecord
+from src.services.mock_vertex_search import MockVertexSearchService
+from src.services.response_shaping import encode_query_response
+
+
+_samples = []
+
+
+def make_records(count: int):
+    if not _samples:
+        _samples.extend(
+            MockVertexSearchService("farmer").search("", top_k=10)
+            + MockVertexSearchService("msme").search("", top_k=10)
+        )
+    return [
+        SchemeRecord.from_dict({**_samples[i % len(_samples)].to_dict(), "id": f"bench-{i}"})
+        for i in range(count)
+    ]
+
+
+def make_response(schemes, trusted: bool = True) -> QueryResponse:
+    build = QueryResponse.trusted if trusted else QueryResponse
+    return build(
+        session_id="bench-session",
+        response="Here are some schemes:\n\n" + "\n".join(f"**{s.name}**" for s in schemes[:3]),
+        schemes=schemes,
+        has_more=False,
+        category="FARMER",
+        total_schemes=len(schemes),
+        shown_schemes=len(schemes)
+    )
+
+
+def per_call_us(fn, runs: int) -> float:
+    started = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    return (time.perf_counter() - started) / runs * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--sizes", default="10,50,200")
+    args = parser.parse_args()
+
+    field = next(r for r in app.routes if getattr(r, "path", "") == "/query").response_field
+    loop = asyncio.new_event_loop()
+
+    def fastapi_encode(result):
+        content = loop.run_until_complete(serialize_response(field=field, response_content=result))
+        return JSONResponse(content).body
+
+    print(f"{'schemes':>8} {'bytes':>8} {'fastapi us':>11} {'splice us':>10} {'cold us':>9} {'speedup':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        result = make_response(make_records(size))
+        model = make_response([Scheme(**record.to_dict()) for record in result.schemes], trusted=False)
+        assert fastapi_encode(model) == encode_query_response(result), "encodings differ"
+
+        fastapi_us = per_call_us(lambda: fastapi_encode(model), args.runs)
+        splice_us = per_call_us(lambda: encode_query_response(result), args.runs)
+
+        cold_runs = max(1, args.runs // 10)
+        cold = [make_response(make_records(size)) for _ in range(cold_runs)]
+        started = time.perf_counter()
+        for fresh in cold:
+            encode_query_response(fresh)
+        cold_us = (time.perf_counter() - started) / cold_runs * 1_000_000
+
+        body = encode_query_response(result)
+        print(f"{size:>8} {len(body):>8} {fastapi_us:>11.0f} {splice_us:>10.0f} {cold_us:>9.0f} "
+              f"{fastapi_us / splice_us:>7.1f}x")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
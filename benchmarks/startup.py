@@ -0,0 +1,124 @@
+"""
+Cold-start benchmark: import time of src.app and time-to-first-response
+
+Each run starts a fresh interpreter, imports src.app, then sends one /query
+through the ASGI app in-process. Reports medians and exits non-zero when a
+median exceeds its threshold, or regresses past a saved baseline.
+
+Usage:
+    python -m benchmarks.startup [--runs 5] [--max-import-ms 1000]
+                                 [--max-first-response-ms 2000]
+                                 [--baseline PATH] [--tolerance 0.25]
+                                 [--save-baseline PATH]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# SDKs that should not be imported until a configured category needs them
+HEAVY_MODULES = ("google.adk", "google.cloud.discoveryengine_v1", "google.genai")
+
+PROBE = r"""
+import json, sys, time
+started = time.perf_counter()
+import src.app
+imported = time.perf_counter()
+heavy_after_import = [m for m in HEAVY if m in sys.modules]
+
+import asyncio, httpx
+
+async def first_response():
+    transport = httpx.ASGITransport(app=src.app.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post("/query", json={"query": QUERY})
+        response.raise_for_status()
+
+asyncio.run(first_response())
+answered = time.perf_counter()
+print("STARTUP_RESULT " + json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "first_response_ms": (answered - started) * 1000,
+    "heavy_after_import": heavy_after_import,
+}))
+"""
+
+
+def run_once(query: str, env: dict) -> dict:
+    code = f"HEAVY = {HEAVY_MODULES!r}\nQUERY = {query!r}\n" + PROBE
+    spawned = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120
+    )
+    exited = time.perf_counter()
+    if proc.returncode != 0:
+        raise RuntimeError(f"startup probe failed:\n{proc.stderr[-2000:]}")
+
+    line = next(l for l in proc.stdout.splitlines() if l.startswith("STARTUP_RESULT "))
+    result = json.loads(line[len("STARTUP_RESULT "):])
+    result["process_ms"] = (exited - spawned) * 1000
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--query", default="I need a loan for my farm")
+    parser.add_argument("--max-import-ms", type=float, default=1000)
+    parser.add_argument("--max-first-response-ms", type=float, default=2000)
+    parser.add_argument("--baseline", help="JSON file from --save-baseline to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown versus the baseline (0.25 = 25%%)")
+    parser.add_argument("--save-baseline", help="write the medians to this JSON file")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("USE_MOCK_SEARCH", "true")
+
+    runs = [run_once(args.query, env) for _ in range(args.runs)]
+    medians = {
+        key: statistics.median(r[key] for r in runs)
+        for key in ("import_ms", "first_response_ms", "process_ms")
+    }
+    heavy = sorted({m for r in runs for m in r["heavy_after_import"]})
+
+    print(f"import src.app       {medians['import_ms']:8.1f} ms (median of {args.runs})")
+    print(f"first /query answer  {medians['first_response_ms']:8.1f} ms")
+    print(f"whole process        {medians['process_ms']:8.1f} ms")
+    print(f"heavy SDKs at import {', '.join(heavy) or 'none'}")
+
+    failures = []
+    if medians["import_ms"] > args.max_import_ms:
+        failures.append(f"import {medians['import_ms']:.0f}ms > {args.max_import_ms:.0f}ms")
+    if medians["first_response_ms"] > args.max_first_response_ms:
+        failures.append(f"first response {medians['first_response_ms']:.0f}ms > {args.max_first_response_ms:.0f}ms")
+    if heavy:
+        failures.append(f"heavy SDKs imported eagerly: {', '.join(heavy)}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for key in ("import_ms", "first_response_ms"):
+            limit = baseline[key] * (1 + args.tolerance)
+            if medians[key] > limit:
+                failures.append(f"{key} {medians[key]:.0f}ms regressed past baseline {baseline[key]:.0f}ms")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(medians, f, indent=2)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if failures:
+        print("\n❌ Startup regression:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print("\n✅ Startup within thresholds")
+
+
+if __name__ == "__main__":
+    main()
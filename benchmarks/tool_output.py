@@ -0,0 +1,95 @@
+"""
+Compare "full" and "compact" tool output modes
+
+Runs the search tools against the mock catalog and feeds the output to a stub
+model whose latency grows with input tokens, so the numbers reflect both the
+serialization cost and the extra model time spent reading the tool result.
+
+Usage:
+    python -m benchmarks.tool_output [--runs 50] [--detail-calls 1]
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+
+os.environ.setdefault("USE_MOCK_SEARCH", "true")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from config.settings import settings
+from src.agents import tools
+from src.services.prompt_builder import estimate_tokens
+
+QUERIES = [
+    "loan for tractor",
+    "crop insurance for kharif season",
+    "drip irrigation subsidy",
+    "organic farming support",
+]
+
+
+class StubModel:
+    """Stand-in for the LLM: fixed overhead plus a per-input-token cost"""
+
+    def __init__(self, base_ms: float = 5.0, per_token_ms: float = 0.01):
+        self.base_ms = base_ms
+        self.per_token_ms = per_token_ms
+
+    def consume(self, text: str) -> int:
+        tokens = estimate_tokens(text)
+        time.sleep((self.base_ms + tokens * self.per_token_ms) / 1000)
+        return tokens
+
+
+def run_mode(mode: str, runs: int, detail_calls: int, model: StubModel) -> dict:
+    settings.tool_output_mode = mode
+    tokens, serialize_ms, e2e_ms = [], [], []
+
+    for i in range(runs):
+        query = QUERIES[i % len(QUERIES)]
+        start = time.perf_counter()
+
+        output = tools.search_farmer_schemes(query, top_k=10)
+        serialized = time.perf_counter()
+        turn_tokens = model.consume(output)
+
+        # Compact mode may need follow-up detail calls for the schemes it discusses
+        if mode == "compact":
+            for scheme in json.loads(output)[:detail_calls]:
+                turn_tokens += model.consume(tools.get_scheme_details(scheme["id"]))
+
+        end = time.perf_counter()
+        tokens.append(turn_tokens)
+        serialize_ms.append((serialized - start) * 1000)
+        e2e_ms.append((end - start) * 1000)
+
+    return {
+        "mode": mode,
+        "tokens": statistics.mean(tokens),
+        "serialize_ms": statistics.mean(serialize_ms),
+        "e2e_ms": statistics.mean(e2e_ms),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--detail-calls", type=int, default=1,
+                        help="get_scheme_details calls per turn in compact mode")
+    parser.add_argument("--per-token-ms", type=float, default=0.01)
+    args = parser.parse_args()
+
+    model = StubModel(per_token_ms=args.per_token_ms)
+    results = [run_mode(mode, args.runs, args.detail_calls, model) for mode in ("full", "compact")]
+
+    print(f"\n{'mode':<10}{'tokens/turn':>14}{'serialize ms':>15}{'e2e ms':>10}")
+    for r in results:
+        print(f"{r['mode']:<10}{r['tokens']:>14.0f}{r['serialize_ms']:>15.3f}{r['e2e_ms']:>10.2f}")
+
+    full, compact = results
+    print(f"\nCompact mode uses {100 * (1 - compact['tokens'] / full['tokens']):.0f}% fewer tokens per turn")
+
+
+if __name__ == "__main__":
+    main()
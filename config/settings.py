@@ -2,10 +2,20 @@
 Configuration settings - Simple version that accepts all env vars
 """
 import os
+from typing import Dict, List
 from dotenv import load_dotenv
 
 load_dotenv()
 
+def _pairs(value: str) -> Dict[str, str]:
+    """"a=1,b=2" -> {"a": "1", "b": "2"}"""
+    pairs = {}
+    for part in value.split(","):
+        key, sep, item = part.partition("=")
+        if sep and key.strip():
+            pairs[key.strip()] = item.strip()
+    return pairs
+
 class Settings:
     """Simple settings class that doesn't validate extra fields"""
     
@@ -22,6 +32,29 @@ class Settings:
         self.farmer_datastore_id = os.getenv("FARMER_DATASTORE_ID", "")
         self.msme_datastore_id = os.getenv("MSME_DATASTORE_ID", "")
         
+        # Federated search over extra datastores (<CATEGORY>_EXTRA_DATASTORE_IDS)
+        self.federated_source_deadline_ms = float(os.getenv("FEDERATED_SOURCE_DEADLINE_MS", "1500"))
+        self.federated_rrf_k = int(os.getenv("FEDERATED_RRF_K", "60"))
+        # Threads per datastore (0 = three per LLM lane worker: a turn's own search,
+        # its agent's tool call and a hedged duplicate's can overlap)
+        self.search_pool_workers = int(os.getenv("SEARCH_POOL_WORKERS", "0"))
+        
+        # Cache lifetimes for GET /schemes and GET /schemes/{id}
+        self.scheme_cache_max_age = int(os.getenv("SCHEME_CACHE_MAX_AGE", "300"))
+        self.catalog_cache_max_age = int(os.getenv("CATALOG_CACHE_MAX_AGE", "60"))
+        
+        # Response compression (brotli needs the optional `brotli` package)
+        self.compression_min_bytes = int(os.getenv("COMPRESSION_MIN_BYTES", "500"))
+        self.gzip_level = int(os.getenv("GZIP_LEVEL", "6"))
+        self.brotli_quality = int(os.getenv("BROTLI_QUALITY", "4"))
+        
+        # Optional JSON list of schemes to seed the catalog (autocomplete) at startup
+        self.scheme_catalog_path = os.getenv("SCHEME_CATALOG_PATH", "")
+        
+        # Near-duplicate schemes collapse at or above this Jaccard similarity of
+        # their name/URL/text features (unrelated schemes score below ~0.1)
+        self.dedup_threshold = float(os.getenv("DEDUP_THRESHOLD", "0.5"))
+        
         # Model
         self.model_name = os.getenv("MODEL_NAME", "gemini-1.5-flash")
         self.temperature = float(os.getenv("TEMPERATURE", "0.7"))
@@ -29,13 +62,106 @@ class Settings:
         # Pagination
         self.schemes_per_page = int(os.getenv("SCHEMES_PER_PAGE", "3"))
         
+        # Prompt assembly for specialist agents
+        self.prompt_token_budget = int(os.getenv("PROMPT_TOKEN_BUDGET", "600"))
+        self.prompt_history_turns = int(os.getenv("PROMPT_HISTORY_TURNS", "10"))
+        
+        # LLM latency budget per turn (hedge of 0 disables the duplicate request)
+        self.llm_latency_budget_ms = int(os.getenv("LLM_LATENCY_BUDGET_MS", "8000"))
+        self.llm_hedge_after_ms = int(os.getenv("LLM_HEDGE_AFTER_MS", "3000"))
+        
+        # Circuit breakers around Vertex search and the LLM
+        self.breaker_window_seconds = float(os.getenv("BREAKER_WINDOW_SECONDS", "60"))
+        self.breaker_min_calls = int(os.getenv("BREAKER_MIN_CALLS", "10"))
+        self.breaker_error_rate = float(os.getenv("BREAKER_ERROR_RATE", "0.5"))
+        self.breaker_slow_rate = float(os.getenv("BREAKER_SLOW_RATE", "0.8"))
+        self.breaker_open_seconds = float(os.getenv("BREAKER_OPEN_SECONDS", "30"))
+        self.breaker_half_open_probes = int(os.getenv("BREAKER_HALF_OPEN_PROBES", "2"))
+        self.search_slow_call_ms = int(os.getenv("SEARCH_SLOW_CALL_MS", "2000"))
+        self.llm_slow_call_ms = int(os.getenv("LLM_SLOW_CALL_MS", "5000"))
+        
+        # Tool output sent to the LLM: "compact" projection or "full" schemes
+        self.tool_output_mode = os.getenv("TOOL_OUTPUT_MODE", "compact").lower()
+        self.tool_fact_chars = int(os.getenv("TOOL_FACT_CHARS", "120"))
+        
+        # Categories built during startup warmup (empty = all configured)
+        self.warmup_categories = [
+            c.strip().upper() for c in os.getenv("WARMUP_CATEGORIES", "").split(",") if c.strip()
+        ]
+        
+        # Logging (queued, written by a background thread). LOG_LEVELS and
+        # LOG_SAMPLE_RATES are per-logger, e.g. LOG_LEVELS="src.services=DEBUG",
+        # LOG_SAMPLE_RATES="src.services.mock_vertex_search=0.01" (debug/info only)
+        self.log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+        self.log_levels = {name: level.upper() for name, level in _pairs(os.getenv("LOG_LEVELS", "")).items()}
+        self.log_sample_rates = {name: float(rate) for name, rate in _pairs(os.getenv("LOG_SAMPLE_RATES", "")).items()}
+        self.log_format = os.getenv("LOG_FORMAT", "text").lower()  # text or json
+        self.log_queue_size = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+        
+        # On-demand profiling of /query turns: a sampled fraction of requests,
+        # plus any request sending X-Profile: <PROFILE_TOKEN> (header ignored if unset)
+        self.profile_sample_rate = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+        self.profile_token = os.getenv("PROFILE_TOKEN", "")
+        self.profile_interval_ms = float(os.getenv("PROFILE_INTERVAL_MS", "2"))
+        self.profile_dir = os.getenv("PROFILE_DIR", "profiles")
+        
+        # Execution lanes for /query turns: deterministic turns on the fast lane,
+        # search + LLM turns on the llm lane. A lane's worker count is also its
+        # admission limit, so the total concurrency is their sum
+        self.lane_fast_workers = int(os.getenv("LANE_FAST_WORKERS", "4"))
+        self.lane_llm_workers = int(os.getenv("LANE_LLM_WORKERS", "32"))
+        
+        # ADK runner: threads for blocking tool work (searches of every LLM turn
+        # and its hedged duplicate), and lifetime of idle ADK sessions
+        self.adk_tool_workers = int(os.getenv("ADK_TOOL_WORKERS", str(2 * self.lane_llm_workers)))
+        self.adk_session_ttl_seconds = float(os.getenv("ADK_SESSION_TTL_SECONDS", "1800"))
+        self.adk_max_sessions = int(os.getenv("ADK_MAX_SESSIONS", "10000"))
+        
+        # Admission control for /query. Per-route limits and queue timeouts use
+        # the routes of scheme_routes_total, e.g. ADMISSION_ROUTE_LIMITS="agent=24"
+        self.admission_max_queue = int(os.getenv("ADMISSION_MAX_QUEUE", "128"))
+        self.admission_max_per_session = int(os.getenv("ADMISSION_MAX_PER_SESSION", "1"))
+        self.admission_session_queue = int(os.getenv("ADMISSION_SESSION_QUEUE", "2"))
+        self.admission_queue_timeout_ms = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_MS", "2000"))
+        self.admission_route_limits = {
+            route: int(limit) for route, limit in _pairs(os.getenv("ADMISSION_ROUTE_LIMITS", "")).items()
+        }
+        self.admission_route_timeouts_ms = {
+            route: float(ms) for route, ms in _pairs(os.getenv("ADMISSION_ROUTE_TIMEOUTS_MS", "")).items()
+        }
+        self.admission_retry_after_s = int(os.getenv("ADMISSION_RETRY_AFTER_S", "1"))
+        
+        # Capture of /query traffic to rotating JSONL files for benchmarks.replay;
+        # CAPTURE_REDACT names the redaction hooks applied to query text
+        self.capture_traffic = os.getenv("CAPTURE_TRAFFIC", "false").lower() == "true"
+        self.capture_dir = os.getenv("CAPTURE_DIR", "captures")
+        self.capture_max_bytes = int(os.getenv("CAPTURE_MAX_BYTES", str(64 * 1024 * 1024)))
+        self.capture_backup_count = int(os.getenv("CAPTURE_BACKUP_COUNT", "10"))
+        self.capture_queue_size = int(os.getenv("CAPTURE_QUEUE_SIZE", "10000"))
+        self.capture_redact = [
+            name.strip() for name in os.getenv("CAPTURE_REDACT", "digits,emails").split(",") if name.strip()
+        ]
+        
         # Mock mode
         self.use_mock_search = os.getenv("USE_MOCK_SEARCH", "false").lower() == "true"
 
-settings = Settings()
+    def datastore_id(self, key: str) -> str:
+        """Datastore ID for a category's datastore_id_key (attribute or env var)"""
+        return getattr(self, key, "") or os.getenv(key.upper(), "")
+
+    def datastore_ids(self, key: str) -> List[str]:
+        """Comma-separated list of datastore IDs (attribute or env var)"""
+        value = getattr(self, key, "") or os.getenv(key.upper(), "")
+        return [part.strip() for part in value.split(",") if part.strip()]
 
-# Debug print
-print(f"⚙️  Settings loaded successfully")
-print(f"   GCP Project: {settings.gcp_project_id}")
-print(f"   Mock Mode: {settings.use_mock_search}")
-print(f"   Farmer Datastore: {settings.farmer_datastore_id[:50]}..." if settings.farmer_datastore_id else "   Farmer Datastore: Not set")
\ No newline at end of file
+    def summary(self) -> str:
+        """Short description of the active configuration for startup logs"""
+        lines = [
+            "⚙️  Settings loaded successfully",
+            f"   GCP Project: {self.gcp_project_id}",
+            f"   Mock Mode: {self.use_mock_search}",
+            f"   Farmer Datastore: {self.farmer_datastore_id[:50]}..." if self.farmer_datastore_id else "   Farmer Datastore: Not set",
+        ]
+        return "\n".join(lines)
+
+settings = Settings()
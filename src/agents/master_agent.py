@@ -3,7 +3,9 @@ Master Agent - Enhanced Conversational Flow
 Users can explore schemes interactively
 """
 from src.services.state_service import state_service
-from src.models.schemas import QueryResponse, Scheme
+from src.services.query_normalizer import normalize_query
+from src.models.schemas import ConversationContext, QueryResponse
+from src.models.scheme_record import SchemeRecord
 from config.settings import settings
 from config.categories import (
     get_all_category_ids,
@@ -11,42 +13,68 @@ from config.categories import (
     generate_clarification_prompt,
     CATEGORIES
 )
-import json
+from src.agents.registry import category_registry
+from src.services.metrics import ROUTES, TURN_SECONDS, stage_timer
+from src.services.lanes import lane_for
+from src.services.log import get_logger
+from typing import Optional
 import re
+import threading
+import time
+
+log = get_logger(__name__)
+_session_load = stage_timer("session_load")
+_inquiry_detection = stage_timer("inquiry_detection")
+_classification = stage_timer("classification")
+_formatting = stage_timer("formatting")
+
+class TurnPlan:
+    """
+    Route a turn will take, decided before any work is done: cheap and
+    read-only, so admission control can pick limits by route first
+    """
+    __slots__ = ("route", "normalized", "scheme", "category", "history_len")
+
+    def __init__(self, route: str, normalized: str, scheme: Optional[SchemeRecord] = None,
+                 category: Optional[str] = None, history_len: int = 0):
+        self.route = route
+        self.normalized = normalized
+        self.scheme = scheme  # eligibility: the scheme being checked
+        self.category = category  # agent/clarification: newly classified category
+        self.history_len = history_len  # Session turns seen when planned
+    
+    @property
+    def lane(self) -> str:
+        """Execution lane by cost: llm for search + LLM turns, fast for the rest"""
+        return lane_for(self.route)
+
 
 class MasterAgent:
     def __init__(self):
         self.name = "MasterAgent"
         self.categories = get_all_category_ids()
         
-        # Import specialized ADK agents
-        from src.agents.farmer_agent import farmer_agent, get_farmer_response, is_adk_agent as is_farmer_adk
-        from src.agents.msme_agent import msme_agent, get_msme_response, is_adk_agent as is_msme_adk
-        
-        self.farmer_agent = farmer_agent
-        self.msme_agent = msme_agent
-        self.get_farmer_response = get_farmer_response
-        self.get_msme_response = get_msme_response
-        
-        print(f"🚀 Master Agent initialized with categories: {', '.join(self.categories)}")
-        
-        # Check if ADK agents are loaded
-        if is_farmer_adk:
-            print(f"   ✅ Farmer Agent (ADK with LLM)")
-        else:
-            print(f"   ⚠️  Farmer Agent (Fallback mode)")
-            
-        if is_msme_adk:
-            print(f"   ✅ MSME Agent (ADK with LLM)")
-        else:
-            print(f"   ⚠️  MSME Agent (Fallback mode)")
+        log.info("Master Agent initialized with categories: %s", ", ".join(self.categories))
     
-    def process(self, query: str, session_id: str, show_more: bool = False) -> QueryResponse:
+    def plan_turn(self, query: str, session_id: str, show_more: bool = False) -> TurnPlan:
+        """The route this turn will take, without creating or changing the session"""
+        context = state_service.sessions.get(session_id) or ConversationContext(session_id=session_id)
+        # Devanagari/Hinglish -> canonical keyword tokens for the keyword checks;
+        # the specialist agents still get the query as written
+        return self._plan(normalize_query(query), context, show_more)
+    
+    def process(self, query: str, session_id: str, show_more: bool = False,
+                plan: Optional[TurnPlan] = None) -> QueryResponse:
         """Main processing method for handling user queries"""
-        
-        # Get or create session context
-        context = state_service.get_or_create(session_id)
-        context.add_message("user", query)
+        started = time.perf_counter()
+        route, response = self._process(query, session_id, show_more, plan)
+        ROUTES.labels(route).inc()
+        TURN_SECONDS.labels(route).observe(time.perf_counter() - started)
+        return response
+    
+    def _plan(self, normalized: str, context, show_more: bool) -> TurnPlan:
+        """Pick the route for a turn from the session state; no side effects"""
+        history_len = len(context.conversation_history)
         
         # Check if we're in eligibility check flow
         if hasattr(context, 'eligibility_check_in_progress') and context.eligibility_check_in_progress:
@@ -62,59 +90,89 @@ class MasterAgent:
                         break
             
             if scheme:
-                response = self._handle_eligibility_question(query, scheme, context)
-                context.add_message("assistant", response)
-                
-                return QueryResponse(
-                    session_id=session_id,
-                    response=response,
-                    schemes=[scheme] if scheme else [],
-                    has_more=False,
-                    category=context.category,
-                    total_schemes=len(context.schemes),
-                    shown_schemes=0
-                )
+                return TurnPlan("eligibility", normalized, scheme=scheme, history_len=history_len)
         
         # Check if user is asking about a specific scheme
-        if self._is_scheme_inquiry(query, context):
-            return self._handle_scheme_inquiry(query, session_id, context)
+        with _inquiry_detection.time():
+            is_inquiry = self._is_scheme_inquiry(normalized, context)
+        if is_inquiry:
+            return TurnPlan("scheme_inquiry", normalized, history_len=history_len)
         
         # Handle "show more" requests
         if show_more and context.category and context.schemes:
-            return self._handle_show_more(session_id, context)
+            return TurnPlan("show_more", normalized, history_len=history_len)
         
         # Determine category if not set
         if not context.category:
-            category = self._classify_intent(query, context.get_history_text())
+            with _classification.time():
+                category = self._classify_intent(normalized, context.get_history_text())
+            route = "clarification" if category == "UNCLEAR" else "agent"
+            return TurnPlan(route, normalized, category=category, history_len=history_len)
+        
+        return TurnPlan("agent", normalized, history_len=history_len)
+    
+    def _process(self, query: str, session_id: str, show_more: bool, plan: Optional[TurnPlan]):
+        """(route taken, response) for one turn"""
+        
+        # Get or create session context
+        with _session_load.time():
+            context = state_service.get_or_create(session_id)
+            # A plan made before another turn of this session ran is stale
+            if plan is None or plan.history_len != len(context.conversation_history):
+                plan = self._plan(normalize_query(query), context, show_more)
+            context.add_message("user", query)
+        normalized = plan.normalized
+        
+        if plan.route == "eligibility":
+            scheme = plan.scheme
+            response = self._handle_eligibility_question(normalized, scheme, context)
+            context.add_message("assistant", response)
             
-            if category == "UNCLEAR":
-                clarification = self._ask_clarification(query)
-                context.add_message("assistant", clarification)
-                
-                return QueryResponse(
-                    session_id=session_id,
-                    response=clarification,
-                    schemes=[],
-                    has_more=False,
-                    category="UNCLEAR",
-                    total_schemes=0,
-                    shown_schemes=0
-                )
+            return "eligibility", QueryResponse.trusted(
+                session_id=session_id,
+                response=response,
+                schemes=[scheme] if scheme else [],
+                has_more=False,
+                category=context.category,
+                total_schemes=len(context.schemes),
+                shown_schemes=0
+            )
+        
+        if plan.route == "scheme_inquiry":
+            return "scheme_inquiry", self._handle_scheme_inquiry(normalized, session_id, context)
+        
+        if plan.route == "show_more":
+            return "show_more", self._handle_show_more(session_id, context)
+        
+        if plan.route == "clarification":
+            clarification = self._ask_clarification(query)
+            context.add_message("assistant", clarification)
             
-            context.category = category
-            state_service.update_category(session_id, category)
+            return "clarification", QueryResponse.trusted(
+                session_id=session_id,
+                response=clarification,
+                schemes=[],
+                has_more=False,
+                category="UNCLEAR",
+                total_schemes=0,
+                shown_schemes=0
+            )
+        
+        if plan.category:
+            context.category = plan.category
+            state_service.update_category(session_id, plan.category)
         
         # Route to specialized agent
         result = self._route_to_agent(query, context)
         
         # Store schemes and prepare paginated response
         if result.get("schemes"):
-            schemes = [Scheme(**s) if isinstance(s, dict) else s for s in result["schemes"]]
+            schemes = [SchemeRecord.from_dict(s) if isinstance(s, dict) else s for s in result["schemes"]]
             state_service.set_schemes(session_id, schemes)
         
         context.add_message("assistant", result["response"])
         
-        return self._create_paginated_response(session_id, result["response"])
+        return "agent", self._create_paginated_response(session_id, result["response"])
     
     def _is_scheme_inquiry(self, query: str, context) -> bool:
         """Check if user is asking about a specific scheme or scheme details"""
@@ -128,11 +186,9 @@ class MasterAgent:
             'am i eligible', 'qualify', 'scheme number'
         ]
         
-        # Check if any scheme names are mentioned
-        if context.schemes:
-            for scheme in context.schemes:
-                if scheme.name.lower() in query_lower:
-                    return True
+        # Check if any scheme is named, even loosely ("the fasal bima one")
+        if state_service.match_scheme(context.session_id, query):
+            return True
         
         # Check for scheme number patterns (like "scheme 1", "first one", "second scheme")
         if re.search(r'\b(scheme|number|option)\s*[1-9]', query_lower):
@@ -147,7 +203,7 @@ class MasterAgent:
         """Handle user inquiries about specific schemes"""
         
         if not context.schemes:
-            return QueryResponse(
+            return QueryResponse.trusted(
                 session_id=session_id,
                 response="I don't have any schemes to show you yet. Please tell me what you're looking for.",
                 schemes=[],
@@ -183,13 +239,11 @@ class MasterAgent:
                         scheme_index = num
                     break
         
-        # Check if scheme name is mentioned
+        # Check if scheme name is mentioned (fuzzy: aliases, acronyms, typos)
         if not selected_scheme:
-            for idx, scheme in enumerate(context.schemes):
-                if scheme.name.lower() in query_lower:
-                    selected_scheme = scheme
-                    scheme_index = idx + 1
-                    break
+            match = state_service.match_scheme(session_id, query)
+            if match:
+                scheme_index, selected_scheme = match
         
         # If still no scheme found, use last mentioned or first one
         if not selected_scheme:
@@ -201,7 +255,7 @@ class MasterAgent:
                 selected_scheme = context.last_discussed_scheme
         
         if not selected_scheme:
-            return QueryResponse(
+            return QueryResponse.trusted(
                 session_id=session_id,
                 response="I'm not sure which scheme you're referring to. Could you please specify the scheme number (1, 2, 3, etc.)?",
                 schemes=[],
@@ -219,7 +273,7 @@ class MasterAgent:
         
         context.add_message("assistant", response)
         
-        return QueryResponse(
+        return QueryResponse.trusted(
             session_id=session_id,
             response=response,
             schemes=[selected_scheme],
@@ -229,7 +283,7 @@ class MasterAgent:
             shown_schemes=0
         )
     
-    def _generate_scheme_details(self, query: str, scheme: Scheme, context) -> str:
+    def _generate_scheme_details(self, query: str, scheme: SchemeRecord, context) -> str:
         """Generate appropriate response based on what user is asking about the scheme"""
         
         # Check eligibility inquiry
@@ -290,7 +344,7 @@ class MasterAgent:
         
         return response
     
-    def _handle_eligibility_question(self, query: str, scheme: Scheme, context) -> str:
+    def _handle_eligibility_question(self, query: str, scheme: SchemeRecord, context) -> str:
         """Handle interactive eligibility checking with questions"""
         
         query_lower = query.lower()
@@ -311,7 +365,7 @@ class MasterAgent:
         # Parse the eligibility criteria and ask next question
         return self._ask_next_eligibility_question(scheme, context)
     
-    def _ask_next_eligibility_question(self, scheme: Scheme, context) -> str:
+    def _ask_next_eligibility_question(self, scheme: SchemeRecord, context) -> str:
         """Ask the next eligibility question based on scheme criteria"""
         
         # Parse eligibility criteria
@@ -377,7 +431,7 @@ class MasterAgent:
         
         return questions
     
-    def _determine_eligibility(self, scheme: Scheme, context, questions: list) -> str:
+    def _determine_eligibility(self, scheme: SchemeRecord, context, questions: list) -> str:
         """Determine eligibility based on answers"""
         
         # Analyze answers
@@ -428,10 +482,10 @@ class MasterAgent:
         
         if max_score > 0:
             best_category = max(category_scores, key=category_scores.get)
-            print(f"🔍 Keyword Classification: {best_category} (score: {max_score})")
+            log.debug("Keyword classification", category=best_category, score=max_score)
             return best_category
         else:
-            print(f"🔍 Keyword Classification: UNCLEAR (no keywords matched)")
+            log.debug("Keyword classification", category="UNCLEAR", score=0)
             return "UNCLEAR"
     
     def _ask_clarification(self, query: str) -> str:
@@ -446,24 +500,19 @@ class MasterAgent:
         try:
             category = context.category
             
-            if category == "FARMER":
-                # Farmer ADK agent uses LLM to generate conversational response
-                return self.get_farmer_response(query, context)
-                
-            elif category == "MSME":
-                # MSME ADK agent uses LLM to generate conversational response
-                return self.get_msme_response(query, context)
-            
-            else:
+            # Specialized agents are built by the registry on first use of a category
+            category_agent = category_registry.get(category)
+            if category_agent is None:
                 return {
                     "response": f"I'm sorry, I don't have schemes for the category: {category}",
                     "schemes": []
                 }
             
+            # The ADK agent uses the LLM to generate a conversational response
+            return category_agent.respond(query, context)
+            
         except Exception as e:
-            print(f"❌ Routing error: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Routing error", category=context.category)
             return {
                 "response": f"I encountered an error while searching for schemes: {str(e)}",
                 "schemes": []
@@ -488,6 +537,7 @@ class MasterAgent:
     def _create_paginated_response(self, session_id: str, intro_text: str) -> QueryResponse:
         """Create paginated response with schemes - showing only name and short description"""
         
+        formatting_started = time.perf_counter()
         context = state_service.get_or_create(session_id)
         current_schemes = state_service.get_current_schemes(session_id)
         has_more = state_service.has_more_schemes(session_id)
@@ -504,8 +554,9 @@ class MasterAgent:
         full_response += "\n• 'What are the benefits of the first scheme?'"
         full_response += "\n• 'Am I eligible for scheme 2?'"
         full_response += "\n• 'How do I apply for the third scheme?'"
+        _formatting.observe(time.perf_counter() - formatting_started)
         
-        return QueryResponse(
+        return QueryResponse.trusted(
             session_id=session_id,
             response=full_response,
             schemes=current_schemes,
@@ -530,9 +581,28 @@ class MasterAgent:
             
             text = f"\n**{i}. {scheme.name}**\n"
             text += f"   {short_desc}\n"
+            if scheme.related_variants:
+                text += f"   Also available as: {', '.join(v['name'] for v in scheme.related_variants)}\n"
             
             formatted.append(text)
         
         return "\n".join(formatted)
 
-master_agent = MasterAgent()
\ No newline at end of file
+_master_agent = None
+_master_agent_lock = threading.Lock()
+
+def get_master_agent() -> MasterAgent:
+    """Create the shared MasterAgent on first use"""
+    global _master_agent
+    if _master_agent is None:
+        # Warmup and the first request may both get here
+        with _master_agent_lock:
+            if _master_agent is None:
+                _master_agent = MasterAgent()
+    return _master_agent
+
+def __getattr__(name):
+    # Keeps `from src.agents.master_agent import master_agent` working lazily
+    if name == "master_agent":
+        return get_master_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,236 @@
+"""
+Category registry - builds each category's search service, search tool and
+ADK agent from its CategoryConfig on first use and caches them
+Adding a category to CATEGORIES costs nothing until it receives traffic.
+"""
+from typing import Dict, List, Optional
+from config.categories import CATEGORIES, CategoryConfig
+from config.settings import settings
+from src.models.scheme_record import SchemeRecord
+from src.agents.tools import (
+    SHARED_TOOLS,
+    create_search_service,
+    find_schemes,
+    make_search_tool,
+)
+from src.services.agent_runner import agent_runner
+from src.services.circuit_breaker import get_breaker
+from src.services.latency_budget import await_with_hedge, templated_response
+from src.services.metrics import CACHE_HITS, FALLBACKS, LLM_SECONDS, PROMPT_TOKENS
+from src.services.prompt_builder import build_agent_prompt, estimate_tokens
+from src.services.log import get_logger
+import threading
+import time
+
+log = get_logger(__name__)
+
+# All specialist agents share one Gemini dependency
+llm_breaker = get_breaker("gemini", settings.llm_slow_call_ms)
+
+
+class CategoryAgent:
+    """Lazily built search service, search tool and ADK agent for one category"""
+
+    def __init__(self, config: CategoryConfig):
+        self.config = config
+        self.id = config.id
+        self.agent_name = config.agent_name or f"{config.id.title()}Agent"
+        self.scheme_kind = config.scheme_kind or config.id.lower()
+        self.is_adk_agent = False
+
+        self._search_service = None
+        self._search_tool = config.search_tool
+        self._agent = None
+        self._agent_built = False
+        self._lock = threading.Lock()
+
+    @property
+    def datastore_id(self) -> str:
+        return settings.datastore_id(self.config.datastore_id_key)
+
+    @property
+    def search_service(self):
+        if self._search_service is None:
+            with self._lock:
+                if self._search_service is None:
+                    self._search_service = create_search_service(
+                        self.id,
+                        self.datastore_id,
+                        settings.datastore_ids(self.config.extra_datastore_ids_key)
+                        if self.config.extra_datastore_ids_key else []
+                    )
+        return self._search_service
+
+    @property
+    def search_tool(self):
+        if self._search_tool is None:
+            self._search_tool = make_search_tool(
+                self.id, self.scheme_kind, lambda: self.search_service
+            )
+        return self._search_tool
+
+    @property
+    def agent(self):
+        """The ADK agent, or None when ADK is unavailable (fallback mode)"""
+        if not self._agent_built:
+            with self._lock:
+                if not self._agent_built:
+                    self._build_agent()
+        return self._agent
+
+    def _build_agent(self):
+        try:
+            # google.adk is only imported once a category is actually used
+            from google.adk.agents import Agent
+
+            self._agent = Agent(
+                name=self.agent_name,
+                model=settings.model_name,
+                instruction=self.config.agent_instruction,
+                tools=[self.search_tool, *SHARED_TOOLS],
+            )
+            agent_runner.register(self._agent)
+            self.is_adk_agent = True
+            log.info("%s (ADK) initialized", self.agent_name)
+        except Exception as e:
+            log.warning("Could not initialize %s with ADK, using fallback implementation: %s",
+                        self.agent_name, e)
+            self._agent = None
+        self._agent_built = True
+
+    def find_schemes(self, query: str, top_k: int = 10) -> List[SchemeRecord]:
+        try:
+            return find_schemes(self.search_service, query, top_k)
+        except Exception as e:
+            log.error("Search error: %s", e, category=self.id)
+            FALLBACKS.labels("search_error").inc()
+            return []
+
+    def respond(self, query: str, context) -> dict:
+        """Answer a query for this category with the ADK agent or the fallback"""
+        if self.agent is None:
+            log.debug("Using fallback %s", self.agent_name)
+            FALLBACKS.labels("adk_unavailable").inc()
+            schemes = self.find_schemes(query, top_k=10)
+            return {
+                "response": f"I found {len(schemes)} {self.scheme_kind} schemes that might help you. Let me show you the options:",
+                "schemes": schemes
+            }
+
+        try:
+            log.debug("Using %s (ADK) with LLM", self.agent_name)
+            return self._respond_with_llm(query, context)
+        except Exception:
+            log.exception("ADK agent error, falling back to simple search", agent=self.agent_name)
+            FALLBACKS.labels("adk_error").inc()
+
+            return {
+                "response": f"I found some {self.scheme_kind} schemes that might help you:",
+                "schemes": self.find_schemes(query, top_k=10)
+            }
+
+    def _seed_prompt(self, query: str, context) -> str:
+        """The token-budgeted prompt that opens a new ADK session"""
+        return build_agent_prompt(
+            query,
+            context,
+            f"Please analyze this {self.config.audience}'s needs and use the "
+            f"{self.search_tool.__name__} tool to find relevant schemes, then present "
+            f"them in a {self.config.response_style}."
+        ).text
+
+    def _respond_with_llm(self, query: str, context) -> dict:
+        started = time.perf_counter()
+
+        # The ADK session already holds the conversation after its first turn;
+        # only a new session is seeded with the token-budgeted history
+        seed_prompt = None
+        if agent_runner.has_session(self.agent_name, context.session_id):
+            CACHE_HITS.labels("llm_session").inc()
+            message = query
+        else:
+            seed_prompt = message = self._seed_prompt(query, context)
+        prompt_tokens = estimate_tokens(message)
+        PROMPT_TOKENS.labels(self.agent_name).observe(prompt_tokens)
+        log.debug("Prompt built", prompt_tokens=prompt_tokens, budget=settings.prompt_token_budget)
+
+        # Fail fast to the templated response while Gemini is degraded
+        if not llm_breaker.allow():
+            log.warning("LLM skipped, circuit %s is %s", llm_breaker.name, llm_breaker.state)
+            FALLBACKS.labels("llm_circuit_open").inc()
+            schemes = self.find_schemes(query, top_k=10)
+            return {
+                "response": templated_response(schemes, self.scheme_kind),
+                "schemes": schemes
+            }
+
+        # Run the agent turn on the shared runner while we fetch the schemes
+        pending = agent_runner.submit(self.agent_name, context.session_id, message)
+        schemes = self.find_schemes(query, top_k=10)
+
+        # A hedged duplicate runs in a throwaway session, so it gets the full
+        # prompt; built only if the hedge actually fires
+        result = await_with_hedge(
+            pending,
+            lambda: agent_runner.submit_ephemeral(
+                self.agent_name, seed_prompt or self._seed_prompt(query, context)
+            ),
+            started,
+            settings.llm_latency_budget_ms / 1000,
+            settings.llm_hedge_after_ms / 1000
+        )
+        llm_breaker.record(result.value is not None, result.elapsed_ms / 1000)
+        outcome = "ok" if result.value is not None else "timeout" if result.timed_out else "error"
+        LLM_SECONDS.labels(self.agent_name, outcome).observe(result.elapsed_ms / 1000)
+        if result.hedged:
+            FALLBACKS.labels("llm_hedged").inc()
+        if result.value is None:
+            reason = "budget expired" if result.timed_out else f"error: {result.error}"
+            log.warning("LLM %s after %.0fms, using templated response", reason, result.elapsed_ms,
+                        agent=self.agent_name)
+            FALLBACKS.labels(f"llm_{outcome}_templated").inc()
+            return {
+                "response": templated_response(schemes, self.scheme_kind),
+                "schemes": schemes
+            }
+
+        log.debug("ADK agent response generated", agent=self.agent_name,
+                  elapsed_ms=round(result.elapsed_ms), hedged=result.hedged)
+        return {
+            "response": result.value,
+            "schemes": schemes
+        }
+
+
+class CategoryRegistry:
+    def __init__(self, categories: Dict[str, CategoryConfig] = CATEGORIES):
+        self._categories = categories
+        self._agents: Dict[str, CategoryAgent] = {}
+        self._lock = threading.Lock()
+
+    def get(self, category_id: str) -> Optional[CategoryAgent]:
+        """The category's agent bundle, created on first use; None if unknown"""
+        category_agent = self._agents.get(category_id)
+        if category_agent is None:
+            config = self._categories.get(category_id)
+            if config is None:
+                return None
+            with self._lock:
+                category_agent = self._agents.get(category_id)
+                if category_agent is None:
+                    category_agent = CategoryAgent(config)
+                    self._agents[category_id] = category_agent
+        return category_agent
+
+    def configured(self) -> List[str]:
+        """Categories with a datastore configured (all of them in mock mode)"""
+        return [
+            category_id for category_id, config in self._categories.items()
+            if settings.use_mock_search or settings.datastore_id(config.datastore_id_key)
+        ]
+
+    def built(self) -> List[str]:
+        return list(self._agents)
+
+
+category_registry = CategoryRegistry()
@@ -1,75 +1,151 @@
 """
-Tools for farmer and MSME scheme search with lazy initialization
+Scheme search tools, built per category by the category registry
 This file must NOT initialize any services at import time
 """
-from typing import Optional
+from typing import Callable, List, Optional
+from src.models.scheme_record import SchemeRecord
+import asyncio
 import json
 
-# Global variables - but NOT initialized yet!
-_farmer_search: Optional[object] = None
-_msme_search: Optional[object] = None
-
-def get_farmer_search():
-    """Lazy initialization of farmer search service"""
-    global _farmer_search
-    if _farmer_search is None:
-        from config.settings import settings
-        
+def create_search_service(category_id: str, datastore_id: str, extra_datastore_ids: Optional[List[str]] = None):
+    """
+    Build the search backend for one category's datastore
+    With extra datastores, a federated service searches all of them together
+    """
+    from config.settings import settings
+    
+    def single(datastore: str):
         if settings.use_mock_search:
             from src.services.mock_vertex_search import MockVertexSearchService
-            _farmer_search = MockVertexSearchService(settings.farmer_datastore_id or "farmer")
-        else:
-            from src.services.vertex_search import VertexSearchService
-            _farmer_search = VertexSearchService(settings.farmer_datastore_id)
-    return _farmer_search
+            return MockVertexSearchService(datastore or category_id.lower())
+        from src.services.vertex_search import VertexSearchService
+        return VertexSearchService(datastore)
+    
+    if not extra_datastore_ids:
+        return single(datastore_id)
+    
+    from src.services.federated_search import FederatedSearchService, FederatedSource
+    datastores = [d for d in [datastore_id, *extra_datastore_ids] if d]
+    return FederatedSearchService([
+        FederatedSource(name=d.rstrip("/").split("/")[-1], service=single(d))
+        for d in datastores
+    ])
 
-def get_msme_search():
-    """Lazy initialization of MSME search service"""
-    global _msme_search
-    if _msme_search is None:
-        from config.settings import settings
-        
-        if settings.use_mock_search:
-            from src.services.mock_vertex_search import MockVertexSearchService
-            _msme_search = MockVertexSearchService(settings.msme_datastore_id or "msme")
-        else:
-            from src.services.vertex_search import VertexSearchService
-            _msme_search = VertexSearchService(settings.msme_datastore_id)
-    return _msme_search
+def _truncate(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars - 3] + "..."
 
-def search_farmer_schemes(query: str, top_k: int = 10) -> str:
-    """
-    Search for farmer schemes in the Vertex AI Search datastore.
+def project_scheme(scheme, max_chars: Optional[int] = None) -> dict:
+    """Compact view of a scheme for the LLM: id, name and truncated key facts"""
+    from config.settings import settings
+    max_chars = max_chars or settings.tool_fact_chars
+    
+    projected = {"id": scheme.id, "name": scheme.name}
+    if scheme.benefits:
+        projected["benefits"] = _truncate(scheme.benefits, max_chars)
+    if scheme.eligibility:
+        projected["eligibility"] = _truncate(scheme.eligibility, max_chars)
+    return projected
+
+def format_tool_output(schemes: List[SchemeRecord], mode: Optional[str] = None) -> str:
+    """Serialize search results for the LLM according to TOOL_OUTPUT_MODE"""
+    from config.settings import settings
+    mode = mode or settings.tool_output_mode
+    
+    if mode == "full":
+        return "[" + ",".join(scheme.json_bytes().decode("utf-8") for scheme in schemes) + "]"
+    return json.dumps(
+        [project_scheme(scheme) for scheme in schemes],
+        ensure_ascii=False,
+        separators=(",", ":")
+    )
+
+def find_schemes(search_service, query: str, top_k: int = 10) -> List[SchemeRecord]:
+    """Structured scheme search for agent code (not exposed to the LLM)"""
+    from src.services.dedup import collapse_near_duplicates
+    from src.services.scheme_catalog import scheme_catalog
+    
+    schemes = search_service.search(query, top_k)
+    # Variants stay in the catalog so their ids still resolve
+    scheme_catalog.add_many(schemes)
+    return collapse_near_duplicates(schemes)
+
+def search_tool_output(search_service, query: str, top_k: int = 10) -> str:
+    """find_schemes formatted for the LLM; errors are returned as JSON"""
+    try:
+        return format_tool_output(find_schemes(search_service, query, top_k))
+    except Exception as e:
+        return json.dumps({"error": str(e)})
+
+def make_search_tool(category_id: str, label: str, get_service: Callable) -> Callable:
+    """Create the LLM-facing search tool for a category"""
+    
+    async def search_tool(query: str, top_k: int = 10) -> str:
+        # ADK awaits tools on the shared runner loop; the blocking search runs
+        # on that loop's executor so other agent turns keep going meanwhile
+        return await asyncio.to_thread(
+            lambda: search_tool_output(get_service(), query, top_k)
+        )
+    
+    # ADK builds the tool declaration from the function name and docstring
+    search_tool.__name__ = search_tool.__qualname__ = f"search_{category_id.lower()}_schemes"
+    search_tool.__doc__ = f"""
+    Search for {label} schemes in the Vertex AI Search datastore.
     
     Args:
-        query: Search query describing farmer needs
+        query: Search query describing the user's needs
         top_k: Maximum number of schemes to return
     
     Returns:
-        JSON string containing list of relevant farmer schemes
+        JSON string with the id, name and key facts of each relevant
+        scheme. Use get_scheme_details for the full text of a scheme.
     """
-    try:
-        schemes = get_farmer_search().search(query, top_k)
-        return json.dumps([scheme.model_dump() for scheme in schemes], indent=2)
-    except Exception as e:
-        return json.dumps({"error": str(e)})
+    return search_tool
+
+# Per-category shortcuts kept for existing callers
+
+def get_farmer_search():
+    from src.agents.registry import category_registry
+    return category_registry.get("FARMER").search_service
+
+def get_msme_search():
+    from src.agents.registry import category_registry
+    return category_registry.get("MSME").search_service
+
+def find_farmer_schemes(query: str, top_k: int = 10) -> List[SchemeRecord]:
+    from src.agents.registry import category_registry
+    return category_registry.get("FARMER").find_schemes(query, top_k)
+
+def find_msme_schemes(query: str, top_k: int = 10) -> List[SchemeRecord]:
+    from src.agents.registry import category_registry
+    return category_registry.get("MSME").find_schemes(query, top_k)
+
+def search_farmer_schemes(query: str, top_k: int = 10) -> str:
+    from src.agents.registry import category_registry
+    return search_tool_output(category_registry.get("FARMER").search_service, query, top_k)
 
 def search_msme_schemes(query: str, top_k: int = 10) -> str:
+    from src.agents.registry import category_registry
+    return search_tool_output(category_registry.get("MSME").search_service, query, top_k)
+
+def get_scheme_details(scheme_id: str) -> str:
     """
-    Search for MSME schemes in the Vertex AI Search datastore.
+    Get the full details of a scheme returned by an earlier search.
     
     Args:
-        query: Search query describing business needs
-        top_k: Maximum number of schemes to return
+        scheme_id: The id of the scheme from the search results
     
     Returns:
-        JSON string containing list of relevant MSME schemes
+        JSON string with the scheme's description, eligibility, benefits,
+        application process and URL
     """
-    try:
-        schemes = get_msme_search().search(query, top_k)
-        return json.dumps([scheme.model_dump() for scheme in schemes], indent=2)
-    except Exception as e:
-        return json.dumps({"error": str(e)})
+    from src.services.scheme_catalog import scheme_catalog
+    
+    scheme = scheme_catalog.get(scheme_id)
+    if scheme is None:
+        return json.dumps({"error": f"Unknown scheme id: {scheme_id}"})
+    return scheme.json_bytes().decode("utf-8")
 
-# Export all tools
-ALL_TOOLS = [search_farmer_schemes, search_msme_schemes]
\ No newline at end of file
+# Tools shared by every category agent (search tools are built per category)
+SHARED_TOOLS = [get_scheme_details]
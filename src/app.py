@@ -1,47 +1,208 @@
-from fastapi import FastAPI, HTTPException
-from src.agents.master_agent import master_agent
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException, Query
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from src.agents.master_agent import get_master_agent
+from src.middleware.compression import CompressionMiddleware
+from src.middleware.request_context import RequestContextMiddleware
 from src.models.schemas import QueryRequest, QueryResponse
+from src.services.response_shaping import (
+    ShapeError,
+    encode_query_response,
+    parse_list,
+    shape_response,
+    validate_shape,
+)
+from src.services.admission import AdmissionRejected, admission
+from src.services.lanes import LANES
+from src.services.log import bind_session, get_logger
+from src.services.metrics import render_metrics, stage_timer
+from src.services.profiler import begin_profile
+from src.services.warmup import start_warmup, is_ready, warmup_status, failed_steps
+from config.settings import settings
+from typing import Optional
+import contextlib
+import json
+import time
 import uuid
 
+log = get_logger(__name__)
+_total = stage_timer("total")
+_encoding = stage_timer("encoding")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    log.info(settings.summary())
+    # Build clients, agents and indexes in the background; /ready flips when done
+    start_warmup()
+    yield
+
 app = FastAPI(
     title="Scheme Assistant API",
     description="Multi-agent system for farmer and MSME scheme recommendations using Google ADK",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
+)
+
+if settings.capture_traffic:
+    from src.middleware.traffic_capture import TrafficCaptureMiddleware
+    # Innermost, so it sees uncompressed bodies and the request id
+    app.add_middleware(TrafficCaptureMiddleware)
+
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_min_bytes,
+    gzip_level=settings.gzip_level,
+    brotli_quality=settings.brotli_quality
 )
+# Outermost, so every log record of a request carries its id
+app.add_middleware(RequestContextMiddleware)
 
 @app.post("/query", response_model=QueryResponse)
-async def process_query(request: QueryRequest):
+async def process_query(
+    request: QueryRequest,
+    fields: Optional[str] = Query(None, description="Comma-separated scheme attributes to return, e.g. id,name,url"),
+    omit: Optional[str] = Query(None, description="Comma-separated parts to leave out: response, schemes"),
+    x_profile: Optional[str] = Header(None, include_in_schema=False)
+):
     '''
     Process user query and return scheme recommendations
     
     - **query**: User's question or request
     - **session_id**: Optional session ID for conversation continuity
     - **show_more**: Set to true to show next page of schemes
+    - **fields** / **omit** (query string): sparse responses for thin clients
     '''
+    started = time.perf_counter()
+    field_list, omit_list = parse_list(fields), parse_list(omit)
+    try:
+        validate_shape(field_list, omit_list)
+    except ShapeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    profile = begin_profile(x_profile)
     try:
         session_id = request.session_id or str(uuid.uuid4())
+        bind_session(session_id)
         
-        result = master_agent.process(
-            query=request.query,
-            session_id=session_id,
-            show_more=request.show_more
-        )
+        # Planning is cheap and read-only; it picks the limits the turn is admitted under
+        agent = get_master_agent()
+        plan = agent.plan_turn(request.query, session_id, request.show_more)
+        try:
+            async with admission.admit(session_id, plan.route, plan.lane):
+                # Off the event loop, and LLM turns never hold up cheap ones
+                result = await LANES[plan.lane].run(_run_turn, agent, request, session_id, plan, profile)
+        except AdmissionRejected as e:
+            return JSONResponse(
+                status_code=503,
+                content={"detail": str(e)},
+                headers={"Retry-After": str(e.retry_after_s)}
+            )
         
-        return result
+        encoding_started = time.perf_counter()
+        if field_list:
+            response = JSONResponse(shape_response(result, field_list, omit_list))
+        else:
+            # Bypasses response_model re-validation; schemes are spliced in pre-encoded
+            response = Response(content=encode_query_response(result, omit_list), media_type="application/json")
+        _encoding.observe(time.perf_counter() - encoding_started)
+        if profile:
+            response.headers["X-Profile-Id"] = profile.profile_id
+        return response
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        _total.observe(time.perf_counter() - started)
+        if profile:
+            profile.finish()
+
+def _run_turn(agent, request: QueryRequest, session_id: str, plan, profile) -> QueryResponse:
+    with profile.sampling() if profile else contextlib.nullcontext():
+        return agent.process(
+            query=request.query,
+            session_id=session_id,
+            show_more=request.show_more,
+            plan=plan
+        )
 
 @app.get("/health")
 async def health_check():
-    '''Health check endpoint'''
-    return {"status": "healthy", "service": "scheme-assistant"}
+    '''Health check endpoint, including circuit breaker states'''
+    from src.services.circuit_breaker import breaker_states, OPEN
+    breakers = breaker_states()
+    degraded = any(b["state"] == OPEN for b in breakers.values())
+    return {
+        "status": "degraded" if degraded else "healthy",
+        "service": "scheme-assistant",
+        "breakers": breakers
+    }
+
+@app.get("/ready")
+async def readiness_check():
+    '''Readiness probe - 503 until the startup warmup has completed, or for good if a required step failed'''
+    if not is_ready():
+        failed = failed_steps()
+        if failed:
+            return JSONResponse(
+                status_code=503,
+                content={"status": "failed", "failed": failed, "steps": warmup_status()}
+            )
+        return JSONResponse(
+            status_code=503,
+            content={"status": "warming_up", "steps": warmup_status()}
+        )
+    return {"status": "ready", "steps": warmup_status()}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    '''Prometheus metrics: per-stage latency histograms, route/cache/fallback counters, gauges'''
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/suggest")
+async def suggest(prefix: str = Query(..., max_length=100), limit: int = Query(8, ge=1, le=20)):
+    '''Autocomplete scheme names and categories from the in-memory catalog'''
+    from src.services.suggest_index import suggest_index
+    return {"prefix": prefix, "suggestions": suggest_index.suggest(prefix, limit)}
+
+@app.get("/schemes")
+async def list_schemes(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    if_none_match: Optional[str] = Header(None)
+):
+    '''Catalog of known schemes ordered by id; pass next_cursor to get the next page'''
+    from src.services.http_cache import cacheable_json, decode_cursor, encode_cursor
+    from src.services.scheme_catalog import scheme_catalog
+    try:
+        after_id = decode_cursor(cursor) if cursor else ""
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    schemes, next_id = scheme_catalog.page(after_id, limit)
+    next_cursor = json.dumps(encode_cursor(next_id) if next_id else None).encode("ascii")
+    body = (
+        b'{"schemes":[' + b",".join(scheme.json_bytes() for scheme in schemes)
+        + b'],"next_cursor":' + next_cursor + b"}"
+    )
+    return cacheable_json(body, if_none_match, settings.catalog_cache_max_age)
+
+@app.get("/schemes/{scheme_id}")
+async def get_scheme(scheme_id: str, if_none_match: Optional[str] = Header(None)):
+    '''Full details of one scheme, cacheable and revalidated by ETag'''
+    from src.services.http_cache import cacheable_json
+    from src.services.scheme_catalog import scheme_catalog
+    scheme = scheme_catalog.get(scheme_id)
+    if scheme is None:
+        raise HTTPException(status_code=404, detail=f"Scheme {scheme_id} not found")
+    return cacheable_json(scheme.json_bytes(), if_none_match, settings.scheme_cache_max_age)
 
 @app.delete("/session/{session_id}")
 async def delete_session(session_id: str):
     '''Delete a conversation session'''
     from src.services.state_service import state_service
+    from src.services.agent_runner import agent_runner
     state_service.delete_session(session_id)
+    agent_runner.delete_session(session_id)
     return {"message": f"Session {session_id} deleted"}
 
 if __name__ == "__main__":
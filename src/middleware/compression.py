@@ -0,0 +1,135 @@
+"""
+Negotiated response compression (brotli or gzip) with a size threshold
+Small bodies are sent as-is: below a few hundred bytes the encoding overhead
+outweighs the savings on the wire. Brotli is used when the client accepts it
+and the optional `brotli` package is installed; otherwise gzip.
+
+Every compressible response (and every 304) carries Vary: Accept-Encoding,
+compressed or not, so shared caches key on the encoding. A compressed body
+is a different representation, so its ETag gets the encoding as a suffix.
+"""
+from typing import List, Optional, Tuple
+from src.services.http_cache import encoded_etag
+import gzip
+
+try:
+    import brotli
+except ImportError:  # Optional dependency, gzip still works without it
+    brotli = None
+
+# Content types worth compressing
+_COMPRESSIBLE = (b"application/json", b"text/")
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Best supported encoding from an Accept-Encoding header, honouring q=0"""
+    offered = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            offered[name.strip()] = quality
+
+    supported = (["br"] if brotli is not None else []) + ["gzip"]
+    candidates = [
+        (offered.get(name, offered.get("*", 0.0)), -rank, name)
+        for rank, name in enumerate(supported)
+    ]
+    quality, _, name = max(candidates)
+    return name if quality > 0 else None
+
+
+def add_vary(headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    """headers with Accept-Encoding added to Vary (once)"""
+    vary = [v for k, v in headers if k == b"vary"]
+    values = {token.strip().lower() for value in vary for token in value.split(b",")}
+    if b"accept-encoding" in values or b"*" in values:
+        return headers
+    merged = b", ".join(vary + [b"Accept-Encoding"])
+    return [(k, v) for k, v in headers if k != b"vary"] + [(b"vary", merged)]
+
+
+def compress(body: bytes, encoding: str, gzip_level: int, brotli_quality: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    # mtime=0: the same body always compresses to the same bytes under its ETag
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class CompressionMiddleware:
+    """ASGI middleware; buffers single-message responses and compresses them"""
+
+    def __init__(self, app, minimum_size: int = 500, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept) if accept else None
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = message["headers"]
+                content_type = next((v for k, v in headers if k == b"content-type"), b"")
+                if content_type.startswith(_COMPRESSIBLE) or message["status"] == 304:
+                    message = {**message, "headers": add_vary(list(headers))}
+                start_message = message
+                if encoding is None:
+                    passthrough = True
+                    await send(message)
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = start_message["headers"]
+            content_type = next((v for k, v in headers if k == b"content-type"), b"")
+            already_encoded = any(k == b"content-encoding" for k, _ in headers)
+
+            # Streamed, small, already encoded or binary bodies go out unchanged
+            if (message.get("more_body") or already_encoded or len(body) < self.minimum_size
+                    or not content_type.startswith(_COMPRESSIBLE)):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding, self.gzip_level, self.brotli_quality)
+            headers = [
+                (k, encoded_etag(v.decode("latin-1"), encoding).encode("latin-1") if k == b"etag" else v)
+                for k, v in headers if k != b"content-length"
+            ]
+            headers += [
+                (b"content-encoding", encoding.encode()),
+                (b"content-length", str(len(compressed)).encode()),
+            ]
+            await send({**start_message, "headers": headers})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,49 @@
+"""
+Request ids for logs and responses
+Takes the caller's X-Request-ID when it looks sane, otherwise generates one,
+makes it available to every log record emitted while handling the request
+and echoes it back in the response headers.
+"""
+from src.services.log import request_id_var, session_id_var
+import re
+import uuid
+
+_VALID_ID = re.compile(r"^[A-Za-z0-9._:-]{1,64}$")
+
+
+class RequestContextMiddleware:
+    """ASGI middleware; binds request_id_var for the duration of a request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                candidate = value.decode("latin-1")
+                if _VALID_ID.match(candidate):
+                    request_id = candidate
+                break
+        if request_id is None:
+            request_id = uuid.uuid4().hex[:16]
+
+        request_token = request_id_var.set(request_id)
+        session_token = session_id_var.set(None)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-request-id", request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            session_id_var.reset(session_token)
+            request_id_var.reset(request_token)
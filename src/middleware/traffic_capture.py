@@ -0,0 +1,61 @@
+"""
+Capture of /query requests for offline replay
+Records the request body, response body, status, timing and the request's
+trace (route taken, stage, search and LLM latencies) and hands them to
+src.services.traffic_capture, which writes them off the request path. Only
+installed when CAPTURE_TRAFFIC is set; it sits inside CompressionMiddleware
+so it sees the uncompressed response.
+"""
+from src.services.log import request_id_var
+from src.services.metrics import begin_trace, end_trace
+from src.services.traffic_capture import capture
+import time
+
+
+class TrafficCaptureMiddleware:
+    """ASGI middleware; captures POSTs to the given paths"""
+
+    def __init__(self, app, paths=("/query",)):
+        self.app = app
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        ts = time.time()
+        started = time.perf_counter()
+        request_chunks = []
+        response_chunks = []
+        status = 0
+
+        async def receive_wrapper():
+            message = await receive()
+            if message["type"] == "http.request":
+                request_chunks.append(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_chunks.append(message.get("body", b""))
+            await send(message)
+
+        trace, token = begin_trace()
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            end_trace(token)
+            capture({
+                "ts": ts,
+                "duration_ms": (time.perf_counter() - started) * 1000,
+                "request_id": request_id_var.get(),
+                "query_string": scope.get("query_string", b"").decode("latin-1"),
+                "request_body": b"".join(request_chunks),
+                "status": status or 500,
+                "response_body": b"".join(response_chunks),
+                "trace": trace,
+            })
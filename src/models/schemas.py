@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any, Literal
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import List, Optional, Dict, Any
+from src.models.scheme_record import SchemeRecord
 
 class Scheme(BaseModel):
     id: str
@@ -9,15 +10,16 @@ class Scheme(BaseModel):
     benefits: str
     application_process: str = ""
     url: str = ""
+    related_variants: List[Dict[str, str]] = Field(default_factory=list)  # Collapsed near-duplicates ({id, name})
 
 class ConversationContext(BaseModel):
     session_id: str
-    category: Optional[Literal["FARMER", "MSME"]] = None
+    category: Optional[str] = None  # A CATEGORIES id
     conversation_history: List[Dict[str, str]] = Field(default_factory=list)
-    schemes: List[Scheme] = Field(default_factory=list)
+    schemes: List[SchemeRecord] = Field(default_factory=list)
     current_page: int = 0
     user_preferences: Dict[str, Any] = Field(default_factory=dict)
-    last_discussed_scheme: Optional[Scheme] = None  # Track which scheme user is discussing
+    last_discussed_scheme: Optional[SchemeRecord] = None  # Track which scheme user is discussing
     
     # Eligibility check tracking
     eligibility_check_in_progress: bool = False
@@ -25,7 +27,9 @@ class ConversationContext(BaseModel):
     eligibility_answers: Dict[str, str] = Field(default_factory=dict)
     current_eligibility_question: int = 0
     
-    model_config = {"extra": "allow"}  # Allow dynamic attributes
+    model_config = {"extra": "allow", "arbitrary_types_allowed": True}  # Allow dynamic attributes
+    
+    _scheme_index: Any = PrivateAttr(default=None)  # TrigramIndex over schemes, see StateService
     
     def add_message(self, role: str, content: str):
         self.conversation_history.append({"role": role, "content": content})
@@ -46,4 +50,9 @@ class QueryResponse(BaseModel):
     has_more: bool
     category: Optional[str] = None
     total_schemes: int = 0
-    shown_schemes: int = 0
\ No newline at end of file
+    shown_schemes: int = 0
+    
+    @classmethod
+    def trusted(cls, **data) -> "QueryResponse":
+        """Build from internal objects without validation; schemes are SchemeRecords"""
+        return cls.model_construct(**data)
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""
+Internal scheme representation used between search and the API boundary
+A slotted plain object: no validation, no per-instance __dict__, ids interned
+so the same scheme id is one string object across sessions and the catalog.
+Records are treated as immutable once built; with_variants() returns a copy.
+The pydantic Scheme model is only built for API schemas and external input.
+"""
+from typing import Any, Dict, Iterable, Optional, Tuple
+from pydantic_core import to_json
+import sys
+
+FIELDS = (
+    "id", "name", "description", "eligibility", "benefits",
+    "application_process", "url", "related_variants",
+)
+
+
+class SchemeRecord:
+    __slots__ = FIELDS + ("minhash", "_json")
+
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        description: str,
+        eligibility: str,
+        benefits: str,
+        application_process: str = "",
+        url: str = "",
+        related_variants: Iterable[Dict[str, str]] = ()
+    ):
+        self.id = sys.intern(id)
+        self.name = name
+        self.description = description
+        self.eligibility = eligibility
+        self.benefits = benefits
+        self.application_process = application_process
+        self.url = url
+        self.related_variants: Tuple[Dict[str, str], ...] = tuple(related_variants)  # ({id, name}, ...)
+        self.minhash: Optional[Tuple[int, ...]] = None  # Set by src.services.dedup
+        self._json: Optional[bytes] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SchemeRecord":
+        return cls(**{name: data[name] for name in FIELDS if name in data})
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {name: getattr(self, name) for name in FIELDS}
+        data["related_variants"] = [dict(variant) for variant in self.related_variants]
+        return data
+
+    def to_model(self):
+        """Pydantic Scheme for API code that needs one, built without re-validation"""
+        from src.models.schemas import Scheme
+        return Scheme.model_construct(**self.to_dict())
+
+    def json_bytes(self) -> bytes:
+        """Encoded JSON, computed once; same bytes as Scheme.model_dump_json()"""
+        if self._json is None:
+            self._json = to_json(self.to_dict())
+        return self._json
+
+    def with_variants(self, variants: Iterable[Dict[str, str]]) -> "SchemeRecord":
+        """Copy with extra related variants; keeps the MinHash signature"""
+        copy = SchemeRecord.__new__(SchemeRecord)
+        for name in FIELDS:
+            setattr(copy, name, getattr(self, name))
+        copy.related_variants = self.related_variants + tuple(variants)
+        copy.minhash = self.minhash
+        copy._json = None
+        return copy
+
+    def __repr__(self) -> str:
+        return f"SchemeRecord(id={self.id!r}, name={self.name!r})"
@@ -0,0 +1,190 @@
+"""
+Admission control for /query turns
+A turn must hold up to three slots before it runs: one of its session's (so
+a session's turns never pile up), one of its route's when that route has a
+limit, and one of its execution lane's (see src.services.lanes), so LLM
+turns can never take the slots of cheap ones. Each limit has a bounded FIFO
+queue; a turn that finds a queue full, or is still waiting when its
+queue-time deadline passes, is rejected with AdmissionRejected and /query
+answers 503 with Retry-After instead of letting every request's latency
+collapse together.
+
+Runs on the event loop: slots are plain counters and waiters are asyncio
+futures, so nothing here blocks or takes a lock.
+"""
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, List, Optional
+from config.settings import settings
+from src.services.lanes import LANES
+from src.services.metrics import (
+    ADMISSION_ACTIVE,
+    ADMISSION_QUEUED,
+    ADMISSION_SHED,
+    ADMISSION_WAIT_SECONDS,
+)
+import asyncio
+import time
+
+QUEUE_FULL = "queue_full"
+TIMEOUT = "timeout"
+
+
+class AdmissionRejected(RuntimeError):
+    """Raised when a turn can't get a slot; carries the Retry-After hint"""
+
+    def __init__(self, scope: str, reason: str, retry_after_s: int):
+        super().__init__(f"Server busy ({scope} {reason.replace('_', ' ')}), retry in {retry_after_s}s")
+        self.scope = scope
+        self.reason = reason
+        self.retry_after_s = retry_after_s
+
+
+class _Limiter:
+    """Counting semaphore with a bounded FIFO wait queue and per-waiter deadlines"""
+
+    def __init__(self, scope: str, limit: int, max_queue: int):
+        self.scope = scope
+        self.limit = limit
+        self.max_queue = max_queue
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    @property
+    def idle(self) -> bool:
+        return self.active == 0 and not self._waiters
+
+    async def acquire(self, deadline: float):
+        """Take a slot, waiting until the loop time `deadline` at most"""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise AdmissionRejected(self.scope, QUEUE_FULL, 0)
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        expiry = loop.call_at(deadline, self._expire, waiter)
+        try:
+            # release() hands its slot straight to the first waiter
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                self.release()
+            else:
+                self._discard(waiter)
+            raise
+        finally:
+            expiry.cancel()
+
+    def release(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def _expire(self, waiter: asyncio.Future):
+        if not waiter.done():
+            self._discard(waiter)
+            waiter.set_exception(AdmissionRejected(self.scope, TIMEOUT, 0))
+
+    def _discard(self, waiter: asyncio.Future):
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+
+class AdmissionController:
+    def __init__(self, lane_limits: Optional[Dict[str, int]] = None,
+                 max_queue: Optional[int] = None,
+                 max_per_session: Optional[int] = None,
+                 session_queue: Optional[int] = None,
+                 queue_timeout_ms: Optional[float] = None,
+                 route_limits: Optional[Dict[str, int]] = None,
+                 route_timeouts_ms: Optional[Dict[str, float]] = None,
+                 retry_after_s: Optional[int] = None):
+        max_queue = max_queue if max_queue is not None else settings.admission_max_queue
+        self.max_per_session = max_per_session or settings.admission_max_per_session
+        self.session_queue = session_queue if session_queue is not None else settings.admission_session_queue
+        self.queue_timeout_s = (queue_timeout_ms or settings.admission_queue_timeout_ms) / 1000
+        self.route_timeouts_s = {
+            route: ms / 1000
+            for route, ms in (route_timeouts_ms if route_timeouts_ms is not None
+                              else settings.admission_route_timeouts_ms).items()
+        }
+        self.retry_after_s = retry_after_s or settings.admission_retry_after_s
+
+        if lane_limits is None:
+            lane_limits = {name: lane.workers for name, lane in LANES.items()}
+        self._lanes = {
+            lane: _Limiter(f"lane:{lane}", limit, max_queue)
+            for lane, limit in lane_limits.items()
+        }
+        self._routes = {
+            route: _Limiter(f"route:{route}", limit, max_queue)
+            for route, limit in (route_limits if route_limits is not None
+                                 else settings.admission_route_limits).items()
+        }
+        self._sessions: Dict[str, _Limiter] = {}
+
+        for limiter in (*self._lanes.values(), *self._routes.values()):
+            ADMISSION_QUEUED.labels(limiter.scope).set_function(lambda l=limiter: l.queued)
+            ADMISSION_ACTIVE.labels(limiter.scope).set_function(lambda l=limiter: l.active)
+        ADMISSION_QUEUED.labels("session").set_function(
+            lambda: sum(limiter.queued for limiter in list(self._sessions.values()))
+        )
+
+    def _session(self, session_id: str) -> _Limiter:
+        limiter = self._sessions.get(session_id)
+        if limiter is None:
+            limiter = _Limiter("session", self.max_per_session, self.session_queue)
+            self._sessions[session_id] = limiter
+        return limiter
+
+    def _release(self, held: List[_Limiter], session_id: str):
+        for limiter in reversed(held):
+            limiter.release()
+        session = self._sessions.get(session_id)
+        if session is not None and session.idle:
+            del self._sessions[session_id]
+
+    @asynccontextmanager
+    async def admit(self, session_id: str, route: str, lane: str):
+        """Hold a session, route and lane slot for the duration of the block"""
+        started = time.perf_counter()
+        deadline = asyncio.get_running_loop().time() + self.route_timeouts_s.get(route, self.queue_timeout_s)
+        limiters = [self._session(session_id)]
+        if route in self._routes:
+            limiters.append(self._routes[route])
+        limiters.append(self._lanes[lane])
+
+        # Always taken in the same order (session, route, lane): no deadlocks
+        held: List[_Limiter] = []
+        try:
+            for limiter in limiters:
+                await limiter.acquire(deadline)
+                held.append(limiter)
+        except AdmissionRejected as e:
+            self._release(held, session_id)
+            ADMISSION_SHED.labels(route, e.scope.partition(":")[0], e.reason).inc()
+            raise AdmissionRejected(e.scope, e.reason, self.retry_after_s) from None
+        except BaseException:
+            self._release(held, session_id)
+            raise
+        ADMISSION_WAIT_SECONDS.labels(route).observe(time.perf_counter() - started)
+
+        try:
+            yield
+        finally:
+            self._release(held, session_id)
+
+
+admission = AdmissionController()
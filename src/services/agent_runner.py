@@ -0,0 +1,203 @@
+"""
+Long-lived ADK Runner shared by the specialist agents
+Each agent gets one Runner, constructed once, running on a dedicated event
+loop thread. ADK sessions map 1:1 to our session_id so follow-up turns carry
+conversational context natively instead of re-sending the transcript.
+
+Tools run inline on the runner loop, so tools that block (search) are async
+and hand their work to the loop's default executor (ADK_TOOL_WORKERS
+threads); one slow search never stalls the other agent turns. ADK sessions
+unused for ADK_SESSION_TTL_SECONDS, or beyond the ADK_MAX_SESSIONS most
+recently used, are deleted along with their event history.
+"""
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Tuple
+from config.settings import settings
+from src.services.log import get_logger
+import asyncio
+import inspect
+import threading
+import time
+import uuid
+
+log = get_logger(__name__)
+
+
+class AgentRunner:
+    """Drives ADK agents asynchronously; callers get concurrent Futures back"""
+
+    def __init__(self, session_ttl_s: float = None, max_sessions: int = None):
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._session_service = None
+        self._runners: Dict[str, object] = {}
+        self.session_ttl_s = session_ttl_s or settings.adk_session_ttl_seconds
+        self.max_sessions = max_sessions or settings.adk_max_sessions
+        # (agent name, session_id) -> last use (monotonic), least recently used first
+        self._sessions: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._sessions_lock = threading.Lock()
+        # Sessions with a turn in flight are never evicted (loop thread only)
+        self._running: Dict[Tuple[str, str], int] = {}
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop.set_default_executor(ThreadPoolExecutor(
+                    max_workers=settings.adk_tool_workers,
+                    thread_name_prefix="adk-tool"
+                ))
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="adk-runner",
+                    daemon=True
+                )
+                self._thread.start()
+        return self._loop
+
+    def start(self):
+        """Start the event loop thread ahead of the first turn"""
+        self._ensure_loop()
+
+    def register(self, agent):
+        """Create the Runner for an ADK agent (once per agent name)"""
+        from google.adk.runners import Runner
+        from google.adk.sessions import InMemorySessionService
+
+        with self._lock:
+            if agent.name in self._runners:
+                return
+            if self._session_service is None:
+                self._session_service = InMemorySessionService()
+            self._runners[agent.name] = Runner(
+                agent=agent,
+                app_name=agent.name,
+                session_service=self._session_service
+            )
+
+    def is_registered(self, agent_name: str) -> bool:
+        return agent_name in self._runners
+
+    def has_session(self, agent_name: str, session_id: str) -> bool:
+        """True once the agent has seen at least one turn of this session"""
+        return (agent_name, session_id) in self._sessions
+
+    def submit(self, agent_name: str, session_id: str, message: str) -> Future:
+        """Schedule one agent turn; returns a Future resolving to the final text"""
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(
+            self._run(agent_name, session_id, message), loop
+        )
+
+    def submit_ephemeral(self, agent_name: str, message: str) -> Future:
+        """Run one turn in a throwaway session (used for hedged duplicates)"""
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(
+            self._run_ephemeral(agent_name, message), loop
+        )
+
+    def delete_session(self, session_id: str):
+        """Drop the ADK sessions of every agent for this session_id"""
+        with self._sessions_lock:
+            keys = [
+                (agent_name, session_id) for agent_name in list(self._runners)
+                if self._sessions.pop((agent_name, session_id), None) is not None
+            ]
+        if keys and self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._delete_sessions(keys), self._loop)
+
+    def _touch(self, key: Tuple[str, str]):
+        with self._sessions_lock:
+            self._sessions[key] = time.monotonic()
+            self._sessions.move_to_end(key)
+
+    def _forget(self, key: Tuple[str, str]):
+        with self._sessions_lock:
+            self._sessions.pop(key, None)
+
+    def _take_evictable(self) -> List[Tuple[str, str]]:
+        """Unregister idle sessions past the TTL or over the size limit, oldest first"""
+        cutoff = time.monotonic() - self.session_ttl_s
+        evicted = []
+        with self._sessions_lock:
+            excess = len(self._sessions) - self.max_sessions
+            for key, last_used in self._sessions.items():
+                if last_used >= cutoff and excess <= 0:
+                    break
+                if key in self._running:
+                    continue
+                evicted.append(key)
+                excess -= 1
+            for key in evicted:
+                del self._sessions[key]
+        return evicted
+
+    async def _ensure_session(self, agent_name: str, session_id: str):
+        if (agent_name, session_id) in self._sessions:
+            return
+        # Older ADK releases expose a synchronous session service
+        result = self._session_service.create_session(
+            app_name=agent_name,
+            user_id=session_id,
+            session_id=session_id
+        )
+        if inspect.isawaitable(result):
+            await result
+        self._touch((agent_name, session_id))
+
+    async def _run(self, agent_name: str, session_id: str, message: str) -> str:
+        from google.genai import types
+
+        runner = self._runners[agent_name]
+        key = (agent_name, session_id)
+        await self._ensure_session(agent_name, session_id)
+
+        content = types.Content(role="user", parts=[types.Part(text=message)])
+        final_text = ""
+        self._running[key] = self._running.get(key, 0) + 1
+        try:
+            async for event in runner.run_async(
+                user_id=session_id,
+                session_id=session_id,
+                new_message=content
+            ):
+                if event.is_final_response() and event.content and event.content.parts:
+                    final_text = "".join(part.text or "" for part in event.content.parts)
+        finally:
+            remaining = self._running.pop(key) - 1
+            if remaining:
+                self._running[key] = remaining
+            if key in self._sessions:
+                self._touch(key)
+
+        evicted = self._take_evictable()
+        if evicted:
+            log.debug("Evicting idle ADK sessions", count=len(evicted))
+            await self._delete_sessions(evicted)
+        return final_text
+
+    async def _run_ephemeral(self, agent_name: str, message: str) -> str:
+        session_id = f"ephemeral-{uuid.uuid4()}"
+        try:
+            return await self._run(agent_name, session_id, message)
+        finally:
+            self._forget((agent_name, session_id))
+            await self._delete_sessions([(agent_name, session_id)])
+
+    async def _delete_sessions(self, keys):
+        for agent_name, session_id in keys:
+            try:
+                result = self._session_service.delete_session(
+                    app_name=agent_name,
+                    user_id=session_id,
+                    session_id=session_id
+                )
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                log.warning("Could not delete ADK session %s: %s", session_id, e)
+
+
+agent_runner = AgentRunner()
@@ -0,0 +1,134 @@
+"""
+Per-dependency circuit breakers (Vertex search, Gemini)
+A breaker opens when the error rate or slow-call rate over a rolling time
+window crosses its threshold. While open, calls fail fast so callers can use
+their local/templated path. After a cool-down a few probe calls are let
+through (half-open); their outcome closes or re-opens the breaker.
+"""
+from collections import deque
+from typing import Dict, Optional
+from config.settings import settings
+from src.services.log import get_logger
+import threading
+import time
+
+log = get_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is rejected because the breaker is open"""
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, slow_call_ms: float,
+                 window_seconds: Optional[float] = None,
+                 min_calls: Optional[int] = None,
+                 error_rate_threshold: Optional[float] = None,
+                 slow_rate_threshold: Optional[float] = None,
+                 open_seconds: Optional[float] = None,
+                 half_open_probes: Optional[int] = None):
+        self.name = name
+        self.slow_call_s = slow_call_ms / 1000
+        self.window_seconds = window_seconds or settings.breaker_window_seconds
+        self.min_calls = min_calls or settings.breaker_min_calls
+        self.error_rate_threshold = error_rate_threshold or settings.breaker_error_rate
+        self.slow_rate_threshold = slow_rate_threshold or settings.breaker_slow_rate
+        self.open_seconds = open_seconds or settings.breaker_open_seconds
+        self.half_open_probes = half_open_probes or settings.breaker_half_open_probes
+
+        self.state = CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        # (timestamp, failed, slow) per completed call
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """True if a call may proceed; False means fail fast"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.open_seconds:
+                    return False
+                self.state = HALF_OPEN
+                self._probes_in_flight = 0
+                self._probe_successes = 0
+                log.info("Circuit %s half-open, probing", self.name)
+            if self._probes_in_flight < self.half_open_probes:
+                self._probes_in_flight += 1
+                return True
+            return False
+
+    def record(self, success: bool, duration_s: float):
+        """Record the outcome of a call that allow() let through"""
+        now = time.monotonic()
+        slow = duration_s >= self.slow_call_s
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if not success or slow:
+                    self._open(now)
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_probes:
+                    self.state = CLOSED
+                    self._calls.clear()
+                    log.info("Circuit %s closed", self.name)
+                return
+
+            self._calls.append((now, not success, slow))
+            self._prune(now)
+            if self.state == CLOSED and len(self._calls) >= self.min_calls:
+                total = len(self._calls)
+                error_rate = sum(1 for c in self._calls if c[1]) / total
+                slow_rate = sum(1 for c in self._calls if c[2]) / total
+                if error_rate >= self.error_rate_threshold or slow_rate >= self.slow_rate_threshold:
+                    self._open(now)
+
+    def _open(self, now: float):
+        self.state = OPEN
+        self._opened_at = now
+        self._calls.clear()
+        log.warning("Circuit %s open for %.0fs", self.name, self.open_seconds)
+
+    def _prune(self, now: float):
+        cutoff = now - self.window_seconds
+        while self._calls and self._calls[0][0] < cutoff:
+            self._calls.popleft()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            self._prune(time.monotonic())
+            total = len(self._calls)
+            return {
+                "state": self.state,
+                "calls_in_window": total,
+                "error_rate": round(sum(1 for c in self._calls if c[1]) / total, 3) if total else 0.0,
+                "slow_rate": round(sum(1 for c in self._calls if c[2]) / total, 3) if total else 0.0,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(name: str, slow_call_ms: float) -> CircuitBreaker:
+    """Get or create the breaker for a dependency"""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _registry_lock:
+            breaker = _breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(name, slow_call_ms)
+                _breakers[name] = breaker
+    return breaker
+
+
+def breaker_states() -> Dict[str, dict]:
+    return {name: breaker.snapshot() for name, breaker in _breakers.items()}
@@ -0,0 +1,85 @@
+"""
+In-process Google Cloud credential resolution with background token refresh
+Replaces shelling out to `gcloud auth application-default print-access-token`
+on the first search of each worker. Tokens are refreshed ahead of expiry on a
+daemon thread so request paths never block on a refresh.
+"""
+from datetime import datetime, timezone
+from src.services.log import get_logger
+import threading
+import time
+
+log = get_logger(__name__)
+
+SCOPES = ["https://www.googleapis.com/auth/cloud-platform"]
+
+# Refresh this long before the token expires
+REFRESH_MARGIN_SECONDS = 300
+# Retry delay after a failed refresh
+RETRY_SECONDS = 30
+
+
+class CredentialManager:
+    def __init__(self):
+        self._credentials = None
+        self._project = None
+        self._lock = threading.Lock()
+        self._refresher = None
+
+    def get(self):
+        """Resolve application default credentials once and keep them fresh"""
+        if self._credentials is None:
+            with self._lock:
+                if self._credentials is None:
+                    import google.auth
+                    from google.auth.exceptions import DefaultCredentialsError
+
+                    try:
+                        credentials, project = google.auth.default(scopes=SCOPES)
+                    except DefaultCredentialsError as e:
+                        raise RuntimeError(
+                            "Google Cloud credentials not found. Please run:\n"
+                            "  gcloud auth application-default login\n"
+                            "Or set GOOGLE_APPLICATION_CREDENTIALS environment variable"
+                        ) from e
+                    self._refresh(credentials)
+                    self._credentials = credentials
+                    self._project = project
+                    self._start_refresher()
+        return self._credentials
+
+    @property
+    def project(self):
+        return self._project
+
+    def _refresh(self, credentials):
+        from google.auth.transport.requests import Request
+        credentials.refresh(Request())
+
+    def _seconds_until_refresh(self) -> float:
+        expiry = getattr(self._credentials, "expiry", None)
+        if expiry is None:
+            return RETRY_SECONDS * 10
+        # google-auth stores expiry as a naive UTC datetime
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return max(RETRY_SECONDS, (expiry - now).total_seconds() - REFRESH_MARGIN_SECONDS)
+
+    def _start_refresher(self):
+        self._refresher = threading.Thread(
+            target=self._refresh_loop,
+            name="credential-refresh",
+            daemon=True
+        )
+        self._refresher.start()
+
+    def _refresh_loop(self):
+        while True:
+            time.sleep(self._seconds_until_refresh())
+            try:
+                self._refresh(self._credentials)
+            except Exception as e:
+                log.warning("Credential refresh failed, retrying in %ss: %s", RETRY_SECONDS, e)
+                time.sleep(RETRY_SECONDS)
+
+
+credential_manager = CredentialManager()
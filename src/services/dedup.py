@@ -0,0 +1,171 @@
+"""
+Near-duplicate scheme detection with MinHash signatures and LSH banding
+Signatures are computed once per scheme when search results are parsed.
+collapse_near_duplicates() then keeps the best-ranked scheme of each
+near-duplicate group in a single O(n) pass and lists the others on it as
+related variants (central vs state versions, renamed schemes, etc.).
+LSH buckets only propose candidates: a pair collapses when the exact Jaccard
+similarity of its feature sets reaches DEDUP_THRESHOLD, since 128-row
+estimates are off by up to ~0.1 at the similarity of unrelated schemes.
+A pair also collapses when both point at the same official page and one
+name's distinctive words are all in the other (PM-KISAN vs PM Kisan Samman
+Nidhi): renamed schemes often share little descriptive text. Schemes on a
+shared page are always compared, whatever their signatures.
+"""
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from config.settings import settings
+from src.services.log import get_logger
+import hashlib
+import re
+import struct
+
+log = get_logger(__name__)
+
+NUM_PERM = 128
+BANDS = 64
+ROWS = NUM_PERM // BANDS  # 2 rows per band: pairs at Jaccard 0.5 share a bucket with p ~ 1 - 0.75^64
+# One SHAKE-128 digest per feature yields all NUM_PERM 32-bit hash values
+_ROW = struct.Struct(f"<{NUM_PERM}I")
+_ROW_BYTES = _ROW.size
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an the of for to and in on with by or per at from under up is are all any their its as be".split()
+)
+# Words that appear in many scheme names and say nothing about identity
+_GENERIC_NAME_WORDS = frozenset(
+    "scheme yojana programme program pradhan mantri pm national".split()
+)
+
+
+def _tokens(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall(text.lower().replace("-", " ")) if t not in _STOPWORDS]
+
+
+def scheme_features(scheme) -> set:
+    """Name words, URL host, and words/word pairs of description and benefits"""
+    features = {"n:" + t for t in _tokens(scheme.name) if t not in _GENERIC_NAME_WORDS}
+
+    host = urlparse(scheme.url).netloc.replace("www.", "") if scheme.url else ""
+    if host:
+        features.add("u:" + host)
+
+    body = _tokens(f"{scheme.description} {scheme.benefits}")
+    features.update("w:" + t for t in body)
+    features.update(f"b:{a} {b}" for a, b in zip(body, body[1:]))
+    return features
+
+
+def official_page(url: Optional[str]) -> str:
+    """Host and path of a scheme URL, ignoring scheme, www., query and trailing slash"""
+    if not url:
+        return ""
+    parsed = urlparse(url.strip().lower())
+    return parsed.netloc.replace("www.", "") + parsed.path.rstrip("/")
+
+
+def _name_features(features: set) -> set:
+    return {f for f in features if f.startswith("n:")}
+
+
+def minhash_signature(features: set) -> Tuple[int, ...]:
+    if not features:
+        return (0,) * NUM_PERM
+    rows = [
+        _ROW.unpack(hashlib.shake_128(feature.encode("utf-8")).digest(_ROW_BYTES))
+        for feature in features
+    ]
+    # Column-wise minimum, done in C by map/zip
+    return tuple(map(min, zip(*rows)))
+
+
+def attach_signature(scheme):
+    """Compute and cache the scheme's MinHash signature (once per scheme)"""
+    if scheme.minhash is None:
+        scheme.minhash = minhash_signature(scheme_features(scheme))
+    return scheme
+
+
+def jaccard(features_a: set, features_b: set) -> float:
+    if not features_a and not features_b:
+        return 1.0
+    return len(features_a & features_b) / len(features_a | features_b)
+
+
+def collapse_near_duplicates(schemes: List, threshold: Optional[float] = None) -> List:
+    """
+    Collapse near-duplicates, keeping result order
+
+    Each scheme is checked only against group representatives that share an
+    LSH band bucket with it, so the pass is linear in the number of schemes.
+    Representatives that absorbed duplicates are returned as copies with
+    related_variants filled in; the input objects are not modified.
+    """
+    threshold = threshold if threshold is not None else settings.dedup_threshold
+    representatives: List = []
+    variants: Dict[int, List] = {}
+    buckets: Dict[Tuple, int] = {}
+    # Official page -> representatives on it (ministry pages host several schemes)
+    pages: Dict[str, List[int]] = {}
+    # Feature sets are only needed to verify candidates, so built on demand
+    features: Dict[int, set] = {}
+
+    def features_of(scheme) -> set:
+        key = id(scheme)
+        if key not in features:
+            features[key] = scheme_features(scheme)
+        return features[key]
+
+    def same_scheme(scheme, rep, same_page: bool) -> bool:
+        a, b = features_of(scheme), features_of(rep)
+        if jaccard(a, b) >= threshold:
+            return True
+        if not same_page:
+            return False
+        names_a, names_b = _name_features(a), _name_features(b)
+        return bool(names_a) and bool(names_b) and (names_a <= names_b or names_b <= names_a)
+
+    for scheme in schemes:
+        signature = attach_signature(scheme).minhash
+        keys = [(band,) + signature[band * ROWS:(band + 1) * ROWS] for band in range(BANDS)]
+        page = official_page(scheme.url)
+        on_page = pages.get(page, []) if page else []
+
+        match = None
+        checked = set()
+        for rep_index in on_page:
+            checked.add(rep_index)
+            if same_scheme(scheme, representatives[rep_index], True):
+                match = rep_index
+                break
+        if match is None:
+            for key in keys:
+                rep_index = buckets.get(key)
+                if rep_index is None or rep_index in checked:
+                    continue
+                checked.add(rep_index)
+                if same_scheme(scheme, representatives[rep_index], False):
+                    match = rep_index
+                    break
+
+        if match is not None:
+            variants.setdefault(match, []).append(scheme)
+            continue
+
+        rep_index = len(representatives)
+        representatives.append(scheme)
+        for key in keys:
+            buckets.setdefault(key, rep_index)
+        if page:
+            pages.setdefault(page, []).append(rep_index)
+
+    if variants:
+        log.debug("Collapsed %d near-duplicate schemes", sum(len(v) for v in variants.values()))
+
+    collapsed = []
+    for index, scheme in enumerate(representatives):
+        if index in variants:
+            scheme = scheme.with_variants({"id": v.id, "name": v.name} for v in variants[index])
+        collapsed.append(scheme)
+    return collapsed
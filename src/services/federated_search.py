@@ -0,0 +1,131 @@
+"""
+Federated search across several datastores with reciprocal-rank fusion
+Queries every source concurrently, gives each its own deadline, fuses the
+ranked lists with RRF and de-duplicates by scheme id. Sources that miss their
+deadline are left out, so callers get partial results instead of waiting.
+Implements the same search() contract as VertexSearchService.
+
+Each datastore has its own thread pool, so a slow one that keeps workers
+busy past its deadline only delays its own later searches. A source's
+deadline starts when a worker picks it up; a source still queued when its
+deadline has passed since submission is dropped without running.
+"""
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from src.models.scheme_record import SchemeRecord
+from src.services.metrics import FALLBACKS
+from src.services.log import get_logger
+from config.settings import settings
+import contextvars
+import threading
+import time
+
+log = get_logger(__name__)
+_pools: Dict[str, ThreadPoolExecutor] = {}
+_pool_lock = threading.Lock()
+
+
+def _get_pool(source_name: str) -> ThreadPoolExecutor:
+    """Thread pool of one datastore, shared by all federated searches over it"""
+    pool = _pools.get(source_name)
+    if pool is None:
+        with _pool_lock:
+            pool = _pools.get(source_name)
+            if pool is None:
+                pool = ThreadPoolExecutor(
+                    max_workers=settings.search_pool_workers or 3 * settings.lane_llm_workers,
+                    thread_name_prefix=f"federated-{source_name}"
+                )
+                _pools[source_name] = pool
+    return pool
+
+
+def _run_started(started: list, fn, *args):
+    started.append(time.perf_counter())
+    return fn(*args)
+
+
+@dataclass
+class FederatedSource:
+    name: str
+    service: object  # anything with search(query, top_k) -> List[SchemeRecord]
+    deadline_ms: Optional[float] = None  # None = FEDERATED_SOURCE_DEADLINE_MS
+
+
+def reciprocal_rank_fusion(ranked_lists: List[List[SchemeRecord]], k: int) -> List[SchemeRecord]:
+    """Fuse ranked lists: score(d) = sum over lists of 1 / (k + rank)"""
+    scores: Dict[str, float] = {}
+    first_seen: Dict[str, SchemeRecord] = {}
+    best_rank: Dict[str, int] = {}
+
+    for schemes in ranked_lists:
+        for rank, scheme in enumerate(schemes, 1):
+            scores[scheme.id] = scores.get(scheme.id, 0.0) + 1.0 / (k + rank)
+            # Keep the copy from the list where the scheme ranked highest
+            if rank < best_rank.get(scheme.id, rank + 1):
+                best_rank[scheme.id] = rank
+                first_seen[scheme.id] = scheme
+
+    ordered = sorted(scores, key=lambda scheme_id: (-scores[scheme_id], best_rank[scheme_id]))
+    return [first_seen[scheme_id] for scheme_id in ordered]
+
+
+class FederatedSearchService:
+    def __init__(self, sources: List[FederatedSource], rrf_k: Optional[int] = None):
+        self.sources = sources
+        self.rrf_k = rrf_k or settings.federated_rrf_k
+        self.datastore_path = ",".join(source.name for source in sources)
+
+    def warm(self):
+        for source in self.sources:
+            warm = getattr(source.service, "warm", None)
+            if warm:
+                warm()
+
+    def search(self, query: str, top_k: int = 10) -> List[SchemeRecord]:
+        """Search every source concurrently and return the fused top_k"""
+        submitted = time.perf_counter()
+        pending = []
+        for source in self.sources:
+            started: list = []  # a worker appends its start time
+            # Each source runs in the caller's context so its logs keep the request id
+            future = _get_pool(source.name).submit(
+                contextvars.copy_context().run, _run_started, started, source.service.search, query, top_k
+            )
+            pending.append((source, future, started))
+
+        ranked_lists = []
+        late = []
+        for source, future, started in pending:
+            deadline_s = self._deadline_s(source)
+            try:
+                ranked_lists.append(self._result(future, started, submitted, deadline_s))
+            except FutureTimeout:
+                late.append(source.name)
+                FALLBACKS.labels("federated_source_late" if started else "federated_source_queued").inc()
+            except Exception as e:
+                log.error("Federated source %s failed: %s", source.name, e)
+                FALLBACKS.labels("federated_source_error").inc()
+
+        if late:
+            log.warning("Federated search returning partial results, late sources: %s", ", ".join(late))
+
+        return reciprocal_rank_fusion(ranked_lists, self.rrf_k)[:top_k]
+
+    @staticmethod
+    def _result(future, started: list, submitted: float, deadline_s: float) -> List[SchemeRecord]:
+        """A source's results, allowing deadline_s from the moment it started running"""
+        try:
+            return future.result(timeout=max(0.0, submitted + deadline_s - time.perf_counter()))
+        except FutureTimeout:
+            # Still queued after a whole deadline: drop it rather than wait on
+            if future.cancel():
+                raise
+        # Running (the worker may not have stamped its start time yet)
+        start = started[0] if started else time.perf_counter()
+        return future.result(timeout=max(0.0, start + deadline_s - time.perf_counter()))
+
+    def _deadline_s(self, source: FederatedSource) -> float:
+        deadline_ms = source.deadline_ms if source.deadline_ms is not None else settings.federated_source_deadline_ms
+        return deadline_ms / 1000
@@ -0,0 +1,138 @@
+"""
+Trigram index for resolving scheme references in follow-up questions
+Matches "the fasal bima one" or "mudra lone" to a scheme in the session's
+results. Every scheme is indexed under a few aliases (full name, name without
+generic words, acronym), and so is each of its related variants, whose
+aliases resolve to the variant's own id. Aliases shared by several schemes
+("pm kisan yojana" across editions) are indexed once, for the first scheme
+that has them. Each short word window of the
+query is scored against the aliases by trigram overlap (Dice coefficient)
+through an inverted index, so the work is bounded by the query length caps
+below, not by how the user phrases things. Windows made only of generic words
+(category keywords such as "kisan" or "loan") are skipped: "kisan loan" names
+a category, not PM-KISAN.
+"""
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+import re
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_PARENTHESIZED = re.compile(r"\(([^)]*)\)")
+
+# Words that appear in many scheme names and identify none of them
+_GENERIC_WORDS = frozenset(
+    "scheme schemes yojana programme program pradhan mantri pm prime minister s national".split()
+)
+# Query words that never belong to a scheme reference
+_FILLER_WORDS = frozenset(
+    "tell me about more the a an one this that of for to is what are how do i can "
+    "apply eligible eligibility benefits benefit details info information please "
+    # Hinglish particles ("mujhe kisan ke liye ...")
+    "mujhe mera meri mere hum hame hamen ke ki ka ko liye mein me hai hain se kya chahiye batao bataiye".split()
+)
+
+MAX_QUERY_WORDS = 24
+MAX_WINDOW_WORDS = 5
+MIN_SCORE = 0.66  # Tuned on benchmarks/scheme_match.py
+
+
+class SchemeMatch(NamedTuple):
+    position: int  # Index into the schemes the index was built from
+    score: float
+    alias: str
+    variant_id: Optional[str] = None  # Set when the alias is a related variant's
+
+
+def _words(text: str) -> List[str]:
+    return _NON_ALNUM.sub(" ", text.lower()).split()
+
+
+def trigrams(words: List[str]) -> set:
+    """pg_trgm-style trigrams: each word padded with two leading spaces and one trailing"""
+    grams = set()
+    for word in words:
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def scheme_aliases(name: str) -> List[str]:
+    """Names a user might use for the scheme called `name`, normalized"""
+    aliases = {" ".join(_words(name))}
+
+    bare = _words(_PARENTHESIZED.sub(" ", name))
+    aliases.add(" ".join(bare))
+    # Without generic words ("fasal bima"), unless that leaves one ambiguous word
+    core = [w for w in bare if w not in _GENERIC_WORDS]
+    if len(core) >= 2:
+        aliases.add(" ".join(core))
+    # Without a trailing "scheme"/"yojana" ("pm kisan", "mudra loan")
+    trimmed = list(bare)
+    while len(trimmed) > 2 and trimmed[-1] in _GENERIC_WORDS:
+        trimmed.pop()
+    aliases.add(" ".join(trimmed))
+    # Long names get shortened in speech ("credit guarantee fund")
+    if len(bare) > 4:
+        aliases.add(" ".join(bare[:3]))
+
+    for inner in _PARENTHESIZED.findall(name):
+        inner_words = _words(inner)
+        if inner_words:
+            aliases.add(" ".join(inner_words))
+            if " " not in inner.strip():
+                aliases.add("".join(inner_words))  # "MSE-CDP" -> "msecdp"
+
+    aliases.discard("")
+    return sorted(aliases)
+
+
+class TrigramIndex:
+    def __init__(self, schemes: List, generic_words: Iterable[str] = ()):
+        self._generic_words = frozenset(generic_words)
+        # (scheme position, alias, trigram count, variant id or None)
+        self._aliases: List[Tuple[int, str, int, Optional[str]]] = []
+        self._postings: Dict[str, List[int]] = {}
+        seen = set()
+
+        for position, scheme in enumerate(schemes):
+            self._add(position, scheme.name, None, seen)
+            for variant in scheme.related_variants:
+                self._add(position, variant["name"], variant["id"], seen)
+
+    def _add(self, position: int, name: str, variant_id: Optional[str], seen: set):
+        for alias in scheme_aliases(name):
+            # A later scheme with the same alias could never win a tie anyway
+            if alias in seen:
+                continue
+            seen.add(alias)
+            grams = trigrams(alias.split())
+            alias_id = len(self._aliases)
+            self._aliases.append((position, alias, len(grams), variant_id))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(alias_id)
+
+    def best_match(self, query: str, min_score: float = MIN_SCORE) -> Optional[SchemeMatch]:
+        """The scheme alias most similar to any short window of the query"""
+        words = [w for w in _words(query) if w not in _FILLER_WORDS][:MAX_QUERY_WORDS]
+        best: Optional[SchemeMatch] = None
+        generic = [w in self._generic_words for w in words]
+
+        for start in range(len(words)):
+            for end in range(start + 1, min(start + MAX_WINDOW_WORDS, len(words)) + 1):
+                if all(generic[start:end]):
+                    continue
+                grams = trigrams(words[start:end])
+                shared: Dict[int, int] = {}
+                for gram in grams:
+                    for alias_id in self._postings.get(gram, ()):
+                        shared[alias_id] = shared.get(alias_id, 0) + 1
+
+                for alias_id, count in shared.items():
+                    position, alias, alias_grams, variant_id = self._aliases[alias_id]
+                    score = 2 * count / (len(grams) + alias_grams)
+                    # Ties go to the longer alias: it explains more of the query
+                    if best is None or (score, len(alias)) > (best.score, len(best.alias)):
+                        best = SchemeMatch(position, score, alias, variant_id)
+
+        if best is None or best.score < min_score:
+            return None
+        return best
@@ -0,0 +1,75 @@
+"""
+Conditional GET helpers: strong ETags from content hashes, Cache-Control
+and 304 Not Modified on revalidation
+Each content encoding is its own representation with its own strong ETag:
+CompressionMiddleware suffixes the tag of the bodies it compresses
+('"<hash>-gzip"'), and revalidation accepts the tag of any encoding of the
+current body, answering with the tag the client sent.
+"""
+from typing import Optional
+from fastapi import Response
+from src.services.metrics import CACHE_HITS
+import base64
+import hashlib
+
+
+# Content codings CompressionMiddleware may apply
+ENCODINGS = ("gzip", "br")
+
+
+def strong_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """The ETag of the `encoding`-coded representation ('"abc"' -> '"abc-gzip"')"""
+    if not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _identity_etag(tag: str) -> str:
+    for encoding in ENCODINGS:
+        suffix = f'-{encoding}"'
+        if tag.endswith(suffix):
+            return tag[:-len(suffix)] + '"'
+    return tag
+
+
+def matching_etag(if_none_match: Optional[str], etag: str) -> Optional[str]:
+    """
+    The If-None-Match tag naming any encoding of the representation tagged
+    etag, or None. If-None-Match uses the weak comparison, so W/ is ignored.
+    """
+    if not if_none_match:
+        return None
+    if if_none_match.strip() == "*":
+        return etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if _identity_etag(tag[2:] if tag.startswith("W/") else tag) == etag:
+            return tag
+    return None
+
+
+def cacheable_json(body: bytes, if_none_match: Optional[str], max_age: int) -> Response:
+    """200 with the JSON body, or an empty 304 when the client's copy is current"""
+    etag = strong_etag(body)
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={max_age}"}
+    matched = matching_etag(if_none_match, etag)
+    if matched is not None:
+        CACHE_HITS.labels("etag_not_modified").inc()
+        # The client may hold a compressed representation: confirm that one
+        headers["ETag"] = matched
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def encode_cursor(scheme_id: str) -> str:
+    return base64.urlsafe_b64encode(scheme_id.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    """Raises ValueError for a cursor this service did not produce"""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return base64.b64decode(padded.encode("ascii"), altchars=b"-_", validate=True).decode("utf-8")
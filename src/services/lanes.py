@@ -0,0 +1,60 @@
+"""
+Execution lanes for /query turns
+Turns are classified by cost before any work is done (MasterAgent.plan_turn):
+deterministic turns (eligibility Q&A, scheme details, show more,
+clarification) run on the fast lane, turns that search and wait on the LLM
+on the llm lane. Each lane is its own bounded thread pool with its own
+admission limit, so follow-ups stay fast while every LLM slot is taken.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+from config.settings import settings
+from src.services.metrics import LANE_SECONDS
+import asyncio
+import contextvars
+import threading
+
+FAST = "fast"
+LLM = "llm"
+
+# Routes that search and call the LLM; every other route is deterministic
+LLM_ROUTES = frozenset({"agent"})
+
+
+def lane_for(route: str) -> str:
+    return LLM if route in LLM_ROUTES else FAST
+
+
+class Lane:
+    """A bounded thread pool that runs turns with the caller's context"""
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._seconds = LANE_SECONDS.labels(name)
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.workers,
+                        thread_name_prefix=f"lane-{self.name}"
+                    )
+        return self._pool
+
+    async def run(self, fn: Callable, *args):
+        """fn(*args) on this lane; request/session ids and traces carry over"""
+        context = contextvars.copy_context()
+        with self._seconds.time():
+            return await asyncio.get_running_loop().run_in_executor(
+                self._get_pool(), context.run, fn, *args
+            )
+
+
+LANES: Dict[str, Lane] = {
+    FAST: Lane(FAST, settings.lane_fast_workers),
+    LLM: Lane(LLM, settings.lane_llm_workers),
+}
@@ -0,0 +1,87 @@
+"""
+Latency-budgeted waiting on LLM calls with a single hedged duplicate
+If the primary call hasn't answered by the hedge threshold, one duplicate is
+issued and the first answer wins. When the budget runs out the caller gets
+nothing back and serves a templated response; late calls are cancelled.
+"""
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+import time
+
+
+@dataclass
+class BudgetedResult:
+    value: Optional[str]
+    timed_out: bool = False
+    hedged: bool = False
+    error: Optional[BaseException] = None
+    elapsed_ms: float = 0.0
+
+
+def await_with_hedge(primary: Future, hedge: Optional[Callable[[], Future]],
+                     started: float, budget_s: float, hedge_after_s: float) -> BudgetedResult:
+    """
+    Wait for the first successful result of primary (or its hedge)
+
+    started is the time.perf_counter() value the turn's budget counts from,
+    so time already spent on other work (e.g. search) is charged to the budget.
+    """
+    deadline = started + budget_s
+    pending = {primary}
+    hedged = False
+    last_error = None
+
+    while pending:
+        now = time.perf_counter()
+        if now >= deadline:
+            break
+
+        wait_until = deadline
+        can_hedge = hedge is not None and not hedged and hedge_after_s > 0
+        if can_hedge:
+            wait_until = min(deadline, started + hedge_after_s)
+
+        done, pending = wait(pending, timeout=max(0.0, wait_until - now),
+                             return_when=FIRST_COMPLETED)
+
+        for future in done:
+            if future.exception() is None:
+                for late in pending:
+                    late.cancel()
+                return BudgetedResult(
+                    value=future.result(),
+                    hedged=hedged,
+                    elapsed_ms=(time.perf_counter() - started) * 1000
+                )
+            last_error = future.exception()
+
+        if can_hedge and time.perf_counter() >= started + hedge_after_s:
+            pending.add(hedge())
+            hedged = True
+        elif not pending and can_hedge:
+            # Primary failed before the hedge threshold - retry once right away
+            pending.add(hedge())
+            hedged = True
+
+    for late in pending:
+        late.cancel()
+
+    return BudgetedResult(
+        value=None,
+        timed_out=bool(pending) or last_error is None,
+        hedged=hedged,
+        error=last_error,
+        elapsed_ms=(time.perf_counter() - started) * 1000
+    )
+
+
+def templated_response(schemes: List, kind: str) -> str:
+    """Intro text built from already-retrieved schemes, used instead of the LLM"""
+    if not schemes:
+        return f"I couldn't put together a detailed answer about {kind} schemes right now."
+    names = ", ".join(scheme.name for scheme in schemes[:2])
+    return (
+        f"I found {len(schemes)} {kind} schemes that match what you asked for, "
+        f"including {names}. Here are the options:"
+    )
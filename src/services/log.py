@@ -0,0 +1,228 @@
+"""
+Structured, non-blocking logging
+A log call only builds a record and puts it on a bounded queue; a background
+QueueListener thread formats it and writes it to stdout, so request handling
+never waits on the log collector. Records carry the request and session ids
+of the request that emitted them, plus any keyword fields passed to the call.
+
+Levels and sampling rates are set per logger (LOG_LEVELS, LOG_SAMPLE_RATES).
+A call below its logger's level, or sampled out, returns before any record
+is created. When the queue is full, records are dropped and counted instead
+of blocking the caller.
+
+Only the project's "src" logger namespace is routed through the queue; the
+logging module's global settings and the root logger are left to the host
+(uvicorn, tests, other libraries).
+"""
+from typing import Any, Dict, Optional
+from config.settings import settings
+from src.services.metrics import LOG_RECORDS_DROPPED
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import threading
+import time
+
+request_id_var: contextvars.ContextVar = contextvars.ContextVar("request_id", default=None)
+session_id_var: contextvars.ContextVar = contextvars.ContextVar("session_id", default=None)
+
+_configured = False
+_configure_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+_loggers: Dict[str, "Logger"] = {}
+
+# Logger namespace of the project's modules (get_logger(__name__) under src/)
+NAMESPACE = "src"
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Enqueues without blocking; the expensive formatting happens on the listener thread"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Runs in the calling thread: merge the args while they are still
+        # current and capture the request context. Only this handler sees the
+        # record, so it is updated in place instead of copied.
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _EXCEPTION_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        record.request_id = request_id_var.get()
+        record.session_id = session_id_var.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+_EXCEPTION_FORMATTER = logging.Formatter()
+
+
+def _field_text(value: Any) -> str:
+    text = str(value)
+    return json.dumps(text, ensure_ascii=False) if not text or " " in text or '"' in text else text
+
+
+class TextFormatter(logging.Formatter):
+    """`time LEVEL logger [req=.. session=..] message key=value ...`"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        parts = [self.formatTime(record), f"{record.levelname:<7}", record.name]
+        context = []
+        if getattr(record, "request_id", None):
+            context.append(f"req={record.request_id}")
+        if getattr(record, "session_id", None):
+            context.append(f"session={record.session_id}")
+        if context:
+            parts.append("[" + " ".join(context) + "]")
+        parts.append(record.getMessage())
+        fields = getattr(record, "fields", None)
+        if fields:
+            parts.extend(f"{key}={_field_text(value)}" for key, value in fields.items())
+        line = " ".join(parts)
+        if record.exc_text:
+            line += "\n" + record.exc_text
+        return line
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line for log collectors"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created))
+                  + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        if getattr(record, "session_id", None):
+            entry["session_id"] = record.session_id
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure_logging():
+    """Install the queue handler and start the writer thread (once)"""
+    global _configured, _listener
+    if _configured:
+        return
+    with _configure_lock:
+        if _configured:
+            return
+        project = logging.getLogger(NAMESPACE)
+        project.setLevel(settings.log_level)
+        for name, level in settings.log_levels.items():
+            logging.getLogger(name).setLevel(level)
+
+        writer = logging.StreamHandler(sys.stdout)
+        writer.setFormatter(JsonFormatter() if settings.log_format == "json" else TextFormatter())
+        records = queue.Queue(maxsize=settings.log_queue_size)
+        _listener = logging.handlers.QueueListener(records, writer, respect_handler_level=True)
+        _listener.start()
+        project.addHandler(_QueueHandler(records))
+        # Written once, by our writer, whatever handlers the host puts on root
+        project.propagate = False
+        atexit.register(shutdown_logging)
+        _configured = True
+
+
+def shutdown_logging():
+    """Write out queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _sample_rate(name: str) -> float:
+    """Rate of the most specific LOG_SAMPLE_RATES entry covering this logger"""
+    best, rate = -1, 1.0
+    for prefix, value in settings.log_sample_rates.items():
+        if (name == prefix or name.startswith(prefix + ".")) and len(prefix) > best:
+            best, rate = len(prefix), value
+    return rate
+
+
+class Logger:
+    """
+    Thin wrapper over a stdlib logger: printf-style message, structured
+    fields as keyword arguments, sampling of debug/info calls
+        log.info("Retrieved %d schemes", len(schemes), datastore=name)
+    """
+    __slots__ = ("_logger", "sample_rate")
+
+    def __init__(self, logger: logging.Logger, sample_rate: float = 1.0):
+        self._logger = logger
+        self.sample_rate = sample_rate
+
+    @property
+    def name(self) -> str:
+        return self._logger.name
+
+    def is_enabled_for(self, level: int) -> bool:
+        return self._logger.isEnabledFor(level)
+
+    def _log(self, level: int, msg: str, args, fields, exc_info=None):
+        # Built directly rather than through Logger._log: our formats never use
+        # the caller's file/line, so the stack walk of findCaller is skipped
+        if exc_info and not isinstance(exc_info, tuple):
+            exc_info = sys.exc_info()
+        record = self._logger.makeRecord(
+            self._logger.name, level, "(unknown file)", 0, msg, args, exc_info,
+            extra={"fields": fields} if fields else None,
+        )
+        self._logger.handle(record)
+
+    def debug(self, msg: str, *args, **fields):
+        if self._logger.isEnabledFor(logging.DEBUG) and (
+                self.sample_rate >= 1.0 or random.random() < self.sample_rate):
+            self._log(logging.DEBUG, msg, args, fields)
+
+    def info(self, msg: str, *args, **fields):
+        if self._logger.isEnabledFor(logging.INFO) and (
+                self.sample_rate >= 1.0 or random.random() < self.sample_rate):
+            self._log(logging.INFO, msg, args, fields)
+
+    def warning(self, msg: str, *args, **fields):
+        if self._logger.isEnabledFor(logging.WARNING):
+            self._log(logging.WARNING, msg, args, fields)
+
+    def error(self, msg: str, *args, exc_info: bool = False, **fields):
+        if self._logger.isEnabledFor(logging.ERROR):
+            self._log(logging.ERROR, msg, args, fields, exc_info=exc_info)
+
+    def exception(self, msg: str, *args, **fields):
+        """Error with the current exception's traceback"""
+        if self._logger.isEnabledFor(logging.ERROR):
+            self._log(logging.ERROR, msg, args, fields, exc_info=True)
+
+
+def get_logger(name: str) -> Logger:
+    """Logger for a module, usually get_logger(__name__)"""
+    logger = _loggers.get(name)
+    if logger is None:
+        configure_logging()
+        logger = _loggers.setdefault(name, Logger(logging.getLogger(name), _sample_rate(name)))
+    return logger
+
+
+def bind_session(session_id: Optional[str]):
+    """Attach a session id to the records the current request emits from here on"""
+    session_id_var.set(session_id)
@@ -0,0 +1,391 @@
+"""
+Prometheus metrics: per-stage latency histograms, counters and gauges
+Recording is lock-free on the hot path: every thread writes to its own shard
+(a plain list of numbers reached through threading.local), and GET /metrics
+sums the shards when it renders the Prometheus text format. A lock is only
+taken the first time a thread or a new label combination shows up.
+"""
+from bisect import bisect_left
+from contextvars import ContextVar, Token
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import math
+import threading
+import time
+
+# Seconds; covers in-process stages (~10 us) up to slow LLM turns
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+_registry: List["_Metric"] = []
+
+# Set to a list while a request is traced (profiling, traffic capture); each
+# observation of a traced histogram is appended as ((trace name, label values), seconds)
+request_trace: ContextVar[Optional[list]] = ContextVar("request_trace", default=None)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Sharded:
+    """A fixed-size vector of numbers with one copy per writing thread"""
+
+    def __init__(self, size: int):
+        self._size = size
+        self._local = threading.local()
+        self._shards: List[List[float]] = []
+        self._lock = threading.Lock()
+
+    def shard(self) -> List[float]:
+        try:
+            return self._local.values
+        except AttributeError:
+            values = [0.0] * self._size
+            with self._lock:
+                self._shards.append(values)
+            self._local.values = values
+            return values
+
+    def totals(self) -> List[float]:
+        with self._lock:
+            shards = list(self._shards)
+        # Shards of finished threads are kept, so their counts are never lost
+        return [sum(column) for column in zip(*shards)] if shards else [0.0] * self._size
+
+
+class _CounterChild:
+    __slots__ = ("_values",)
+
+    def __init__(self):
+        self._values = _Sharded(1)
+
+    def inc(self, amount: float = 1.0):
+        self._values.shard()[0] += amount
+
+    def value(self) -> float:
+        return self._values.totals()[0]
+
+
+class _GaugeChild:
+    __slots__ = ("_value", "_function")
+
+    def __init__(self):
+        self._value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float):
+        self._value = value
+
+    def set_function(self, function: Callable[[], float]):
+        """Compute the value when /metrics is scraped instead of on every change"""
+        self._function = function
+
+    def value(self) -> float:
+        if self._function is not None:
+            try:
+                return float(self._function())
+            except Exception:
+                return math.nan
+        return self._value
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_started")
+
+    def __init__(self, histogram: "_HistogramChild"):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._histogram.observe(time.perf_counter() - self._started)
+        return False
+
+
+class _HistogramChild:
+    __slots__ = ("_buckets", "_values")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self._buckets = buckets
+        # Per-bucket (non-cumulative) counts, the +Inf bucket, then the sum
+        self._values = _Sharded(len(buckets) + 2)
+
+    def observe(self, seconds: float):
+        values = self._values.shard()
+        values[bisect_left(self._buckets, seconds)] += 1
+        values[-1] += seconds
+
+    def time(self) -> _Timer:
+        """Context manager observing the duration of its block"""
+        return _Timer(self)
+
+    def snapshot(self) -> Tuple[List[float], float]:
+        """(cumulative bucket counts including +Inf, sum)"""
+        totals = self._values.totals()
+        cumulative, running = [], 0.0
+        for count in totals[:-1]:
+            running += count
+            cumulative.append(running)
+        return cumulative, totals[-1]
+
+
+class _TracedChild(_HistogramChild):
+    """Histogram child that also reports to the current request's trace"""
+    __slots__ = ("_key",)
+
+    def __init__(self, buckets: Tuple[float, ...], key: Tuple[str, Tuple[str, ...]]):
+        super().__init__(buckets)
+        self._key = key
+
+    def observe(self, seconds: float):
+        values = self._values.shard()
+        values[bisect_left(self._buckets, seconds)] += 1
+        values[-1] += seconds
+        trace = request_trace.get()
+        if trace is not None:
+            trace.append((self._key, seconds))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self.labels()
+        _registry.append(self)
+
+    def _new_child(self, values: Tuple[str, ...]):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """The time series for these label values (created on first use)"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._new_child(values)
+                    self._children[values] = child
+        return child
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        with self._lock:
+            children = sorted(self._children.items())
+        for values, child in children:
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values, child) -> List[str]:
+        return [f"{self.name}{_label_text(self.labelnames, values)} {_format_value(child.value())}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self, values):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self, values):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self._default.set(value)
+
+    def set_function(self, function: Callable[[], float]):
+        self._default.set_function(function)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, trace: Optional[str] = None):
+        self.buckets = tuple(sorted(buckets))
+        self.trace = trace
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self, values):
+        if self.trace:
+            return _TracedChild(self.buckets, (self.trace, values))
+        return _HistogramChild(self.buckets)
+
+    def observe(self, seconds: float):
+        self._default.observe(seconds)
+
+    def time(self) -> _Timer:
+        return self._default.time()
+
+    def _render_child(self, values, child) -> List[str]:
+        cumulative, total = child.snapshot()
+        labels = self.labelnames
+        lines = []
+        for bound, count in zip(self.buckets + (math.inf,), cumulative):
+            le = 'le="' + _format_value(bound) + '"'
+            lines.append(f"{self.name}_bucket{_label_text(labels, values, le)} {_format_value(count)}")
+        lines.append(f"{self.name}_sum{_label_text(labels, values)} {_format_value(total)}")
+        lines.append(f"{self.name}_count{_label_text(labels, values)} {_format_value(cumulative[-1])}")
+        return lines
+
+
+def render_metrics() -> str:
+    """Every registered metric in the Prometheus text exposition format"""
+    lines = []
+    for metric in list(_registry):
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ============================================================================
+# Metrics of the /query pipeline
+# ============================================================================
+
+STAGE_SECONDS = Histogram(
+    "scheme_stage_seconds",
+    "Time spent in each /query pipeline stage; stage=\"total\" is the whole request",
+    ["stage"],
+    trace="stage"
+)
+SEARCH_SECONDS = Histogram(
+    "scheme_search_seconds",
+    "Scheme search latency per datastore",
+    ["datastore"],
+    trace="search"
+)
+LLM_SECONDS = Histogram(
+    "scheme_llm_call_seconds",
+    "LLM turn latency per agent, including hedging, until an answer or the budget runs out",
+    ["agent", "outcome"],
+    trace="llm"
+)
+TURN_SECONDS = Histogram(
+    "scheme_turn_seconds",
+    "MasterAgent turn time by route taken",
+    ["route"],
+    trace="turn"
+)
+PROMPT_TOKENS = Histogram(
+    "scheme_prompt_tokens",
+    "Estimated tokens of the message sent to each specialist agent",
+    ["agent"],
+    buckets=(32, 64, 128, 256, 384, 512, 640, 768, 1024, 1536, 2048, 4096)
+)
+ROUTES = Counter(
+    "scheme_routes_total",
+    "/query turns by route taken",
+    ["route"]
+)
+CACHE_HITS = Counter(
+    "scheme_cache_hits_total",
+    "Hits of in-process caches and HTTP revalidations",
+    ["cache"]
+)
+FALLBACKS = Counter(
+    "scheme_fallbacks_total",
+    "Degraded paths taken instead of the primary one",
+    ["reason"]
+)
+LOG_RECORDS_DROPPED = Counter(
+    "scheme_log_records_dropped_total",
+    "Log records dropped because the log queue was full"
+)
+CAPTURE_RECORDS_DROPPED = Counter(
+    "scheme_capture_records_dropped_total",
+    "Captured /query records dropped because the capture queue was full"
+)
+LANE_SECONDS = Histogram(
+    "scheme_lane_seconds",
+    "Time /query turns spent on their execution lane, thread handoff included",
+    ["lane"]
+)
+ADMISSION_WAIT_SECONDS = Histogram(
+    "scheme_admission_wait_seconds",
+    "Time admitted /query turns waited for a slot, by planned route",
+    ["route"]
+)
+ADMISSION_SHED = Counter(
+    "scheme_admission_shed_total",
+    "/query turns rejected with 503, by planned route, limit scope and reason",
+    ["route", "scope", "reason"]
+)
+ADMISSION_QUEUED = Gauge(
+    "scheme_admission_queued",
+    "/query turns waiting for a slot, by limit scope",
+    ["scope"]
+)
+ADMISSION_ACTIVE = Gauge(
+    "scheme_admission_active",
+    "/query turns holding a slot, by limit scope",
+    ["scope"]
+)
+SESSIONS = Gauge(
+    "scheme_sessions",
+    "Conversation sessions held in memory"
+)
+CATALOG_SCHEMES = Gauge(
+    "scheme_catalog_schemes",
+    "Schemes known to the in-memory catalog"
+)
+
+
+def begin_trace() -> Tuple[list, Optional[Token]]:
+    """
+    The current request's trace, started here if none is active yet; pass
+    the token to end_trace so only the code that started a trace ends it
+    """
+    trace = request_trace.get()
+    if trace is not None:
+        return trace, None
+    trace = []
+    return trace, request_trace.set(trace)
+
+
+def end_trace(token: Optional[Token]):
+    if token is not None:
+        request_trace.reset(token)
+
+
+def stage_timer(stage: str) -> _HistogramChild:
+    """Histogram for one pipeline stage; bind at import time to keep lookups off the hot path"""
+    return STAGE_SECONDS.labels(stage)
+
+
+def datastore_label(datastore_path: str) -> str:
+    """Short datastore name: the last segment of a Vertex resource path"""
+    return datastore_path.rstrip("/").rsplit("/", 1)[-1] or "unknown"
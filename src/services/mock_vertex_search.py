@@ -2,7 +2,14 @@
 Mock Vertex Search Service for testing without GCP credentials
 """
 from typing import List
-from src.models.schemas import Scheme
+from src.models.scheme_record import SchemeRecord
+from src.services.dedup import attach_signature
+from src.services.metrics import SEARCH_SECONDS, datastore_label
+from src.services.log import get_logger
+import time
+
+log = get_logger(__name__)
+
 
 class MockVertexSearchService:
     """Mock search service that returns sample schemes"""
@@ -10,21 +17,25 @@ class MockVertexSearchService:
     def __init__(self, datastore_path: str):
         self.datastore_path = datastore_path
         self.is_farmer = "farmer" in datastore_path.lower()
-        print(f"🔧 Mock mode: Using sample {'farmer' if self.is_farmer else 'MSME'} schemes")
+        self._schemes = None  # Parsed (and signed) once, like real search results
+        self._latency = SEARCH_SECONDS.labels(datastore_label(datastore_path))
+        log.info("Mock mode: using sample %s schemes", "farmer" if self.is_farmer else "MSME")
     
-    def search(self, query: str, top_k: int = 10) -> List[Scheme]:
+    def search(self, query: str, top_k: int = 10) -> List[SchemeRecord]:
         """Return mock schemes based on category"""
-        print(f"🔍 Mock search: '{query}' (top {top_k})")
+        log.debug("Mock search", query=query, top_k=top_k)
+        started = time.perf_counter()
         
-        if self.is_farmer:
-            return self._get_mock_farmer_schemes()[:top_k]
-        else:
-            return self._get_mock_msme_schemes()[:top_k]
+        if self._schemes is None:
+            schemes = self._get_mock_farmer_schemes() if self.is_farmer else self._get_mock_msme_schemes()
+            self._schemes = [attach_signature(scheme) for scheme in schemes]
+        self._latency.observe(time.perf_counter() - started)
+        return self._schemes[:top_k]
     
-    def _get_mock_farmer_schemes(self) -> List[Scheme]:
+    def _get_mock_farmer_schemes(self) -> List[SchemeRecord]:
         """Mock farmer schemes"""
         return [
-            Scheme(
+            SchemeRecord(
                 id="farmer-1",
                 name="PM-KISAN Scheme",
                 description="Direct income support of ₹6000 per year to farmer families owning cultivable land",
@@ -33,7 +44,7 @@ class MockVertexSearchService:
                 application_process="Register online at pmkisan.gov.in portal or visit nearest Common Service Center",
                 url="https://pmkisan.gov.in"
             ),
-            Scheme(
+            SchemeRecord(
                 id="farmer-2",
                 name="Kisan Credit Card (KCC)",
                 description="Credit facility for farmers to meet short term credit requirements for cultivation and other needs",
@@ -42,7 +53,7 @@ class MockVertexSearchService:
                 application_process="Apply through any commercial bank, RRB, cooperative bank with land ownership documents",
                 url="https://pmkisan.gov.in/Rpo_FarmerCreditCard.aspx"
             ),
-            Scheme(
+            SchemeRecord(
                 id="farmer-3",
                 name="Pradhan Mantri Fasal Bima Yojana (PMFBY)",
                 description="Comprehensive crop insurance scheme providing financial support to farmers in case of crop loss",
@@ -51,7 +62,7 @@ class MockVertexSearchService:
                 application_process="Apply within stipulated time through banks, insurance companies or online portal",
                 url="https://pmfby.gov.in"
             ),
-            Scheme(
+            SchemeRecord(
                 id="farmer-4",
                 name="PM Kisan Samman Nidhi Yojana",
                 description="Income support scheme for small and marginal farmers",
@@ -60,7 +71,7 @@ class MockVertexSearchService:
                 application_process="Self-registration on PM-KISAN portal or through local revenue officer",
                 url="https://pmkisan.gov.in"
             ),
-            Scheme(
+            SchemeRecord(
                 id="farmer-5",
                 name="Soil Health Card Scheme",
                 description="Provides information on nutrient status of soil along with recommendations on dosage of nutrients",
@@ -69,7 +80,7 @@ class MockVertexSearchService:
                 application_process="Contact local agriculture department or soil testing laboratory",
                 url="https://soilhealth.dac.gov.in"
             ),
-            Scheme(
+            SchemeRecord(
                 id="farmer-6",
                 name="Pradhan Mantri Krishi Sinchai Yojana",
                 description="Irrigation scheme to expand cultivable area with assured irrigation",
@@ -78,7 +89,7 @@ class MockVertexSearchService:
                 application_process="Apply through state agriculture department",
                 url="https://pmksy.gov.in"
             ),
-            Scheme(
+            SchemeRecord(
                 id="farmer-7",
                 name="National Agriculture Market (e-NAM)",
                 description="Online trading platform for agricultural commodities",
@@ -87,7 +98,7 @@ class MockVertexSearchService:
                 application_process="Register on e-NAM portal with required documents",
                 url="https://enam.gov.in"
             ),
-            Scheme(
+            SchemeRecord(
                 id="farmer-8",
                 name="Kisan Call Centre",
                 description="Telephone helpline for farmers to answer queries related to agriculture",
@@ -96,7 +107,7 @@ class MockVertexSearchService:
                 application_process="Call toll-free number 1800-180-1551",
                 url="https://mkisan.gov.in"
             ),
-            Scheme(
+            SchemeRecord(
                 id="farmer-9",
                 name="Paramparagat Krishi Vikas Yojana",
                 description="Organic farming support scheme",
@@ -105,7 +116,7 @@ class MockVertexSearchService:
                 application_process="Apply through state agriculture department",
                 url="https://pgsindia-ncof.gov.in"
             ),
-            Scheme(
+            SchemeRecord(
                 id="farmer-10",
                 name="Rashtriya Krishi Vikas Yojana",
                 description="State plan scheme for holistic development of agriculture",
@@ -116,10 +127,10 @@ class MockVertexSearchService:
             ),
         ]
     
-    def _get_mock_msme_schemes(self) -> List[Scheme]:
+    def _get_mock_msme_schemes(self) -> List[SchemeRecord]:
         """Mock MSME schemes"""
         return [
-            Scheme(
+            SchemeRecord(
                 id="msme-1",
                 name="Credit Guarantee Fund Trust for Micro and Small Enterprises (CGTMSE)",
                 description="Collateral-free credit facility for micro and small enterprises",
@@ -128,7 +139,7 @@ class MockVertexSearchService:
                 application_process="Apply through CGTMSE member lending institutions (banks, NBFCs)",
                 url="https://www.cgtmse.in"
             ),
-            Scheme(
+            SchemeRecord(
                 id="msme-2",
                 name="MUDRA Loan Scheme",
                 description="Funding scheme for non-corporate, non-farm small/micro enterprises under three categories",
@@ -137,7 +148,7 @@ class MockVertexSearchService:
                 application_process="Apply online or through any bank, NBFC, or MFI",
                 url="https://www.mudra.org.in"
             ),
-            Scheme(
+            SchemeRecord(
                 id="msme-3",
                 name="Prime Minister's Employment Generation Programme (PMEGP)",
                 description="Credit-linked subsidy scheme for setting up micro-enterprises",
@@ -146,7 +157,7 @@ class MockVertexSearchService:
                 application_process="Apply online at KVIC portal or through District Industries Centre",
                 url="https://www.kviconline.gov.in/pmegp"
             ),
-            Scheme(
+            SchemeRecord(
                 id="msme-4",
                 name="Credit Linked Capital Subsidy Scheme (CLCSS)",
                 description="Technology upgradation scheme for MSMEs",
@@ -155,7 +166,7 @@ class MockVertexSearchService:
                 application_process="Apply through banks approved under the scheme",
                 url="https://dcmsme.gov.in"
             ),
-            Scheme(
+            SchemeRecord(
                 id="msme-5",
                 name="Stand-Up India Scheme",
                 description="Facilitating bank loans for SC/ST and women entrepreneurs",
@@ -164,7 +175,7 @@ class MockVertexSearchService:
                 application_process="Apply through any scheduled commercial bank branch",
                 url="https://www.standupmitra.in"
             ),
-            Scheme(
+            SchemeRecord(
                 id="msme-6",
                 name="Udyam Registration (formerly Udyog Aadhaar)",
                 description="Online registration portal for MSMEs",
@@ -173,7 +184,7 @@ class MockVertexSearchService:
                 application_process="Self-declaration based online registration with Aadhaar and PAN",
                 url="https://udyamregistration.gov.in"
             ),
-            Scheme(
+            SchemeRecord(
                 id="msme-7",
                 name="Market Development Assistance (MDA) Scheme",
                 description="Financial assistance for participation in trade fairs and exhibitions",
@@ -182,7 +193,7 @@ class MockVertexSearchService:
                 application_process="Apply through Office of Development Commissioner (MSME)",
                 url="https://dcmsme.gov.in"
             ),
-            Scheme(
+            SchemeRecord(
                 id="msme-8",
                 name="Micro & Small Enterprises Cluster Development Programme (MSE-CDP)",
                 description="Support for cluster-based development of MSMEs",
@@ -191,7 +202,7 @@ class MockVertexSearchService:
                 application_process="Apply through state government or field office of MSME-DI",
                 url="https://dcmsme.gov.in"
             ),
-            Scheme(
+            SchemeRecord(
                 id="msme-9",
                 name="ZED (Zero Defect Zero Effect) Certification",
                 description="Quality certification scheme for MSMEs",
@@ -200,7 +211,7 @@ class MockVertexSearchService:
                 application_process="Register on ZED portal and engage certified consultants",
                 url="https://zed.msme.gov.in"
             ),
-            Scheme(
+            SchemeRecord(
                 id="msme-10",
                 name="Technology and Quality Upgradation Support (TEQUP)",
                 description="Technology adoption and quality improvement support",
@@ -0,0 +1,136 @@
+"""
+On-demand profiling of single /query turns
+A profiled request runs MasterAgent.process under a sampling profiler: a
+background thread looks at the handling thread's stack every
+PROFILE_INTERVAL_MS and counts the stacks it sees. When the request ends,
+two files are written to PROFILE_DIR:
+    <id>.collapsed  folded stacks ("root;caller;callee count"), readable by
+                    speedscope and flamegraph.pl
+    <id>.json       request/session ids, duration, sample count and the
+                    pipeline stage timings of this request
+A request is profiled when it sends X-Profile: <PROFILE_TOKEN>, or when it is
+picked by PROFILE_SAMPLE_RATE. Every other request pays one comparison.
+"""
+from typing import Dict, Optional
+from config.settings import settings
+from src.services.log import get_logger, request_id_var, session_id_var
+from src.services.metrics import begin_trace, end_trace
+import contextlib
+import hmac
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+
+log = get_logger(__name__)
+
+# Frame labels by code object, so a sample only costs a stack walk and a join
+_labels: Dict[object, str] = {}
+
+
+def _frame_label(code) -> str:
+    label = _labels.get(code)
+    if label is None:
+        label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        _labels[code] = label
+    return label
+
+
+class _Sampler(threading.Thread):
+    """Counts the stacks of one thread until stopped"""
+
+    def __init__(self, thread_id: int, interval_s: float):
+        super().__init__(name="request-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval_s = interval_s
+        self.stacks: Dict[str, int] = {}
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        current_frames = sys._current_frames
+        while not self._stop_event.wait(self.interval_s):
+            frame = current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            stack = ";".join(reversed(labels))
+            self.stacks[stack] = self.stacks.get(stack, 0) + 1
+            self.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class RequestProfile:
+    """Stage timings and stack samples of one request"""
+
+    def __init__(self, reason: str):
+        self.reason = reason
+        self.request_id = request_id_var.get() or uuid.uuid4().hex[:16]
+        self.profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{self.request_id}"
+        self.stacks: Dict[str, int] = {}
+        self.samples = 0
+        self._started = time.perf_counter()
+        self._trace, self._trace_token = begin_trace()
+        self._trace_start = len(self._trace)
+
+    @contextlib.contextmanager
+    def sampling(self):
+        """Sample the calling thread's stack for the duration of the block"""
+        sampler = _Sampler(threading.get_ident(), settings.profile_interval_ms / 1000)
+        sampler.start()
+        try:
+            yield
+        finally:
+            sampler.stop()
+            for stack, count in sampler.stacks.items():
+                self.stacks[stack] = self.stacks.get(stack, 0) + count
+            self.samples += sampler.samples
+
+    def finish(self):
+        """Stop recording stages and write the profile files"""
+        duration_ms = (time.perf_counter() - self._started) * 1000
+        stages = [
+            {"stage": values[0], "ms": round(seconds * 1000, 3)}
+            for (kind, values), seconds in self._trace[self._trace_start:] if kind == "stage"
+        ]
+        end_trace(self._trace_token)
+        try:
+            os.makedirs(settings.profile_dir, exist_ok=True)
+            base = os.path.join(settings.profile_dir, self.profile_id)
+            with open(base + ".collapsed", "w") as f:
+                for stack, count in sorted(self.stacks.items()):
+                    f.write(f"{stack} {count}\n")
+            with open(base + ".json", "w") as f:
+                json.dump({
+                    "profile_id": self.profile_id,
+                    "request_id": self.request_id,
+                    "session_id": session_id_var.get(),
+                    "reason": self.reason,
+                    "duration_ms": round(duration_ms, 3),
+                    "interval_ms": settings.profile_interval_ms,
+                    "samples": self.samples,
+                    "stages": stages,
+                }, f, indent=2)
+        except OSError as e:
+            log.warning("Could not write profile %s: %s", self.profile_id, e)
+            return
+        log.info("Wrote profile %s", base, samples=self.samples, duration_ms=round(duration_ms, 1))
+
+
+def begin_profile(profile_header: Optional[str]) -> Optional[RequestProfile]:
+    """A RequestProfile if this request should be profiled, else None"""
+    if profile_header is not None and settings.profile_token and hmac.compare_digest(
+            profile_header.encode(), settings.profile_token.encode()):
+        return RequestProfile("header")
+    if settings.profile_sample_rate > 0 and random.random() < settings.profile_sample_rate:
+        return RequestProfile("sampled")
+    return None
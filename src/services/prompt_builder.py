@@ -0,0 +1,155 @@
+"""
+Token-budgeted prompt assembly for specialist agents
+Keeps the prompt small: assistant boilerplate is stripped, shown schemes are
+referenced by id and name only, and the most relevant user turns are kept
+"""
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from config.settings import settings
+import re
+
+# Assistant text from this marker onwards is the pagination/help footer
+_FOOTER_MARKERS = ("💡 Want to see more schemes?", "📌 **To learn more about any scheme")
+
+# Scheme listing produced by _format_schemes_brief: "**1. Name**" + indented description
+_LISTING_HEADER = re.compile(r"^\s*\*\*\d+\.\s.*\*\*\s*$")
+_LISTING_BODY = re.compile(r"^\s{3}\S")
+_WORD = re.compile(r"\w+")
+
+# Common words that say nothing about which turn is relevant
+_STOPWORDS = frozenset({
+    "a", "an", "the", "i", "me", "my", "for", "to", "of", "in", "on", "and",
+    "or", "is", "are", "am", "do", "can", "what", "about", "want", "need",
+    "tell", "more", "please", "scheme", "schemes", "with", "it", "this", "that",
+})
+
+
+@dataclass
+class BuiltPrompt:
+    """Prompt text plus the numbers we report per request"""
+    text: str
+    tokens: int
+    budget: int
+    dropped_turns: int = 0
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for Gemini on English text)"""
+    return (len(text) + 3) // 4
+
+
+def compress_assistant_message(content: str, max_chars: int = 200) -> str:
+    """Strip the scheme listing and help footer from an assistant message"""
+    for marker in _FOOTER_MARKERS:
+        cut = content.find(marker)
+        if cut != -1:
+            content = content[:cut]
+
+    lines = []
+    for line in content.splitlines():
+        if _LISTING_HEADER.match(line) or _LISTING_BODY.match(line):
+            continue
+        if line.strip():
+            lines.append(line.strip())
+
+    text = " ".join(lines)
+    if len(text) > max_chars:
+        text = text[:max_chars - 3] + "..."
+    return text
+
+
+def format_shown_schemes(context) -> str:
+    """Reference schemes the user has already seen by id and name only"""
+    schemes = getattr(context, "schemes", None) or []
+    if not schemes:
+        return ""
+    shown = (context.current_page + 1) * settings.schemes_per_page
+    return "; ".join(f"{s.id}: {s.name}" for s in schemes[:shown])
+
+
+def _terms(text: str) -> set:
+    return {w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS}
+
+
+def _rank_turns(turns: List[dict], query: str) -> List[Tuple[float, int, str]]:
+    """Score history turns by overlap with the current query, then recency"""
+    query_terms = _terms(query)
+    ranked = []
+    total = len(turns)
+    for idx, msg in enumerate(turns):
+        role = msg.get("role", "user")
+        content = msg.get("content", "")
+        if role == "assistant":
+            content = compress_assistant_message(content)
+            if not content:
+                continue
+
+        recency = (idx + 1) / total
+        overlap = len(query_terms & _terms(content)) if query_terms else 0
+        score = overlap + recency
+        if role == "assistant":
+            # Assistant turns are mostly our own wording - prefer user turns
+            score *= 0.5
+        ranked.append((score, idx, f"{role}: {content}"))
+
+    ranked.sort(key=lambda item: (-item[0], -item[1]))
+    return ranked
+
+
+def build_agent_prompt(query: str, context, task_instruction: str,
+                       budget: Optional[int] = None) -> BuiltPrompt:
+    """
+    Build the specialist agent prompt within a token budget
+
+    The current query and task instruction are always included. Shown schemes
+    and history turns are added in priority order while they fit.
+    """
+    budget = budget or settings.prompt_token_budget
+
+    history = list(getattr(context, "conversation_history", None) or [])
+    # The master agent appends the current query before routing
+    if history and history[-1].get("role") == "user" and history[-1].get("content") == query:
+        history = history[:-1]
+    history = history[-settings.prompt_history_turns:]
+
+    if not history and not getattr(context, "schemes", None):
+        return BuiltPrompt(text=query, tokens=estimate_tokens(query), budget=budget)
+
+    tail = f"\n\nCurrent query: {query}\n\n{task_instruction}"
+    used = estimate_tokens(tail)
+
+    shown_line = ""
+    shown = format_shown_schemes(context)
+    if shown:
+        shown_line = f"Previously shown schemes (id: name): {shown}\n\n"
+        if used + estimate_tokens(shown_line) > budget:
+            shown_line = ""
+        else:
+            used += estimate_tokens(shown_line)
+
+    header = "Previous conversation:\n"
+    selected = []
+    ranked = _rank_turns(history, query)
+    for _score, idx, line in ranked:
+        cost = estimate_tokens(line) + 1
+        if not selected:
+            cost += estimate_tokens(header)
+        if used + cost > budget:
+            continue
+        used += cost
+        selected.append((idx, line))
+
+    selected.sort()
+    conversation = "\n".join(line for _idx, line in selected)
+
+    text = shown_line
+    if conversation:
+        text += f"{header}{conversation}"
+    text = (text.rstrip() + tail) if text else f"Current query: {query}\n\n{task_instruction}"
+
+    return BuiltPrompt(
+        text=text,
+        tokens=estimate_tokens(text),
+        budget=budget,
+        dropped_turns=len(ranked) - len(selected),
+    )
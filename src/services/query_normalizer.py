@@ -0,0 +1,167 @@
+"""
+Query normalization for Devanagari and Hinglish input
+Transliterates Devanagari to Latin, lowercases, splits on anything that is
+not a letter or digit and maps spelling variants ("kisaan", "karja", "खेती")
+onto the canonical keyword tokens used by intent classification and scheme
+inquiry detection - all in one pass over the characters. The tables are built
+once at import: a 128-entry tuple for the Devanagari block and a dict of
+variants keyed by their squeezed spelling (repeated letters collapsed), so
+"kisaan", "kissan" and "किसान" share one entry.
+"""
+from typing import Dict, List, Optional, Tuple
+
+_DEVANAGARI_START = 0x0900
+_NUKTA = "़"
+_VIRAMA = "्"
+
+# Kinds of Devanagari characters
+_VOWEL, _CONSONANT, _MATRA, _NASAL, _DIGIT = range(5)
+
+_VOWELS = {
+    "अ": "a", "आ": "a", "इ": "i", "ई": "i", "उ": "u", "ऊ": "u", "ऋ": "ri",
+    "ए": "e", "ऐ": "ai", "ओ": "o", "औ": "au", "ऑ": "o",
+}
+_CONSONANTS = {
+    "क": "k", "ख": "kh", "ग": "g", "घ": "gh", "ङ": "n",
+    "च": "ch", "छ": "chh", "ज": "j", "झ": "jh", "ञ": "n",
+    "ट": "t", "ठ": "th", "ड": "d", "ढ": "dh", "ण": "n",
+    "त": "t", "थ": "th", "द": "d", "ध": "dh", "न": "n",
+    "प": "p", "फ": "f", "ब": "b", "भ": "bh", "म": "m",
+    "य": "y", "र": "r", "ल": "l", "व": "v",
+    "श": "sh", "ष": "sh", "स": "s", "ह": "h",
+}
+_MATRAS = {
+    "ा": "a", "ि": "i", "ी": "i", "ु": "u", "ू": "u", "ृ": "ri",
+    "े": "e", "ै": "ai", "ो": "o", "ौ": "au", "ॉ": "o",
+}
+_NASALS = {"ं": "n", "ँ": "n", "ः": "h"}
+# Consonant + nukta (ज़, फ़, ड़ ...) written as a separate code point
+_NUKTA_FORMS = {"k": "q", "kh": "kh", "g": "g", "j": "z", "f": "f", "d": "r", "dh": "rh"}
+
+
+def _build_devanagari_table() -> Tuple[Optional[Tuple[int, str]], ...]:
+    table: List[Optional[Tuple[int, str]]] = [None] * 128
+    for kind, chars in ((_VOWEL, _VOWELS), (_CONSONANT, _CONSONANTS),
+                        (_MATRA, _MATRAS), (_NASAL, _NASALS)):
+        for char, latin in chars.items():
+            table[ord(char) - _DEVANAGARI_START] = (kind, latin)
+    for digit in range(10):
+        table[0x66 + digit] = (_DIGIT, str(digit))
+    return tuple(table)
+
+
+_DEVANAGARI = _build_devanagari_table()
+
+# canonical token -> spelling variants (Latin, as typed or as transliterated)
+# Canonical tokens are category keywords, inquiry keywords or the spelling
+# used in scheme names, so downstream matching needs no Hindi knowledge.
+_VARIANTS: Dict[str, Tuple[str, ...]] = {
+    # Farming
+    "kisan": ("kisaan", "kissan", "kisano", "kisanon"),
+    "farm": ("kheti", "khethi", "khet", "kehti"),
+    "krishi": ("krushi", "krishee", "krisi", "krshi"),
+    "fasal": ("fasl", "phasal", "fasalon"),
+    "bima": ("beema", "bimaa"),
+    "sinchai": ("sinchaai", "sichai", "sinchayee"),
+    "seed": ("beej", "bij", "bija"),
+    "fertilizer": ("khad", "khaad", "urvarak"),
+    "cattle": ("pashu", "maweshi", "mavesi", "pashudhan"),
+    "dairy": ("doodh", "dudh"),
+    "land": ("zameen", "jameen", "jamin", "zamin", "bhumi", "bhoomi"),
+    # Business
+    "loan": ("karj", "karja", "karz", "karza", "rin", "udhar", "udhaar", "lon"),
+    "business": ("vyapar", "vyapaar", "vyavsay", "vyavasay", "dhandha", "dhanda", "karobar", "karobaar"),
+    "retail": ("dukan", "dukaan", "dukandar"),
+    "factory": ("karkhana", "kaarkhana"),
+    "udyog": ("udhyog", "udyogh"),
+    "yojana": ("yojna", "yojanaa"),
+    # Scheme inquiries and answers
+    "benefits": ("labh", "laabh", "fayda", "faida", "fayada"),
+    "eligibility": ("patrata", "paatrata", "yogyata"),
+    "apply": ("aavedan", "avedan"),
+    "information": ("jankari", "jaankari"),
+    "how": ("kaise", "kese"),
+    "first": ("pehla", "pahla", "pehli", "pahli"),
+    "second": ("dusra", "doosra", "dusri", "doosri"),
+    "third": ("teesra", "tisra", "teesri", "tisri"),
+    "yes": ("haan", "han", "ha", "hanji", "ji"),
+    "no": ("nahi", "nahin", "nai"),
+}
+
+
+def _squeeze(token: str) -> str:
+    """Collapse repeated letters: "kisaan" -> "kisan", "doodh" -> "dodh" """
+    return "".join(c for i, c in enumerate(token) if i == 0 or c != token[i - 1])
+
+
+def _build_synonym_table() -> Dict[str, str]:
+    return {
+        _squeeze(variant): canonical
+        for canonical, variants in _VARIANTS.items()
+        for variant in variants
+    }
+
+
+_SYNONYMS = _build_synonym_table()
+
+
+def normalize_query(query: str) -> str:
+    """
+    Lowercased, transliterated query with spelling variants replaced by
+    canonical tokens; tokens are separated by single spaces
+    """
+    tokens: List[str] = []
+    token: List[str] = []      # Latin letters of the current token
+    squeezed: List[str] = []   # The same letters with repeats collapsed
+    pending_a = False          # Inherent "a" after a Devanagari consonant
+    last_consonant = ""
+
+    def emit(latin: str):
+        for c in latin:
+            token.append(c)
+            if not squeezed or squeezed[-1] != c:
+                squeezed.append(c)
+
+    def end_token():
+        if token:
+            word = "".join(token)
+            tokens.append(_SYNONYMS.get("".join(squeezed), word))
+            token.clear()
+            squeezed.clear()
+
+    for char in query:
+        code = ord(char) - _DEVANAGARI_START
+        entry = _DEVANAGARI[code] if 0 <= code < 128 else None
+
+        if entry is not None:
+            kind, latin = entry
+            if kind == _MATRA:
+                pending_a = False
+            elif pending_a:
+                emit("a")
+                pending_a = False
+            emit(latin)
+            if kind == _CONSONANT:
+                pending_a = True
+                last_consonant = latin
+        elif char == _VIRAMA:
+            pending_a = False
+        elif char == _NUKTA:
+            # Consonant + nukta (ज + ़ -> z): swap the letters just emitted
+            replacement = _NUKTA_FORMS.get(last_consonant)
+            if replacement and token:
+                del token[-len(last_consonant):]
+                squeezed[:] = _squeeze("".join(token))
+                emit(replacement)
+        elif char.isascii() and char.isalnum():
+            if pending_a:
+                emit("a")
+                pending_a = False
+            emit(char.lower())
+        else:
+            # A word-final inherent vowel is silent in Hindi (किसान -> kisan)
+            pending_a = False
+            end_token()
+
+    end_token()
+    return " ".join(tokens)
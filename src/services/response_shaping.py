@@ -0,0 +1,82 @@
+"""
+Encoding of /query responses
+encode_query_response() splices each scheme's cached JSON fragment into the
+response envelope, so schemes are neither re-validated nor re-encoded per
+request. Sparse fieldsets let thin clients (SMS gateway, IVR) ask for only
+the scheme attributes they render and drop the markdown text or the
+structured scheme list.
+"""
+from typing import Any, Dict, List, Optional
+from src.models.schemas import QueryResponse, Scheme
+import json
+
+SCHEME_FIELDS = frozenset(Scheme.model_fields)
+OMITTABLE = frozenset({"response", "schemes"})
+
+# '"name":' prefixes in QueryResponse field order
+_KEYS = [(name, json.dumps(name).encode("utf-8") + b":") for name in QueryResponse.model_fields]
+
+
+class ShapeError(ValueError):
+    pass
+
+
+def parse_list(value: Optional[str]) -> Optional[List[str]]:
+    """Comma-separated query parameter -> list (None when absent or empty)"""
+    if not value:
+        return None
+    items = [item.strip() for item in value.split(",") if item.strip()]
+    return items or None
+
+
+def validate_shape(fields: Optional[List[str]], omit: Optional[List[str]]):
+    unknown = set(fields or ()) - SCHEME_FIELDS
+    if unknown:
+        raise ShapeError(
+            f"Unknown scheme fields: {', '.join(sorted(unknown))}. "
+            f"Valid fields: {', '.join(sorted(SCHEME_FIELDS))}"
+        )
+    unknown = set(omit or ()) - OMITTABLE
+    if unknown:
+        raise ShapeError(
+            f"Cannot omit: {', '.join(sorted(unknown))}. "
+            f"Valid values: {', '.join(sorted(OMITTABLE))}"
+        )
+
+
+def shape_response(
+    result: QueryResponse,
+    fields: Optional[List[str]] = None,
+    omit: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """The response as a dict with only the requested parts"""
+    shaped = {
+        name: getattr(result, name)
+        for name in QueryResponse.model_fields
+        if not (omit and name in omit)
+    }
+    if "schemes" in shaped:
+        schemes = [scheme.to_dict() for scheme in shaped["schemes"]]
+        if fields:
+            schemes = [{name: scheme[name] for name in fields} for scheme in schemes]
+        shaped["schemes"] = schemes
+    return shaped
+
+
+def encode_query_response(result: QueryResponse, omit: Optional[List[str]] = None) -> bytes:
+    """
+    JSON body for a QueryResponse, byte-for-byte what FastAPI would send
+    (compact separators, UTF-8), built from the schemes' pre-encoded fragments
+    """
+    parts = []
+    for name, key in _KEYS:
+        if omit and name in omit:
+            continue
+        if name == "schemes":
+            value = b"[" + b",".join(scheme.json_bytes() for scheme in result.schemes) + b"]"
+        else:
+            value = json.dumps(
+                getattr(result, name), ensure_ascii=False, separators=(",", ":")
+            ).encode("utf-8")
+        parts.append(key + value)
+    return b"{" + b",".join(parts) + b"}"
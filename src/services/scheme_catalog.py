@@ -0,0 +1,68 @@
+"""
+In-memory catalog of schemes returned by search, keyed by scheme id
+Lets tools fetch full scheme details on demand instead of sending every
+field to the LLM with each search result. Also counts how often each scheme
+is returned or looked up, which ranks autocomplete suggestions.
+"""
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.models.schemas import Scheme
+from src.models.scheme_record import SchemeRecord
+from src.services.metrics import CACHE_HITS, CATALOG_SCHEMES
+import json
+
+
+class SchemeCatalog:
+    def __init__(self):
+        self._schemes: Dict[str, SchemeRecord] = {}
+        self._hits: Dict[str, int] = {}
+        self.version = 0  # Bumped whenever a new scheme id is added
+        self._sorted_ids: List[str] = []
+        self._sorted_version = 0
+
+    def add_many(self, schemes: Iterable[SchemeRecord], count_hits: bool = True):
+        for scheme in schemes:
+            if scheme.id not in self._schemes:
+                self.version += 1
+            self._schemes[scheme.id] = scheme
+            if count_hits:
+                self._hits[scheme.id] = self._hits.get(scheme.id, 0) + 1
+
+    def get(self, scheme_id: str) -> Optional[SchemeRecord]:
+        scheme = self._schemes.get(scheme_id)
+        if scheme is not None:
+            self._hits[scheme_id] = self._hits.get(scheme_id, 0) + 1
+            CACHE_HITS.labels("catalog").inc()
+        return scheme
+
+    def popularity(self, scheme_id: str) -> int:
+        return self._hits.get(scheme_id, 0)
+
+    def page(self, after_id: str = "", limit: int = 20) -> Tuple[List[SchemeRecord], Optional[str]]:
+        """Schemes ordered by id starting after after_id, and the id to continue from"""
+        if self._sorted_version != self.version:
+            self._sorted_ids = sorted(self._schemes)
+            self._sorted_version = self.version
+        ids = self._sorted_ids
+        start = bisect_right(ids, after_id) if after_id else 0
+        page_ids = ids[start:start + limit]
+        next_id = page_ids[-1] if start + limit < len(ids) else None
+        return [self._schemes[scheme_id] for scheme_id in page_ids], next_id
+
+    def all(self) -> List[SchemeRecord]:
+        return list(self._schemes.values())
+
+    def load_file(self, path: str) -> int:
+        """Seed the catalog from a JSON list of schemes; returns the count loaded"""
+        with open(path, encoding="utf-8") as f:
+            # External input: validate once, then keep lightweight records
+            schemes = [SchemeRecord.from_dict(Scheme(**item).model_dump()) for item in json.load(f)]
+        self.add_many(schemes, count_hits=False)
+        return len(schemes)
+
+    def __len__(self) -> int:
+        return len(self._schemes)
+
+
+scheme_catalog = SchemeCatalog()
+CATALOG_SCHEMES.set_function(lambda: len(scheme_catalog))
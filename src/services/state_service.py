@@ -1,7 +1,19 @@
-from typing import Dict
-from src.models.schemas import ConversationContext, Scheme
+from typing import Dict, Optional, Tuple
+from config.categories import get_all_keywords
+from src.models.schemas import ConversationContext
+from src.models.scheme_record import SchemeRecord
+from src.services.fuzzy_match import TrigramIndex
+from src.services.metrics import SESSIONS
+from src.services.scheme_catalog import scheme_catalog
 from config.settings import settings
 
+
+def _scheme_index(schemes: list) -> TrigramIndex:
+    # Category keywords ("kisan", "loan") alone never name a scheme
+    generic = [keyword for keywords in get_all_keywords().values() for keyword in keywords]
+    return TrigramIndex(schemes, generic)
+
+
 class StateService:
     def __init__(self):
         self.sessions: Dict[str, ConversationContext] = {}
@@ -19,6 +31,27 @@ class StateService:
         context = self.get_or_create(session_id)
         context.schemes = schemes
         context.current_page = 0
+        # Built once per result set so follow-ups can name schemes loosely
+        context._scheme_index = _scheme_index(schemes)
+    
+    def match_scheme(self, session_id: str, query: str) -> Optional[Tuple[int, SchemeRecord]]:
+        """
+        (1-based position, scheme) of the session scheme the query names, if any
+        Naming a collapsed variant gives the variant's own record, at the
+        position of the scheme it was listed under.
+        """
+        context = self.sessions.get(session_id)
+        if context is None or not context.schemes:
+            return None
+        if context._scheme_index is None:
+            context._scheme_index = _scheme_index(context.schemes)
+        match = context._scheme_index.best_match(query)
+        if match is None:
+            return None
+        scheme = context.schemes[match.position]
+        if match.variant_id is not None:
+            scheme = scheme_catalog.get(match.variant_id) or scheme
+        return match.position + 1, scheme
     
     def get_current_schemes(self, session_id: str) -> list:
         context = self.get_or_create(session_id)
@@ -39,4 +72,5 @@ class StateService:
         if session_id in self.sessions:
             del self.sessions[session_id]
 
-state_service = StateService()
\ No newline at end of file
+state_service = StateService()
+SESSIONS.set_function(lambda: len(state_service.sessions))
\ No newline at end of file
@@ -0,0 +1,161 @@
+"""
+Prefix index for scheme-name autocomplete (GET /suggest)
+A sorted array of normalized keys (full names, name suffixes from each word,
+acronyms and category keywords), searched with bisect. Each key points at a
+suggestion; matches are ranked by scheme popularity from the catalog. When
+new schemes reach the catalog the index is rebuilt on a background thread
+while lookups keep using the previous one, so a lookup never builds the
+index (except the very first, if warmup didn't) and never touches Vertex or
+Gemini.
+"""
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+from config.categories import CATEGORIES
+from src.services.scheme_catalog import SchemeCatalog, scheme_catalog
+from src.services.log import get_logger
+import re
+import threading
+
+log = get_logger(__name__)
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_PARENTHESIZED = re.compile(r"\(([A-Za-z0-9\-]{2,})\)")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, punctuation and hyphens to single spaces ("PM-KISAN" -> "pm kisan")"""
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+def _acronyms(name: str) -> List[str]:
+    """Acronyms in parentheses ("... (PMFBY)") and the initials of multi-word names"""
+    acronyms = [normalize(a).replace(" ", "") for a in _PARENTHESIZED.findall(name)]
+    words = normalize(_PARENTHESIZED.sub(" ", name)).split()
+    if len(words) >= 3:
+        acronyms.append("".join(word[0] for word in words))
+    return acronyms
+
+
+class SuggestIndex:
+    def __init__(self, catalog: SchemeCatalog = scheme_catalog):
+        self._catalog = catalog
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._rebuilding = False
+        self._built_version = -1
+        # Swapped as one tuple so readers never see a half-built index:
+        # sorted keys, the suggestion index each key points at, and the
+        # suggestions as (text, type, scheme id or category id)
+        self._index: Tuple[List[str], List[int], List[Tuple[str, str, str]]] = ([], [], [])
+
+    def build(self):
+        """(Re)build from the catalog and CATEGORIES"""
+        with self._build_lock:
+            self._build()
+
+    def _build(self):
+        version = self._catalog.version
+        suggestions: List[Tuple[str, str, str]] = []
+        pairs = set()
+
+        for category_id, config in CATEGORIES.items():
+            index = len(suggestions)
+            suggestions.append((config.name, "category", category_id))
+            for keyword in [config.name, *config.keywords]:
+                pairs.add((normalize(keyword), index))
+
+        for scheme in self._catalog.all():
+            index = len(suggestions)
+            suggestions.append((scheme.name, "scheme", scheme.id))
+            words = normalize(scheme.name).split()
+            # Every word suffix, so "kisan" finds "PM-KISAN Scheme"
+            for start in range(len(words)):
+                pairs.add((" ".join(words[start:]), index))
+            for acronym in _acronyms(scheme.name):
+                pairs.add((acronym, index))
+
+        ordered = sorted(pair for pair in pairs if pair[0])
+        self._index = (
+            [key for key, _ in ordered],
+            [target for _, target in ordered],
+            suggestions
+        )
+        self._built_version = version
+        log.info("Suggest index built: %d suggestions, %d keys", len(suggestions), len(ordered))
+
+    def _refresh(self):
+        """Start a background rebuild unless one is already running"""
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+        threading.Thread(target=self._rebuild, name="suggest-index", daemon=True).start()
+
+    def _rebuild(self):
+        try:
+            # Schemes added during a build are picked up by the next pass
+            while self._built_version != self._catalog.version:
+                self.build()
+        except Exception:
+            log.exception("Suggest index rebuild failed")
+        finally:
+            with self._lock:
+                self._rebuilding = False
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[Dict[str, str]]:
+        """Suggestions whose keys start with prefix, most popular first"""
+        if self._built_version != self._catalog.version:
+            if self._built_version < 0:
+                # Never built (no warmup): there is no previous index to serve
+                with self._build_lock:
+                    if self._built_version < 0:
+                        self._build()
+            else:
+                self._refresh()
+
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        keys, targets, suggestions = self._index
+        matched = set()
+        position = bisect_left(keys, prefix)
+        while position < len(keys) and keys[position].startswith(prefix):
+            matched.add(targets[position])
+            position += 1
+
+        popularity = self._catalog.popularity
+        ranked = sorted(
+            matched,
+            key=lambda i: (
+                -popularity(suggestions[i][2]),
+                suggestions[i][1] == "category",
+                len(suggestions[i][0]),
+                suggestions[i][0],
+            )
+        )
+        return [
+            {"text": suggestions[i][0], "type": suggestions[i][1], "id": suggestions[i][2]}
+            for i in ranked[:limit]
+        ]
+
+
+suggest_index = SuggestIndex()
+
+
+def seed_catalog() -> Optional[int]:
+    """
+    Fill the catalog before the first search: SCHEME_CATALOG_PATH if set,
+    otherwise the sample schemes in mock mode
+    """
+    from config.settings import settings
+
+    if settings.scheme_catalog_path:
+        return scheme_catalog.load_file(settings.scheme_catalog_path)
+    if settings.use_mock_search:
+        from src.agents.registry import category_registry
+        for category_id in category_registry.configured():
+            service = category_registry.get(category_id).search_service
+            scheme_catalog.add_many(service.search("", top_k=100), count_hits=False)
+        return len(scheme_catalog)
+    return None
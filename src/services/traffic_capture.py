@@ -0,0 +1,143 @@
+"""
+Capture of /query traffic for replay (benchmarks.replay)
+TrafficCaptureMiddleware hands each finished request to capture(), which
+only puts the raw request, response and trace on a bounded queue. A
+background thread turns them into one JSON line each and appends them to
+rotating files in CAPTURE_DIR:
+    {"ts": 1760000000.123, "request_id": "...", "session_id": "...",
+     "new_session": true, "query": "...", "show_more": false, "params": "",
+     "status": 200, "duration_ms": 812.4, "route": "agent",
+     "stages": {"session_load": 0.04, ...}, "search": [{"datastore": ..., "ms": ...}],
+     "llm": [{"agent": ..., "outcome": "ok", "ms": ...}], "response_bytes": 2310}
+Query text passes through the redaction hooks named in CAPTURE_REDACT before
+it is written; register_redactor adds more.
+"""
+from typing import Callable, Dict, List, Optional
+from config.settings import settings
+from src.services.log import get_logger
+from src.services.metrics import CAPTURE_RECORDS_DROPPED
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import threading
+
+log = get_logger(__name__)
+
+_DIGIT_RUN = re.compile(r"\d{4,}")
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+
+# name -> hook; hooks take the query text and return it redacted
+REDACTORS: Dict[str, Callable[[str], str]] = {
+    # Phone, Aadhaar, account numbers; the length is kept so replayed
+    # queries cost the same to normalize and match
+    "digits": lambda text: _DIGIT_RUN.sub(lambda m: "#" * len(m.group()), text),
+    "emails": lambda text: _EMAIL.sub("<email>", text),
+}
+
+_queue: Optional[queue.Queue] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_start_lock = threading.Lock()
+
+
+def register_redactor(name: str, hook: Callable[[str], str]):
+    """Make a redaction hook available to CAPTURE_REDACT"""
+    REDACTORS[name] = hook
+
+
+def redact(text: str) -> str:
+    for name in settings.capture_redact:
+        hook = REDACTORS.get(name)
+        if hook is not None:
+            text = hook(text)
+    return text
+
+
+def _json_or_empty(body: bytes) -> dict:
+    try:
+        value = json.loads(body) if body else {}
+    except ValueError:
+        return {}
+    return value if isinstance(value, dict) else {}
+
+
+def build_entry(raw: dict) -> dict:
+    """The JSONL entry for one captured request"""
+    request = _json_or_empty(raw["request_body"])
+    response = _json_or_empty(raw["response_body"]) if raw["status"] == 200 else {}
+    stages: Dict[str, float] = {}
+    search: List[dict] = []
+    llm: List[dict] = []
+    route = None
+    for (kind, values), seconds in raw["trace"]:
+        ms = round(seconds * 1000, 3)
+        if kind == "stage":
+            stages[values[0]] = ms
+        elif kind == "search":
+            search.append({"datastore": values[0], "ms": ms})
+        elif kind == "llm":
+            llm.append({"agent": values[0], "outcome": values[1], "ms": ms})
+        elif kind == "turn":
+            route = values[0]
+    return {
+        "ts": round(raw["ts"], 3),
+        "request_id": raw["request_id"],
+        "session_id": request.get("session_id") or response.get("session_id"),
+        "new_session": not request.get("session_id"),
+        "query": redact(str(request.get("query", ""))),
+        "show_more": bool(request.get("show_more", False)),
+        "params": raw["query_string"],
+        "status": raw["status"],
+        "duration_ms": round(raw["duration_ms"], 3),
+        "route": route,
+        "stages": stages,
+        "search": search,
+        "llm": llm,
+        "response_bytes": len(raw["response_body"]),
+    }
+
+
+class _EntryFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(build_entry(record.capture), ensure_ascii=False)
+
+
+def _start() -> queue.Queue:
+    global _queue, _listener
+    with _start_lock:
+        if _queue is None:
+            os.makedirs(settings.capture_dir, exist_ok=True)
+            writer = logging.handlers.RotatingFileHandler(
+                os.path.join(settings.capture_dir, "query.jsonl"),
+                maxBytes=settings.capture_max_bytes,
+                backupCount=settings.capture_backup_count,
+                encoding="utf-8",
+            )
+            writer.setFormatter(_EntryFormatter())
+            records = queue.Queue(maxsize=settings.capture_queue_size)
+            _listener = logging.handlers.QueueListener(records, writer)
+            _listener.start()
+            atexit.register(stop_capture)
+            log.info("Capturing /query traffic to %s", settings.capture_dir)
+            _queue = records
+    return _queue
+
+
+def capture(raw: dict):
+    """Queue one finished request for writing; never blocks"""
+    records = _queue or _start()
+    try:
+        records.put_nowait(logging.makeLogRecord({"capture": raw}))
+    except queue.Full:
+        CAPTURE_RECORDS_DROPPED.inc()
+
+
+def stop_capture():
+    """Write out queued entries and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
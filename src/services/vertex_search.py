@@ -3,9 +3,16 @@ Vertex AI Search Service with correct schema mapping
 """
 from google.cloud import discoveryengine_v1 as discoveryengine
 from typing import List, Optional
-from src.models.schemas import Scheme
+from src.models.scheme_record import SchemeRecord
+from src.services.circuit_breaker import get_breaker
+from src.services.dedup import attach_signature
+from src.services.metrics import FALLBACKS, SEARCH_SECONDS, datastore_label
+from src.services.log import get_logger
 from config.settings import settings
-import os
+import time
+
+log = get_logger(__name__)
+
 
 class VertexSearchService:
     def __init__(self, datastore_path: str):
@@ -18,41 +25,35 @@ class VertexSearchService:
         self.datastore_path = datastore_path
         self._client: Optional[discoveryengine.SearchServiceClient] = None
         self.serving_config = f"{datastore_path}/servingConfigs/default_config"
+        self.breaker = get_breaker(
+            f"vertex_search:{datastore_path.rstrip('/').split('/')[-1] or 'default'}",
+            settings.search_slow_call_ms
+        )
+        self._datastore = datastore_label(datastore_path)
+        self._latency = SEARCH_SECONDS.labels(self._datastore)
     
     @property
     def client(self):
-        """Lazy initialization of the client"""
+        """Lazy initialization of the client (built eagerly by the startup warmup)"""
         if self._client is None:
-            # Check for credentials
-            if not self._check_credentials():
-                raise RuntimeError(
-                    "Google Cloud credentials not found. Please run:\n"
-                    "  gcloud auth application-default login\n"
-                    "Or set GOOGLE_APPLICATION_CREDENTIALS environment variable"
-                )
-            self._client = discoveryengine.SearchServiceClient()
+            from src.services.credentials import credential_manager
+            self._client = discoveryengine.SearchServiceClient(
+                credentials=credential_manager.get()
+            )
         return self._client
     
-    def _check_credentials(self) -> bool:
-        """Check if Google Cloud credentials are available"""
-        # Check for service account key file
-        if os.getenv("GOOGLE_APPLICATION_CREDENTIALS"):
-            return os.path.exists(os.getenv("GOOGLE_APPLICATION_CREDENTIALS"))
-        
-        # Check for gcloud auth
-        import subprocess
-        try:
-            result = subprocess.run(
-                ["gcloud", "auth", "application-default", "print-access-token"],
-                capture_output=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except:
-            return False
+    def warm(self):
+        """Build the client ahead of the first search"""
+        self.client
     
-    def search(self, query: str, top_k: int = 10) -> List[Scheme]:
+    def search(self, query: str, top_k: int = 10) -> List[SchemeRecord]:
         """Search the vertex AI datastore and return schemes"""
+        # Fail fast while Vertex is degraded instead of waiting for the client timeout
+        if not self.breaker.allow():
+            log.warning("Search skipped, circuit %s is %s", self.breaker.name, self.breaker.state)
+            FALLBACKS.labels("search_circuit_open").inc()
+            return []
+        
         request = discoveryengine.SearchRequest(
             serving_config=self.serving_config,
             query=query,
@@ -65,6 +66,7 @@ class VertexSearchService:
             ),
         )
         
+        started = time.perf_counter()
         try:
             response = self.client.search(request)
             schemes = []
@@ -129,7 +131,7 @@ class VertexSearchService:
                 if guid:
                     url = f"https://schemes.gov.in/scheme/{guid}"  # Example URL
                 
-                scheme = Scheme(
+                scheme = SchemeRecord(
                     id=doc.id,
                     name=name,
                     description=description,
@@ -141,20 +143,24 @@ class VertexSearchService:
                 
                 # Skip metadata/index documents (no real scheme data)
                 if name == "Untitled Scheme" or not description or description == "No description available":
-                    print(f"   ⏭️  Skipping metadata document: {doc.id}")
+                    log.debug("Skipping metadata document %s", doc.id)
                     continue
                 
-                schemes.append(scheme)
+                schemes.append(attach_signature(scheme))
+            
+            elapsed = time.perf_counter() - started
+            self.breaker.record(True, elapsed)
+            self._latency.observe(elapsed)
             
-            if schemes:
-                print(f"✅ Retrieved {len(schemes)} schemes")
-                if schemes[0].name != "Untitled Scheme":
-                    print(f"   First scheme: {schemes[0].name[:50]}...")
+            log.debug("Retrieved %d schemes", len(schemes), datastore=self._datastore,
+                      elapsed_ms=round(elapsed * 1000, 1))
             
             return schemes
             
-        except Exception as e:
-            print(f"❌ Search error: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            elapsed = time.perf_counter() - started
+            self.breaker.record(False, elapsed)
+            self._latency.observe(elapsed)
+            FALLBACKS.labels("search_error").inc()
+            log.exception("Search error", datastore=self._datastore)
             return []
\ No newline at end of file
@@ -0,0 +1,127 @@
+"""
+Startup warmup: build clients, agents and derived indexes before taking traffic
+Steps run once on a background thread when the app starts; /ready reports
+ready only after every step has finished, so load balancers never route to
+a cold worker. If a required step fails the worker never becomes ready and
+/ready lists the failed steps; optional steps (things that are also built on
+first use) only log. Other modules add their own steps with register_warmup().
+"""
+from typing import Callable, Dict, List, Tuple
+from src.services.log import get_logger
+import threading
+import time
+
+log = get_logger(__name__)
+_steps: List[Tuple[str, Callable[[], None], bool]] = []
+_results: Dict[str, dict] = {}
+_ready = threading.Event()
+_started = threading.Event()
+
+
+def register_warmup(name: str, step: Callable[[], None], required: bool = True):
+    """Add a warmup step; steps run in registration order"""
+    if all(existing != name for existing, _, _ in _steps):
+        _steps.append((name, step, required))
+
+
+def run_warmup():
+    """Run every registered step, recording timings and failures"""
+    started = time.perf_counter()
+    for name, step, required in list(_steps):
+        step_started = time.perf_counter()
+        try:
+            step()
+            _results[name] = {"ok": True, "ms": round((time.perf_counter() - step_started) * 1000, 1)}
+        except Exception as e:
+            _results[name] = {
+                "ok": False, "required": required,
+                "ms": round((time.perf_counter() - step_started) * 1000, 1), "error": str(e),
+            }
+            log.warning("Warmup step %s failed: %s", name, e)
+
+    failed = failed_steps()
+    if failed:
+        log.error("Warmup failed in %.0fms, staying unready: %s",
+                  (time.perf_counter() - started) * 1000, ", ".join(failed))
+        return
+    _ready.set()
+    log.info("Warmup complete in %.0fms", (time.perf_counter() - started) * 1000)
+
+
+def start_warmup():
+    """Run the warmup once on a background thread"""
+    if _started.is_set():
+        return
+    _started.set()
+    threading.Thread(target=run_warmup, name="warmup", daemon=True).start()
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def warmup_status() -> Dict[str, dict]:
+    return dict(_results)
+
+
+def failed_steps() -> List[str]:
+    """Required steps that raised; any of them keeps the worker unready"""
+    return [name for name, result in _results.items() if not result["ok"] and result["required"]]
+
+
+def _warm_credentials():
+    from config.settings import settings
+    if settings.use_mock_search:
+        return
+    from src.services.credentials import credential_manager
+    credential_manager.get()
+
+
+def _warm_categories():
+    """
+    Categories to build at startup: WARMUP_CATEGORIES if set, otherwise every
+    category with a configured datastore
+    """
+    from config.settings import settings
+    from src.agents.registry import category_registry
+
+    configured = category_registry.configured()
+    if settings.warmup_categories:
+        return [c for c in settings.warmup_categories if c in configured]
+    return configured
+
+
+def _warm_search_clients():
+    from src.agents.registry import category_registry
+
+    for category_id in _warm_categories():
+        service = category_registry.get(category_id).search_service
+        # Building the gRPC client is the expensive part of the first search
+        warm = getattr(service, "warm", None)
+        if warm:
+            warm()
+
+
+def _warm_agents():
+    from src.agents.master_agent import get_master_agent
+    from src.agents.registry import category_registry
+    from src.services.agent_runner import agent_runner
+
+    get_master_agent()
+    for category_id in _warm_categories():
+        category_registry.get(category_id).agent
+    agent_runner.start()
+
+
+def _warm_suggest_index():
+    from src.services.suggest_index import seed_catalog, suggest_index
+
+    seed_catalog()
+    suggest_index.build()
+
+
+register_warmup("credentials", _warm_credentials)
+register_warmup("search_clients", _warm_search_clients)
+register_warmup("agents", _warm_agents)
+# suggest() builds the index itself on first use
+register_warmup("suggest_index", _warm_suggest_index, required=False)
@@ -0,0 +1,5 @@
+"""Run the app against the mock datastores, as the benchmarks do"""
+import os
+
+os.environ.setdefault("USE_MOCK_SEARCH", "true")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
@@ -0,0 +1,258 @@
+"""Slot handoff, cancellation and shedding in admission control"""
+import asyncio
+
+import pytest
+
+from src.services.admission import QUEUE_FULL, TIMEOUT, AdmissionController, AdmissionRejected, _Limiter
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def _settle():
+    # Let woken tasks run up to their next await
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+def _far(loop):
+    return loop.time() + 5
+
+
+def test_release_hands_the_slot_to_the_first_waiter():
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        limiter = _Limiter("test", limit=1, max_queue=4)
+        await limiter.acquire(_far(loop))
+        order = []
+
+        async def waiter(name):
+            await limiter.acquire(_far(loop))
+            order.append(name)
+
+        tasks = [asyncio.ensure_future(waiter(name)) for name in ("b", "c")]
+        await _settle()
+        assert (limiter.active, limiter.queued) == (1, 2)
+
+        limiter.release()
+        await _settle()
+        # The slot moved to b without ever being free for a newcomer
+        assert order == ["b"]
+        assert (limiter.active, limiter.queued) == (1, 1)
+
+        limiter.release()
+        await asyncio.gather(*tasks)
+        assert order == ["b", "c"]
+        limiter.release()
+        assert limiter.idle
+
+    run(scenario())
+
+
+def test_newcomer_cannot_jump_the_queue():
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        limiter = _Limiter("test", limit=1, max_queue=4)
+        await limiter.acquire(_far(loop))
+        queued = asyncio.ensure_future(limiter.acquire(_far(loop)))
+        await _settle()
+
+        limiter.release()
+        newcomer = asyncio.ensure_future(limiter.acquire(_far(loop)))
+        await _settle()
+        assert queued.done() and not newcomer.done()
+
+        limiter.release()
+        await newcomer
+        limiter.release()
+        assert limiter.idle
+
+    run(scenario())
+
+
+def test_cancel_after_handoff_passes_the_slot_on():
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        limiter = _Limiter("test", limit=1, max_queue=4)
+        await limiter.acquire(_far(loop))
+        handed = asyncio.ensure_future(limiter.acquire(_far(loop)))
+        after = asyncio.ensure_future(limiter.acquire(_far(loop)))
+        await _settle()
+
+        limiter.release()    # the slot now belongs to `handed`...
+        handed.cancel()      # ...which is cancelled before it resumes
+        with pytest.raises(asyncio.CancelledError):
+            await handed
+        await after
+        assert (limiter.active, limiter.queued) == (1, 0)
+
+        limiter.release()
+        assert limiter.idle
+
+    run(scenario())
+
+
+def test_cancel_after_handoff_without_waiters_frees_the_slot():
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        limiter = _Limiter("test", limit=1, max_queue=4)
+        await limiter.acquire(_far(loop))
+        handed = asyncio.ensure_future(limiter.acquire(_far(loop)))
+        await _settle()
+
+        limiter.release()
+        handed.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await handed
+        assert limiter.idle
+
+    run(scenario())
+
+
+def test_cancel_while_queued_leaves_the_queue():
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        limiter = _Limiter("test", limit=1, max_queue=4)
+        await limiter.acquire(_far(loop))
+        queued = asyncio.ensure_future(limiter.acquire(_far(loop)))
+        await _settle()
+
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        assert (limiter.active, limiter.queued) == (1, 0)
+        limiter.release()
+        assert limiter.idle
+
+    run(scenario())
+
+
+def test_full_queue_sheds_immediately():
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        limiter = _Limiter("test", limit=1, max_queue=1)
+        await limiter.acquire(_far(loop))
+        queued = asyncio.ensure_future(limiter.acquire(_far(loop)))
+        await _settle()
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            await limiter.acquire(_far(loop))
+        assert rejected.value.reason == QUEUE_FULL
+        assert (limiter.active, limiter.queued) == (1, 1)
+
+        limiter.release()
+        await queued
+        limiter.release()
+        assert limiter.idle
+
+    run(scenario())
+
+
+def test_queue_deadline_sheds_and_leaves_the_queue():
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        limiter = _Limiter("test", limit=1, max_queue=4)
+        await limiter.acquire(_far(loop))
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            await limiter.acquire(loop.time() + 0.01)
+        assert rejected.value.reason == TIMEOUT
+        assert (limiter.active, limiter.queued) == (1, 0)
+
+        # A release after the timeout must not hand the slot to the expired waiter
+        limiter.release()
+        assert limiter.idle
+
+    run(scenario())
+
+
+def _controller(**overrides):
+    options = dict(
+        lane_limits={"fast": 1, "llm": 1}, max_queue=1, max_per_session=1,
+        session_queue=1, queue_timeout_ms=1000, route_limits={},
+        route_timeouts_ms={}, retry_after_s=7,
+    )
+    options.update(overrides)
+    return AdmissionController(**options)
+
+
+def test_rejection_releases_slots_already_taken():
+    async def scenario():
+        controller = _controller()
+        holder = asyncio.Event()
+        done = asyncio.Event()
+
+        async def hold(session_id):
+            async with controller.admit(session_id, "agent", "llm"):
+                holder.set()
+                await done.wait()
+
+        first = asyncio.ensure_future(hold("s1"))
+        await holder.wait()
+        queued = asyncio.ensure_future(hold("s2"))
+        await _settle()
+
+        # s3 gets its session slot, then finds the llm lane queue full
+        with pytest.raises(AdmissionRejected) as rejected:
+            async with controller.admit("s3", "agent", "llm"):
+                pass
+        assert (rejected.value.scope, rejected.value.reason) == ("lane:llm", QUEUE_FULL)
+        assert rejected.value.retry_after_s == 7
+        assert "s3" not in controller._sessions
+
+        done.set()
+        await asyncio.gather(first, queued)
+        assert controller._sessions == {}
+        assert controller._lanes["llm"].idle
+
+    run(scenario())
+
+
+def test_lanes_are_independent_and_sessions_serialized():
+    async def scenario():
+        controller = _controller()
+        release = asyncio.Event()
+        entered = []
+
+        async def turn(session_id, lane):
+            async with controller.admit(session_id, "route", lane):
+                entered.append((session_id, lane))
+                await release.wait()
+
+        tasks = [
+            asyncio.ensure_future(turn("s1", "llm")),
+            asyncio.ensure_future(turn("s2", "fast")),   # fast lane: not held up by the llm turn
+            asyncio.ensure_future(turn("s1", "fast")),   # waits for s1's first turn
+        ]
+        await _settle()
+        assert entered == [("s1", "llm"), ("s2", "fast")]
+        assert controller._sessions["s1"].queued == 1
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert entered[-1] == ("s1", "fast")
+        assert controller._sessions == {}
+
+    run(scenario())
+
+
+def test_cancelled_turn_releases_everything():
+    async def scenario():
+        controller = _controller()
+        entered = asyncio.Event()
+
+        async def turn():
+            async with controller.admit("s1", "agent", "llm"):
+                entered.set()
+                await asyncio.sleep(60)
+
+        task = asyncio.ensure_future(turn())
+        await entered.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert controller._sessions == {}
+        assert controller._lanes["llm"].idle
+
+    run(scenario())
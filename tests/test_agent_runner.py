@@ -0,0 +1,104 @@
+"""ADK session bookkeeping in AgentRunner: TTL and LRU eviction, deletion"""
+import asyncio
+import threading
+import time
+
+from src.services.agent_runner import AgentRunner
+
+
+class _SessionService:
+    """Records session calls; async like current ADK releases unless sync=True"""
+
+    def __init__(self, sync=False):
+        self.sync = sync
+        self.created = []
+        self.deleted = []
+        self.deleted_event = threading.Event()
+
+    def create_session(self, app_name, user_id, session_id):
+        self.created.append((app_name, session_id))
+        return None if self.sync else asyncio.sleep(0)
+
+    def delete_session(self, app_name, user_id, session_id):
+        self.deleted.append((app_name, session_id))
+        self.deleted_event.set()
+        return None if self.sync else asyncio.sleep(0)
+
+
+def _runner(ttl_s=60, max_sessions=10):
+    runner = AgentRunner(session_ttl_s=ttl_s, max_sessions=max_sessions)
+    runner._session_service = _SessionService()
+    return runner
+
+
+def _age(runner, key, seconds):
+    runner._sessions[key] = time.monotonic() - seconds
+
+
+def test_sessions_idle_past_the_ttl_are_evicted():
+    runner = _runner(ttl_s=60)
+    for session_id in ("old", "fresh"):
+        runner._touch(("FarmerAgent", session_id))
+    _age(runner, ("FarmerAgent", "old"), 120)
+
+    assert runner._take_evictable() == [("FarmerAgent", "old")]
+    assert not runner.has_session("FarmerAgent", "old")
+    assert runner.has_session("FarmerAgent", "fresh")
+    assert runner._take_evictable() == []
+
+
+def test_least_recently_used_sessions_go_over_the_limit():
+    runner = _runner(max_sessions=2)
+    for session_id in ("a", "b", "c"):
+        runner._touch(("FarmerAgent", session_id))
+    runner._touch(("FarmerAgent", "a"))  # a is now the most recent
+
+    assert runner._take_evictable() == [("FarmerAgent", "b")]
+    assert list(runner._sessions) == [("FarmerAgent", "c"), ("FarmerAgent", "a")]
+
+
+def test_sessions_with_a_turn_in_flight_are_kept():
+    runner = _runner(ttl_s=60, max_sessions=1)
+    busy, idle = ("FarmerAgent", "busy"), ("MSMEAgent", "idle")
+    runner._touch(busy)
+    runner._touch(idle)
+    _age(runner, busy, 120)
+    runner._running[busy] = 1
+
+    # busy is expired and least recently used, but its turn is still running
+    assert runner._take_evictable() == [idle]
+    assert runner.has_session(*busy)
+
+    del runner._running[busy]
+    assert runner._take_evictable() == [busy]
+
+
+def test_session_is_created_once_per_agent_and_session():
+    for sync in (False, True):
+        runner = _runner()
+        service = runner._session_service = _SessionService(sync=sync)
+
+        async def scenario():
+            await runner._ensure_session("FarmerAgent", "s1")
+            await runner._ensure_session("FarmerAgent", "s1")
+            await runner._ensure_session("MSMEAgent", "s1")
+
+        asyncio.run(scenario())
+        assert service.created == [("FarmerAgent", "s1"), ("MSMEAgent", "s1")]
+        assert runner.has_session("FarmerAgent", "s1")
+
+
+def test_delete_session_drops_every_agents_session_on_the_loop():
+    runner = _runner()
+    runner._runners = {"FarmerAgent": object(), "MSMEAgent": object()}
+    runner._touch(("FarmerAgent", "s1"))
+    runner._touch(("FarmerAgent", "s2"))
+    runner.start()
+
+    runner.delete_session("s1")
+
+    assert runner._session_service.deleted_event.wait(2)
+    assert runner._session_service.deleted == [("FarmerAgent", "s1")]
+    assert not runner.has_session("FarmerAgent", "s1")
+    assert runner.has_session("FarmerAgent", "s2")
+    runner._loop.call_soon_threadsafe(runner._loop.stop)
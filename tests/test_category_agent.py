@@ -0,0 +1,95 @@
+"""Seeding ADK sessions with the token-budgeted prompt only when needed"""
+from concurrent.futures import Future
+
+import pytest
+
+from config.categories import CATEGORIES
+from config.settings import settings
+from src.agents import registry
+from src.models.schemas import ConversationContext
+from src.services.mock_vertex_search import MockVertexSearchService
+
+
+def _done(value):
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+class _Runner:
+    """AgentRunner stand-in recording the messages each turn sends"""
+
+    def __init__(self, primary=lambda: _done("reply")):
+        self.primary = primary
+        self.sessions = set()
+        self.messages = []
+        self.ephemeral = []
+
+    def has_session(self, agent_name, session_id):
+        return (agent_name, session_id) in self.sessions
+
+    def submit(self, agent_name, session_id, message):
+        self.sessions.add((agent_name, session_id))
+        self.messages.append(message)
+        return self.primary()
+
+    def submit_ephemeral(self, agent_name, message):
+        self.ephemeral.append(message)
+        return _done("hedged reply")
+
+
+@pytest.fixture
+def prompts(monkeypatch):
+    """Every prompt build_agent_prompt makes"""
+    built = []
+    build = registry.build_agent_prompt
+
+    def spy(*args, **kwargs):
+        prompt = build(*args, **kwargs)
+        built.append(prompt.text)
+        return prompt
+
+    monkeypatch.setattr(registry, "build_agent_prompt", spy)
+    return built
+
+
+def _agent(monkeypatch, runner):
+    monkeypatch.setattr(registry, "agent_runner", runner)
+    agent = registry.CategoryAgent(CATEGORIES["FARMER"])
+    agent._search_service = MockVertexSearchService("farmer")
+    return agent
+
+
+def _context():
+    context = ConversationContext(session_id="s1")
+    context.add_message("user", "I grow paddy in Odisha")
+    context.add_message("assistant", "Happy to help with paddy farming schemes.")
+    return context
+
+
+def test_seed_prompt_is_built_only_for_a_new_session(monkeypatch, prompts):
+    runner = _Runner()
+    agent = _agent(monkeypatch, runner)
+    context = _context()
+
+    agent._respond_with_llm("irrigation subsidy", context)
+    agent._respond_with_llm("what about drip irrigation", context)
+
+    assert len(prompts) == 1
+    assert runner.messages == [prompts[0], "what about drip irrigation"]
+    assert "I grow paddy in Odisha" in prompts[0]
+
+
+def test_hedge_on_a_continued_session_builds_the_seed_prompt_then(monkeypatch, prompts):
+    monkeypatch.setattr(settings, "llm_hedge_after_ms", 10)
+    monkeypatch.setattr(settings, "llm_latency_budget_ms", 2000)
+    runner = _Runner(primary=Future)  # the session's turn never answers
+    runner.sessions.add(("FarmerAgent", "s1"))
+    agent = _agent(monkeypatch, runner)
+
+    result = agent._respond_with_llm("what about drip irrigation", _context())
+
+    assert result["response"] == "hedged reply"
+    assert runner.messages == ["what about drip irrigation"]
+    # The throwaway session has no history, so it gets the full seed prompt
+    assert len(prompts) == 1 and runner.ephemeral == prompts
@@ -0,0 +1,114 @@
+"""Circuit breaker transitions and half-open probe accounting"""
+import time
+
+from src.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+OPEN_SECONDS = 0.05
+
+
+def _breaker(**overrides):
+    options = dict(
+        slow_call_ms=100, window_seconds=60, min_calls=4, error_rate_threshold=0.5,
+        slow_rate_threshold=0.8, open_seconds=OPEN_SECONDS, half_open_probes=2,
+    )
+    options.update(overrides)
+    return CircuitBreaker("test", **options)
+
+
+def _open(breaker):
+    for _ in range(breaker.min_calls):
+        assert breaker.allow()
+        breaker.record(False, 0.01)
+    assert breaker.state == OPEN
+
+
+def _half_open(breaker):
+    _open(breaker)
+    time.sleep(OPEN_SECONDS * 1.5)
+
+
+def test_stays_closed_below_min_calls():
+    breaker = _breaker()
+    for _ in range(breaker.min_calls - 1):
+        breaker.record(False, 0.01)
+    assert breaker.state == CLOSED and breaker.allow()
+
+
+def test_opens_on_error_rate_and_fails_fast():
+    breaker = _breaker()
+    breaker.record(True, 0.01)
+    breaker.record(True, 0.01)
+    breaker.record(False, 0.01)
+    assert breaker.state == CLOSED
+    breaker.record(False, 0.01)  # 2 of 4 failed
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+
+def test_opens_on_slow_rate():
+    breaker = _breaker()
+    for _ in range(4):
+        breaker.record(True, 0.2)
+    assert breaker.state == OPEN
+
+
+def test_half_open_admits_only_the_probe_budget():
+    breaker = _breaker()
+    _half_open(breaker)
+
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # both probes in flight
+
+    # A finished probe frees its slot for another one
+    breaker.record(True, 0.01)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_successful_probes_close_with_a_clean_window():
+    breaker = _breaker()
+    _half_open(breaker)
+    assert breaker.allow() and breaker.allow()
+    breaker.record(True, 0.01)
+    breaker.record(True, 0.01)
+
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["calls_in_window"] == 0
+    # Failures before the breaker opened don't count against it now
+    breaker.record(False, 0.01)
+    assert breaker.state == CLOSED
+
+
+def test_failed_probe_reopens():
+    breaker = _breaker()
+    _half_open(breaker)
+    assert breaker.allow() and breaker.allow()
+    breaker.record(True, 0.01)
+    breaker.record(False, 0.01)
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+
+def test_slow_probe_reopens():
+    breaker = _breaker()
+    _half_open(breaker)
+    assert breaker.allow()
+    breaker.record(True, 0.2)
+    assert breaker.state == OPEN
+
+
+def test_reopened_breaker_probes_again_after_cool_down():
+    breaker = _breaker()
+    _half_open(breaker)
+    assert breaker.allow()
+    breaker.record(False, 0.01)
+    assert not breaker.allow()
+
+    time.sleep(OPEN_SECONDS * 1.5)
+    # Probe accounting starts over: the full budget is available again
+    assert breaker.allow() and breaker.allow()
+    assert not breaker.allow()
@@ -0,0 +1,87 @@
+"""Near-duplicate collapsing and resolving follow-ups that name a collapsed variant"""
+from itertools import combinations
+
+from src.models.scheme_record import SchemeRecord
+from src.services.dedup import collapse_near_duplicates, jaccard, scheme_features
+from src.services.fuzzy_match import TrigramIndex
+from src.services.mock_vertex_search import MockVertexSearchService
+
+
+def _mock(category):
+    return MockVertexSearchService(category).search("", top_k=10)
+
+
+def _state_edition(scheme, state):
+    return SchemeRecord(
+        id=f"{scheme.id}-{state.lower()}",
+        name=f"{state} {scheme.name.replace('Pradhan Mantri ', '')}",
+        description=f"{scheme.description} in {state}",
+        eligibility=scheme.eligibility,
+        benefits=scheme.benefits,
+        application_process=f"Apply through {state} agriculture department",
+        url=scheme.url,
+    )
+
+
+def test_pm_kisan_editions_collapse():
+    # Same official page, and "kisan" is the only distinctive word of PM-KISAN Scheme
+    collapsed = collapse_near_duplicates(_mock("farmer"))
+    by_id = {s.id: s for s in collapsed}
+    assert "farmer-4" not in by_id
+    assert by_id["farmer-1"].related_variants == ({"id": "farmer-4", "name": "PM Kisan Samman Nidhi Yojana"},)
+    assert [s.id for s in collapsed if s.related_variants] == ["farmer-1"]
+
+
+def test_distinct_mock_schemes_never_collapse():
+    # Kisan Credit Card shares PM-KISAN's host but not its page; three MSME
+    # schemes share a dcmsme.gov.in page but not their names
+    schemes = _mock("msme")
+    collapsed = collapse_near_duplicates(schemes)
+    assert [s.id for s in collapsed] == [s.id for s in schemes]
+    assert not any(s.related_variants for s in collapsed)
+
+    farmer = [s for s in _mock("farmer") if s.id != "farmer-4"]
+    assert [s.id for s in collapse_near_duplicates(farmer)] == [s.id for s in farmer]
+
+
+def test_unrelated_pairs_stay_below_threshold():
+    # Krishi Sinchai vs Paramparagat Krishi Vikas: 0.08, estimated 0.125 by MinHash
+    schemes = {s.id: s for s in _mock("farmer")}
+    assert jaccard(scheme_features(schemes["farmer-6"]), scheme_features(schemes["farmer-9"])) < 0.1
+    for a, b in combinations(_mock("msme"), 2):
+        assert jaccard(scheme_features(a), scheme_features(b)) < 0.2, (a.id, b.id)
+
+
+def test_state_edition_collapses_into_its_scheme():
+    schemes = _mock("farmer")
+    edition = _state_edition(schemes[5], "Odisha")
+
+    collapsed = {s.id: s for s in collapse_near_duplicates(schemes + [edition])}
+
+    assert edition.id not in collapsed
+    assert collapsed["farmer-6"].related_variants == ({"id": edition.id, "name": edition.name},)
+    assert schemes[5].related_variants == ()  # Inputs are not modified
+
+
+def test_variant_alias_resolves_to_the_variant():
+    schemes = _mock("farmer")
+    edition = _state_edition(schemes[5], "Odisha")
+    collapsed = collapse_near_duplicates(schemes + [edition])
+    index = TrigramIndex(collapsed)
+
+    match = index.best_match("tell me about odisha krishi sinchai yojana")
+    assert (collapsed[match.position].id, match.variant_id) == ("farmer-6", edition.id)
+
+    match = index.best_match("krishi sinchai details")
+    assert (collapsed[match.position].id, match.variant_id) == ("farmer-6", None)
+
+
+def test_pm_kisan_variant_resolves_to_its_own_record():
+    collapsed = collapse_near_duplicates(_mock("farmer"))
+    index = TrigramIndex(collapsed)
+
+    match = index.best_match("kisan samman nidhi details")
+    assert (collapsed[match.position].id, match.variant_id) == ("farmer-1", "farmer-4")
+
+    match = index.best_match("tell me more about pm kisan")
+    assert (collapsed[match.position].id, match.variant_id) == ("farmer-1", None)
@@ -0,0 +1,145 @@
+"""RRF ordering, per-source deadlines and partial results in federated search"""
+import itertools
+import threading
+import time
+
+import pytest
+
+from config.settings import settings
+from src.models.scheme_record import SchemeRecord
+from src.services import federated_search
+from src.services.circuit_breaker import CircuitBreaker
+from src.services.federated_search import FederatedSearchService, FederatedSource, reciprocal_rank_fusion
+
+_names = itertools.count()
+
+
+def _scheme(scheme_id):
+    return SchemeRecord(id=scheme_id, name=scheme_id, description="d", eligibility="e", benefits="b")
+
+
+def _ids(schemes):
+    return [s.id for s in schemes]
+
+
+class _Source:
+    """Search backend with a fixed latency; fails fast like Vertex search when its breaker is open"""
+
+    def __init__(self, ids, delay_s=0.0, error=None, breaker=None):
+        self.schemes = [_scheme(scheme_id) for scheme_id in ids]
+        self.delay_s = delay_s
+        self.error = error
+        self.breaker = breaker
+        self.calls = 0
+
+    def search(self, query, top_k=10):
+        self.calls += 1
+        if self.breaker is not None and not self.breaker.allow():
+            return []
+        time.sleep(self.delay_s)
+        if self.error is not None:
+            raise self.error
+        return self.schemes[:top_k]
+
+
+def _source(service, deadline_ms=1000):
+    # A fresh name per source: each gets its own pool, untouched by other tests
+    return FederatedSource(name=f"test-{next(_names)}", service=service, deadline_ms=deadline_ms)
+
+
+def _timed_search(sources, top_k=10):
+    started = time.perf_counter()
+    results = FederatedSearchService(sources, rrf_k=60).search("query", top_k)
+    return _ids(results), (time.perf_counter() - started) * 1000
+
+
+def test_rrf_ranks_by_summed_reciprocal_rank():
+    a, b, c, d = (_scheme(scheme_id) for scheme_id in "abcd")
+    # b: 1/62 + 1/61, c: 1/63 + 1/62, a: 1/61, d: 1/63
+    assert _ids(reciprocal_rank_fusion([[a, b, c], [b, c, d]], k=60)) == ["b", "c", "a", "d"]
+
+
+def test_rrf_ties_go_to_the_better_best_rank_and_keep_that_copy():
+    first = [_scheme("x"), _scheme("y")]
+    second = [_scheme("y"), _scheme("x")]
+    fused = reciprocal_rank_fusion([first, second], k=60)
+    assert _ids(fused) == ["x", "y"]
+    assert fused[1] is second[0]  # y ranked first in the second list
+
+
+def test_sources_are_fused_and_searched_concurrently():
+    sources = [
+        _source(_Source(["a", "b", "c"], delay_s=0.1)),
+        _source(_Source(["b", "d"], delay_s=0.1)),
+        _source(_Source(["e"], delay_s=0.1)),
+    ]
+    ids, elapsed_ms = _timed_search(sources, top_k=4)
+    assert ids == ["b", "a", "e", "d"]
+    assert elapsed_ms < 250
+
+
+def test_late_source_is_left_out():
+    slow = _Source(["slow"], delay_s=1.0)
+    ids, elapsed_ms = _timed_search([_source(_Source(["a", "b"])), _source(slow, deadline_ms=100)])
+    assert ids == ["a", "b"]
+    assert slow.calls == 1
+    assert elapsed_ms < 500
+
+
+def test_failed_source_is_left_out():
+    ids, _ = _timed_search([_source(_Source(["a"], error=RuntimeError("boom"))), _source(_Source(["b"]))])
+    assert ids == ["b"]
+
+
+def test_open_breaker_source_is_left_out_without_waiting():
+    breaker = CircuitBreaker("test", slow_call_ms=100, window_seconds=60, min_calls=1,
+                             error_rate_threshold=0.5, open_seconds=60)
+    breaker.record(False, 0.01)
+    failing = _Source(["broken"], delay_s=1.0, breaker=breaker)
+
+    ids, elapsed_ms = _timed_search([_source(failing), _source(_Source(["a"]))])
+
+    assert ids == ["a"]
+    assert elapsed_ms < 500
+
+
+@pytest.fixture
+def one_worker_pools(monkeypatch):
+    monkeypatch.setattr(settings, "search_pool_workers", 1)
+
+
+def _occupy(source, seconds):
+    """Keep the source's only worker busy, as an earlier slow search would"""
+    busy = threading.Event()
+
+    def hold():
+        busy.set()
+        time.sleep(seconds)
+
+    federated_search._get_pool(source.name).submit(hold)
+    busy.wait()
+
+
+def test_deadline_counts_from_when_the_source_starts(one_worker_pools):
+    service = _Source(["queued"], delay_s=0.1)
+    source = _source(service, deadline_ms=200)
+    _occupy(source, 0.15)
+
+    # Done 250ms after submission but 100ms after it started: within its deadline
+    ids, elapsed_ms = _timed_search([source, _source(_Source(["a"]))])
+
+    assert ids == ["queued", "a"]
+    assert elapsed_ms >= 200
+
+
+def test_source_queued_past_its_deadline_never_runs(one_worker_pools):
+    service = _Source(["queued"])
+    source = _source(service, deadline_ms=100)
+    _occupy(source, 0.3)
+
+    ids, elapsed_ms = _timed_search([source, _source(_Source(["a"]))])
+
+    assert ids == ["a"]
+    assert elapsed_ms < 250
+    time.sleep(0.3)  # the worker is free again...
+    assert service.calls == 0  # ...and the cancelled search never ran
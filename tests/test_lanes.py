@@ -0,0 +1,80 @@
+"""Routing /query turns to the fast and llm execution lanes"""
+import asyncio
+import threading
+import uuid
+
+from fastapi.testclient import TestClient
+
+from src import app as app_module
+from src.agents.master_agent import MasterAgent
+from src.services.dedup import collapse_near_duplicates
+from src.services.lanes import FAST, LLM, Lane, lane_for
+from src.services.log import request_id_var
+from src.services.mock_vertex_search import MockVertexSearchService
+from src.services.state_service import state_service
+
+
+def test_only_llm_routes_take_the_llm_lane():
+    assert lane_for("agent") == LLM
+    for route in ("scheme_inquiry", "show_more", "eligibility", "clarification"):
+        assert lane_for(route) == FAST
+
+
+def test_planned_lanes_follow_turn_cost():
+    agent = MasterAgent()
+    session_id = str(uuid.uuid4())
+    assert agent.plan_turn("I am a farmer, which schemes can help me?", session_id).lane == LLM
+
+    state_service.update_category(session_id, "FARMER")
+    state_service.set_schemes(session_id, collapse_near_duplicates(MockVertexSearchService("farmer").search("", 10)))
+    assert agent.plan_turn("show more", session_id, show_more=True).lane == FAST
+    assert agent.plan_turn("tell me more about pm kisan", session_id).lane == FAST
+
+
+def test_lane_runs_on_its_own_threads_with_the_callers_context():
+    lane = Lane("test", workers=1)
+
+    def work():
+        return threading.current_thread().name, request_id_var.get()
+
+    async def scenario():
+        request_id_var.set("req-1")
+        return await lane.run(work)
+
+    thread_name, request_id = asyncio.run(scenario())
+    assert thread_name.startswith("lane-test")
+    assert request_id == "req-1"
+
+
+def test_busy_llm_lane_does_not_hold_up_the_fast_lane():
+    llm, fast = Lane("llm-test", workers=1), Lane("fast-test", workers=1)
+    release = threading.Event()
+
+    async def scenario():
+        blocked = asyncio.ensure_future(llm.run(release.wait, 5))
+        queued = asyncio.ensure_future(llm.run(lambda: "queued"))
+        # The fast lane answers while both llm turns wait on the one llm worker
+        assert await asyncio.wait_for(fast.run(lambda: "fast"), 1) == "fast"
+        assert not queued.done()
+        release.set()
+        return await blocked, await queued
+
+    assert asyncio.run(scenario()) == (True, "queued")
+
+
+def test_query_turns_run_on_their_planned_lane(monkeypatch):
+    threads = []
+    run_turn = app_module._run_turn
+
+    def capture(agent, request, session_id, plan, profile):
+        threads.append((plan.lane, threading.current_thread().name))
+        return run_turn(agent, request, session_id, plan, profile)
+
+    monkeypatch.setattr(app_module, "_run_turn", capture)
+    client = TestClient(app_module.app)
+    session_id = str(uuid.uuid4())
+    client.post("/query", json={"query": "I am a farmer, which schemes can help me?", "session_id": session_id})
+    client.post("/query", json={"query": "show more", "session_id": session_id, "show_more": True})
+
+    assert [lane for lane, _ in threads] == [LLM, FAST]
+    assert all(name.startswith(f"lane-{lane}") for lane, name in threads)
@@ -0,0 +1,113 @@
+"""Hedging and budget expiry in await_with_hedge"""
+import threading
+import time
+from concurrent.futures import Future
+
+from src.services.latency_budget import await_with_hedge
+
+
+def _done(value=None, error=None):
+    future = Future()
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(value)
+    return future
+
+
+def _later(delay_s, value=None, error=None):
+    future = Future()
+
+    def finish():
+        if future.set_running_or_notify_cancel():
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(value)
+
+    threading.Timer(delay_s, finish).start()
+    return future
+
+
+class _Hedge:
+    def __init__(self, make):
+        self.make = make
+        self.calls = 0
+        self.future = None
+
+    def __call__(self):
+        self.calls += 1
+        self.future = self.make()
+        return self.future
+
+
+def test_primary_answer_within_threshold_is_not_hedged():
+    hedge = _Hedge(lambda: _done("hedge"))
+    result = await_with_hedge(_later(0.01, "primary"), hedge, time.perf_counter(), 1.0, 0.5)
+    assert (result.value, result.hedged, hedge.calls) == ("primary", False, 0)
+
+
+def test_slow_primary_is_hedged_and_cancelled():
+    primary = Future()
+    hedge = _Hedge(lambda: _done("hedge"))
+    started = time.perf_counter()
+
+    result = await_with_hedge(primary, hedge, started, 1.0, 0.05)
+
+    assert (result.value, result.hedged, hedge.calls) == ("hedge", True, 1)
+    assert 50 <= result.elapsed_ms < 500
+    assert primary.cancelled()
+
+
+def test_primary_error_hedges_at_once():
+    hedge = _Hedge(lambda: _later(0.01, "hedge"))
+    started = time.perf_counter()
+
+    result = await_with_hedge(_done(error=RuntimeError("boom")), hedge, started, 1.0, 0.5)
+
+    assert (result.value, result.hedged, hedge.calls) == ("hedge", True, 1)
+    # Did not sit out the hedge threshold after the primary failed
+    assert result.elapsed_ms < 400
+
+
+def test_hedge_after_primary_error_is_issued_once():
+    errors = iter([RuntimeError("hedge failed")])
+    hedge = _Hedge(lambda: _done(error=next(errors)))
+
+    result = await_with_hedge(_done(error=RuntimeError("boom")), hedge, time.perf_counter(), 1.0, 0.5)
+
+    assert result.value is None
+    assert hedge.calls == 1
+    assert not result.timed_out
+    assert str(result.error) == "hedge failed"
+
+
+def test_primary_error_without_hedge_is_an_error_not_a_timeout():
+    result = await_with_hedge(_done(error=RuntimeError("boom")), None, time.perf_counter(), 1.0, 0.5)
+    assert result.value is None and not result.timed_out and not result.hedged
+    assert str(result.error) == "boom"
+
+
+def test_late_primary_wins_over_failed_hedge():
+    hedge = _Hedge(lambda: _done(error=RuntimeError("hedge failed")))
+    result = await_with_hedge(_later(0.1, "primary"), hedge, time.perf_counter(), 1.0, 0.02)
+    assert (result.value, result.hedged) == ("primary", True)
+
+
+def test_budget_expiry_times_out_and_cancels_everything():
+    primary = Future()
+    hedge = _Hedge(Future)
+    started = time.perf_counter()
+
+    result = await_with_hedge(primary, hedge, started, 0.1, 0.02)
+
+    assert result.value is None and result.timed_out and result.hedged
+    assert 100 <= result.elapsed_ms < 600
+    assert primary.cancelled() and hedge.future.cancelled()
+
+
+def test_time_spent_before_the_call_counts_against_the_budget():
+    # The turn already used its whole budget on search: no waiting at all
+    started = time.perf_counter() - 1.0
+    result = await_with_hedge(Future(), None, started, 0.5, 0.2)
+    assert result.value is None and result.timed_out
@@ -0,0 +1,100 @@
+"""Token-budget truncation in specialist agent prompts"""
+import re
+
+from config.settings import settings
+from src.models.scheme_record import SchemeRecord
+from src.models.schemas import ConversationContext
+from src.services.prompt_builder import build_agent_prompt, compress_assistant_message, estimate_tokens
+
+TASK = "Answer using the search tool."
+
+
+def _context(history=(), schemes=()):
+    context = ConversationContext(session_id="s")
+    for role, content in history:
+        context.add_message(role, content)
+    context.schemes = list(schemes)
+    return context
+
+
+def _scheme(i):
+    return SchemeRecord(id=f"farmer-{i}", name=f"Scheme {i}", description="d", eligibility="e", benefits="b")
+
+
+def _filler(i):
+    return ("user", f"question {i} about weather forecasts and market prices for vegetables " * 3)
+
+
+def test_first_turn_is_just_the_query():
+    prompt = build_agent_prompt("crop insurance", _context(), TASK)
+    assert prompt.text == "crop insurance"
+    assert prompt.dropped_turns == 0
+
+
+def test_long_history_is_cut_to_the_budget():
+    query = "tell me about drip irrigation subsidy"
+    context = _context([_filler(i) for i in range(8)])
+
+    prompt = build_agent_prompt(query, context, TASK, budget=120)
+
+    assert prompt.tokens <= 120 == prompt.budget
+    assert prompt.tokens == estimate_tokens(prompt.text)
+    assert prompt.dropped_turns > 0
+    # The query and the task instruction always survive
+    assert prompt.text.endswith(f"Current query: {query}\n\n{TASK}")
+
+
+def test_relevant_turn_beats_more_recent_ones():
+    relevant = ("user", "I grow sugarcane and want drip irrigation")
+    context = _context([relevant, _filler(1), _filler(2)])
+    # Room for the tail and one turn only
+    budget = estimate_tokens(f"\n\nCurrent query: drip irrigation subsidy?\n\n{TASK}") + 25
+
+    prompt = build_agent_prompt("drip irrigation subsidy?", context, TASK, budget=budget)
+
+    assert relevant[1] in prompt.text
+    assert "question" not in prompt.text
+    assert prompt.dropped_turns == 2
+
+
+def test_kept_turns_stay_in_conversation_order():
+    history = [("user", "first about irrigation"), ("assistant", "irrigation answer"),
+               ("user", "second about irrigation")]
+    prompt = build_agent_prompt("irrigation again", _context(history), TASK, budget=1000)
+    text = prompt.text
+    assert text.index("first about") < text.index("irrigation answer") < text.index("second about")
+
+
+def test_current_query_is_not_repeated_from_history():
+    context = _context([("user", "earlier"), ("user", "what about pm kisan")])
+    prompt = build_agent_prompt("what about pm kisan", context, TASK, budget=1000)
+    assert prompt.text.count("what about pm kisan") == 1
+
+
+def test_history_is_capped_to_the_configured_turns():
+    turns = [("user", f"turn-{i}") for i in range(settings.prompt_history_turns + 5)]
+    prompt = build_agent_prompt("next", _context(turns), TASK, budget=10_000)
+    kept = re.findall(r"user: (turn-\d+)", prompt.text)
+    assert kept == [content for _, content in turns[-settings.prompt_history_turns:]]
+
+
+def test_only_shown_schemes_are_referenced_and_only_if_they_fit():
+    schemes = [_scheme(i) for i in range(1, settings.schemes_per_page * 2 + 1)]
+    prompt = build_agent_prompt("details", _context(schemes=schemes), TASK, budget=1000)
+    assert f"farmer-{settings.schemes_per_page}: " in prompt.text
+    assert f"farmer-{settings.schemes_per_page + 1}: " not in prompt.text
+
+    tight = estimate_tokens(f"\n\nCurrent query: details\n\n{TASK}")
+    prompt = build_agent_prompt("details", _context(schemes=schemes), TASK, budget=tight)
+    assert "Previously shown" not in prompt.text
+    assert prompt.tokens <= tight
+
+
+def test_assistant_listing_and_footer_are_stripped():
+    message = (
+        "I found 3 farming schemes for you:\n\n"
+        "**1. PM-KISAN Scheme**\n   Income support of ₹6000 per year\n\n"
+        "💡 Want to see more schemes? Just say 'show more'!"
+    )
+    assert compress_assistant_message(message) == "I found 3 farming schemes for you:"
+    assert compress_assistant_message("x" * 500, max_chars=50) == "x" * 47 + "..."
@@ -0,0 +1,61 @@
+"""Sparse fieldsets and negotiated compression on /query"""
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app import app
+from src.middleware import compression
+from src.middleware.compression import choose_encoding
+
+client = TestClient(app)
+FARMER_QUERY = "I am a farmer, which schemes can help me?"
+
+
+def _query(params=None, headers=None):
+    body = {"query": FARMER_QUERY, "session_id": str(uuid.uuid4())}
+    return client.post("/query", json=body, params=params, headers=headers)
+
+
+def test_fields_project_each_scheme():
+    response = _query({"fields": "id,name"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["schemes"]
+    assert all(set(scheme) == {"id", "name"} for scheme in body["schemes"])
+    assert body["response"] and body["category"] == "FARMER"
+
+
+def test_omit_drops_parts_of_the_envelope():
+    body = _query({"omit": "response"}).json()
+    assert "response" not in body and body["schemes"]
+
+
+@pytest.mark.parametrize("params", [{"fields": "id,colour"}, {"omit": "session_id"}])
+def test_unknown_shape_is_rejected(params):
+    assert _query(params).status_code == 400
+
+
+BEST = "br" if compression.brotli is not None else "gzip"
+
+
+@pytest.mark.parametrize("accept,expected", [
+    ("gzip", "gzip"),
+    ("br, gzip", BEST),
+    ("gzip;q=0.5, br;q=1", BEST),
+    ("identity", None),
+    ("gzip;q=0", None),
+    ("*", BEST),
+])
+def test_accept_encoding_negotiation(accept, expected):
+    response = _query(headers={"Accept-Encoding": accept})
+    assert response.status_code == 200
+    assert response.headers.get("content-encoding") == expected
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.json()["schemes"]
+
+
+def test_choose_encoding():
+    assert choose_encoding("deflate") is None
+    assert choose_encoding("gzip;q=bogus") is None
+    assert choose_encoding("*;q=0.5, gzip;q=0") == ("br" if compression.brotli is not None else None)
@@ -0,0 +1,69 @@
+"""Spliced /query bodies match what pydantic would have encoded"""
+import uuid
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from src import app as app_module
+from src.models.schemas import QueryResponse
+from src.services.response_shaping import encode_query_response, shape_response
+
+client = TestClient(app_module.app)
+IDENTITY = {"Accept-Encoding": "identity"}
+
+
+@pytest.fixture
+def turns(monkeypatch):
+    """QueryResponse of every turn the app runs"""
+    results = []
+    run_turn = app_module._run_turn
+
+    def capture(*args):
+        result = run_turn(*args)
+        results.append(result)
+        return result
+
+    monkeypatch.setattr(app_module, "_run_turn", capture)
+    return results
+
+
+def _validated(result: QueryResponse) -> QueryResponse:
+    """The same turn as a fully validated model, as response_model would build it"""
+    data = {name: getattr(result, name) for name in QueryResponse.model_fields}
+    data["schemes"] = [scheme.to_dict() for scheme in result.schemes]
+    return QueryResponse(**data)
+
+
+def _post(query, session_id, params=None):
+    return client.post("/query", json={"query": query, "session_id": session_id},
+                       params=params, headers=IDENTITY)
+
+
+def test_spliced_body_equals_model_dump_json(turns):
+    session_id = str(uuid.uuid4())
+    # A search turn (schemes with ₹ and nested variants) and a text-only turn
+    for query in ("I am a farmer, which schemes can help me?", "hello"):
+        response = _post(query, session_id)
+        assert response.status_code == 200
+        assert response.content == _validated(turns[-1]).model_dump_json().encode("utf-8")
+    assert turns[0].schemes
+
+
+def test_omitted_parts_match_model_dump_json_with_exclude(turns):
+    _post("I am a farmer, which schemes can help me?", str(uuid.uuid4()))
+    result = turns[-1]
+    for omit in (["response"], ["schemes"], ["response", "schemes"]):
+        expected = _validated(result).model_dump_json(exclude=set(omit)).encode("utf-8")
+        assert encode_query_response(result, omit) == expected
+
+
+def test_fields_fall_back_to_json_response(turns, monkeypatch):
+    def no_splice(*args, **kwargs):
+        raise AssertionError("fields= must not use the spliced encoding")
+
+    monkeypatch.setattr(app_module, "encode_query_response", no_splice)
+    response = _post("I am a farmer, which schemes can help me?", str(uuid.uuid4()), {"fields": "id,url"})
+
+    assert response.status_code == 200
+    assert response.content == JSONResponse(shape_response(turns[-1], ["id", "url"])).body
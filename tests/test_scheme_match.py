@@ -0,0 +1,20 @@
+"""Every follow-up phrasing in benchmarks/scheme_match.py resolves as expected"""
+import pytest
+
+from benchmarks.scheme_match import CASES, build, check_dedup, trigram_match
+
+_BUILT = {category: build(category) for category in {category for category, _, _ in CASES}}
+
+
+@pytest.mark.parametrize("category,query,expected", CASES, ids=[query for _, query, _ in CASES])
+def test_follow_up_resolves(category, query, expected):
+    _raw, schemes, index, catalog = _BUILT[category]
+    found = trigram_match(index, schemes, query, catalog)
+    assert (found.id if found else None) == expected
+
+
+@pytest.mark.parametrize("category", sorted(_BUILT))
+def test_only_expected_duplicates_collapse(category):
+    raw, schemes, _index, _catalog = _BUILT[category]
+    check = check_dedup(raw, schemes)
+    assert (check["distinct_merged"], check["variants_missed"]) == ([], [])
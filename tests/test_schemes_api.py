@@ -0,0 +1,100 @@
+"""Conditional GETs, per-encoding ETags and cursor pagination on /schemes"""
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app import app
+from src.services.scheme_catalog import scheme_catalog
+from src.services.suggest_index import seed_catalog
+
+client = TestClient(app)
+IDENTITY = {"Accept-Encoding": "identity"}
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def catalog():
+    seed_catalog()
+
+
+def test_scheme_is_cacheable_with_a_strong_etag():
+    response = client.get("/schemes/farmer-1", headers=IDENTITY)
+    assert response.status_code == 200
+    assert response.json()["id"] == "farmer-1"
+    etag = response.headers["etag"]
+    assert etag.startswith('"') and not etag.startswith("W/")
+    assert response.headers["cache-control"].startswith("public, max-age=")
+
+
+def test_unknown_scheme_is_404():
+    assert client.get("/schemes/no-such-scheme").status_code == 404
+
+
+def test_if_none_match_revalidates_with_304():
+    etag = client.get("/schemes/farmer-1", headers=IDENTITY).headers["etag"]
+
+    response = client.get("/schemes/farmer-1", headers={**IDENTITY, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert "Accept-Encoding" in response.headers["vary"]
+
+    weak = client.get("/schemes/farmer-1", headers={**IDENTITY, "If-None-Match": f'"stale", W/{etag}'})
+    assert weak.status_code == 304
+
+    stale = client.get("/schemes/farmer-1", headers={**IDENTITY, "If-None-Match": '"stale"'})
+    assert stale.status_code == 200
+
+
+def test_each_encoding_has_its_own_etag_and_vary():
+    # The whole catalog page is well over the compression threshold
+    plain = client.get("/schemes", headers=IDENTITY)
+    gzipped = client.get("/schemes", headers=GZIP)
+
+    assert "content-encoding" not in plain.headers
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.headers["etag"] == plain.headers["etag"][:-1] + '-gzip"'
+    assert gzipped.json() == plain.json()
+    for response in (plain, gzipped):
+        assert "Accept-Encoding" in response.headers["vary"]
+
+    # The gzip tag revalidates, and the 304 confirms the tag the client holds
+    revalidated = client.get("/schemes", headers={**GZIP, "If-None-Match": gzipped.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == gzipped.headers["etag"]
+    assert "content-encoding" not in revalidated.headers
+
+
+def _raw(url, headers):
+    with client.stream("GET", url, headers=headers) as response:
+        return response.headers["etag"], b"".join(response.iter_raw())
+
+
+def test_gzip_bodies_are_byte_identical_across_requests(monkeypatch):
+    first = _raw("/schemes", GZIP)
+    # gzip stamps the current time into its header unless told not to
+    later = time.time() + 3600
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert _raw("/schemes", GZIP) == first
+
+
+def test_cursor_pages_through_the_catalog_in_id_order():
+    ids, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": 4, **({"cursor": cursor} if cursor else {})}
+        body = client.get("/schemes", params=params).json()
+        assert len(body["schemes"]) <= 4
+        ids += [scheme["id"] for scheme in body["schemes"]]
+        cursor = body["next_cursor"]
+        pages += 1
+        if cursor is None:
+            break
+
+    expected = sorted(scheme.id for scheme in scheme_catalog.all())
+    assert ids == expected
+    assert pages == -(-len(expected) // 4)
+
+
+def test_invalid_cursor_is_400():
+    assert client.get("/schemes", params={"cursor": "not base64!"}).status_code == 400
@@ -0,0 +1,56 @@
+"""Readiness after warmup steps pass or fail"""
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.services import warmup
+
+
+@pytest.fixture
+def steps(monkeypatch):
+    monkeypatch.setattr(warmup, "_steps", [])
+    monkeypatch.setattr(warmup, "_results", {})
+    monkeypatch.setattr(warmup, "_ready", threading.Event())
+    return warmup
+
+
+def _fail():
+    raise RuntimeError("no credentials")
+
+
+def test_all_steps_passing_makes_ready(steps):
+    steps.register_warmup("a", lambda: None)
+    steps.run_warmup()
+    assert steps.is_ready() and steps.failed_steps() == []
+
+
+def test_failed_required_step_keeps_worker_unready(steps):
+    steps.register_warmup("credentials", _fail)
+    steps.register_warmup("agents", lambda: None)
+    steps.run_warmup()
+
+    assert not steps.is_ready()
+    assert steps.failed_steps() == ["credentials"]
+    assert steps.warmup_status()["agents"]["ok"]
+
+
+def test_failed_optional_step_only_logs(steps):
+    steps.register_warmup("suggest_index", _fail, required=False)
+    steps.run_warmup()
+    assert steps.is_ready() and steps.failed_steps() == []
+
+
+def test_ready_endpoint_lists_failed_steps(steps, monkeypatch):
+    from src import app as app_module
+
+    steps.register_warmup("credentials", _fail)
+    steps.run_warmup()
+    # The lifespan would start the real warmup
+    monkeypatch.setattr(app_module, "start_warmup", lambda: None)
+
+    with TestClient(app_module.app) as client:
+        response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "failed"
+    assert response.json()["failed"] == ["credentials"]